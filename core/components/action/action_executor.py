@@ -1,10 +1,50 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from core.components.browser.browser_manager import BrowserManager
+from core.components.browser.browser_pool import BrowserPool
+from core.components.anti_crawler.anti_crawler_manager import AntiCrawlerManager, get_anti_crawler_manager
 import json
 import logging
 import re
 import asyncio
-import random
+from functools import lru_cache
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# 选择器类型到 Playwright 选择器的格式化函数
+_PREFIX_FMT = {
+    'css': str,
+    'xpath': str,
+    'id': '#{}'.format,
+    'name': '[name="{}"]'.format,
+    'class': '.{}'.format
+}
+
+@lru_cache(maxsize=4096)
+def parse_selector(selector: str) -> Tuple[str, str]:
+    """
+    解析选择器字符串，结果按选择器字符串缓存
+    支持的格式：
+    - css:#id
+    - xpath://div[@class='example']
+    - id:example
+    - name:username
+    - class:btn-primary
+    
+    :param selector: 选择器字符串
+    :return: (选择器类型, 选择器值) 元组
+    """
+    # 默认使用 CSS 选择器
+    if ':' not in selector:
+        return 'css', selector
+    
+    type_part, value_part = selector.split(':', 1)
+    type_part = type_part.lower()
+    
+    fmt = _PREFIX_FMT.get(type_part)
+    if fmt is None:
+        raise ValueError(f"不支持的选择器类型: {type_part}")
+    
+    return type_part, fmt(value_part)
 
 class SelectorEngine:
     """
@@ -14,226 +54,170 @@ class SelectorEngine:
     def parse_selector(selector: str) -> Dict[str, str]:
         """
         解析选择器字符串
-        支持的格式：
-        - css:#id
-        - xpath://div[@class='example']
-        - id:example
-        - name:username
-        - class:btn-primary
         
         :param selector: 选择器字符串
         :return: 解析后的选择器字典
         """
-        selector_types = {
-            'css': lambda s: s,
-            'xpath': lambda s: s,
-            'id': lambda s: f'#{s}',
-            'name': lambda s: f'[name="{s}"]',
-            'class': lambda s: f'.{s}'
-        }
-        
-        # 默认使用 CSS 选择器
-        if ':' not in selector:
-            return {'type': 'css', 'value': selector}
-        
-        type_part, value_part = selector.split(':', 1)
-        type_part = type_part.lower()
-        
-        if type_part not in selector_types:
-            raise ValueError(f"不支持的选择器类型: {type_part}")
-        
-        return {
-            'type': type_part,
-            'value': selector_types[type_part](value_part)
-        }
+        selector_type, selector_value = parse_selector(selector)
+        return {'type': selector_type, 'value': selector_value}
 
-class AntiCrawlerManager:
+class ActionExecutor:
     """
-    反爬虫策略管理器
+    动作执行器
+    日志只写入模块 logger，不再修改全局日志配置，输出方式由应用程序自行配置
     """
-    USER_AGENTS = [
-        # Windows Chrome
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        
-        # Windows Firefox
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
-        
-        # macOS Safari
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
-        
-        # macOS Chrome
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36",
-        
-        # Linux Chrome
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-    ]
-
-    @classmethod
-    def get_random_user_agent(cls) -> str:
-        """
-        获取随机 User-Agent
-        
-        :return: 随机 User-Agent 字符串
-        """
-        return random.choice(cls.USER_AGENTS)
+    # 内置支持的动作类型
+    SUPPORTED_ACTIONS = frozenset({
+        'goto', 'click', 'input', 'select', 
+        'radio', 'checkbox', 'wait'
+    })
 
-    @staticmethod
-    async def random_delay(min_delay: float = 1.0, max_delay: float = 3.0):
-        """
-        随机延迟
-        
-        :param min_delay: 最小延迟时间（秒）
-        :param max_delay: 最大延迟时间（秒）
-        """
-        delay = random.uniform(min_delay, max_delay)
-        await asyncio.sleep(delay)
-
-class ActionExecutor:
     def __init__(self, 
                  browser_manager: Optional[BrowserManager] = None, 
                  anti_crawler_enabled: bool = True,
                  min_delay: float = 1.0, 
-                 max_delay: float = 3.0):
+                 max_delay: float = 3.0,
+                 browser_pool: Optional[BrowserPool] = None,
+                 max_pages: int = 5):
         """
         初始化动作执行器
         
-        :param browser_manager: 可选的浏览器管理器实例
+        :param browser_manager: 可选的浏览器管理器实例，动作在浏览器池中执行，传入时仅在退出上下文时关闭
         :param anti_crawler_enabled: 是否启用反爬虫策略
         :param min_delay: 最小请求延迟
         :param max_delay: 最大请求延迟
+        :param browser_pool: 可选的浏览器池，默认使用全局共享池
+        :param max_pages: 并发执行独立动作时同时使用的最大页面数
         """
-        self.browser_manager = browser_manager or BrowserManager()
+        self.browser_manager = browser_manager
+        self.browser_pool = browser_pool or BrowserPool.get_instance()
         self.logger = logging.getLogger(__name__)
-        logging.basicConfig(level=logging.INFO)
         
         # 反爬虫配置
         self.anti_crawler_enabled = anti_crawler_enabled
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.max_pages = max_pages
         
-        # 支持的动作类型
-        self.supported_actions = [
-            'goto', 'click', 'input', 'select', 
-            'radio', 'checkbox', 'wait'
-        ]
+        # 支持的动作类型，添加新类型前与类常量共用同一个集合
+        self.supported_actions = self.SUPPORTED_ACTIONS
         
         # 选择器引擎
         self.selector_engine = SelectorEngine()
-        self.anti_crawler_manager = AntiCrawlerManager()
+        self.anti_crawler_manager = get_anti_crawler_manager()
+
+        # 动作类型到处理函数的分发表
+        self._dispatch = {
+            'goto': self._a_goto,
+            'click': self._a_click,
+            'input': self._a_input,
+            'select': self._a_select,
+            'radio': self._a_radio,
+            'checkbox': self._a_checkbox,
+            'wait': self._a_wait
+        }
+
+    @staticmethod
+    def _normalize(selector_type: str, selector: str) -> str:
+        """
+        将解析后的选择器转换为 Playwright 选择器字符串
+        
+        :param selector_type: 选择器类型
+        :param selector: 选择器值
+        :return: Playwright 可直接使用的选择器
+        """
+        if selector_type == 'xpath':
+            return f'xpath={selector}'
+        return selector
+
+    async def _a_goto(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """跳转到指定 URL"""
+        await page.goto(value)
+        return {
+            "status": "success", 
+            "message": f"跳转到 {value}", 
+            "url": page.url
+        }
+
+    async def _a_click(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """点击元素"""
+        await page.click(selector)
+        return {
+            "status": "success", 
+            "message": f"点击 {selector}"
+        }
+
+    async def _a_input(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """在输入框中填写内容"""
+        await page.fill(selector, value)
+        return {
+            "status": "success", 
+            "message": f"在 {selector} 输入 {value}"
+        }
+
+    async def _a_select(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """选择下拉框选项"""
+        await page.select_option(selector, value)
+        return {
+            "status": "success", 
+            "message": f"在 {selector} 选择 {value}"
+        }
+
+    async def _a_radio(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """选择单选框"""
+        await page.check(selector)
+        return {
+            "status": "success", 
+            "message": f"选择单选框 {selector}"
+        }
 
-    async def execute_action(self, action: Dict[str, Any], page=None) -> Dict[str, Any]:
+    async def _a_checkbox(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """选择复选框"""
+        await page.check(selector)
+        return {
+            "status": "success", 
+            "message": f"选择复选框 {selector}"
+        }
+
+    async def _a_wait(self, page, selector: Optional[str], value: Any) -> Dict[str, Any]:
+        """等待元素可见"""
+        await page.wait_for_selector(selector, state='visible')
+        return {
+            "status": "success", 
+            "message": f"等待 {selector} 可见"
+        }
+
+    async def execute_action(self, action: Dict[str, Any], page) -> Dict[str, Any]:
         """
         执行单个动作
         
         :param action: 动作配置字典
-        :param page: 可选的浏览器页面对象
+        :param page: 浏览器页面对象，由调用方创建并负责关闭
         :return: 动作执行结果
         """
-        # 反爬虫策略：随机延迟
-        if self.anti_crawler_enabled:
-            await self.anti_crawler_manager.random_delay(
-                self.min_delay, 
-                self.max_delay
-            )
-        
         action_type = action.get('type')
         selector_str = action.get('selector')
         value = action.get('value')
         
-        # 如果没有提供页面，创建新页面
-        if page is None:
-            await self.browser_manager.launch()
-            await self.browser_manager.create_context()
-            page = await self.browser_manager.new_page()
-            
-            # 反爬虫策略：随机 User-Agent
-            if self.anti_crawler_enabled:
-                user_agent = self.anti_crawler_manager.get_random_user_agent()
-                await page.context.set_extra_http_headers({
-                    'User-Agent': user_agent
-                })
-        
         try:
-            # 解析选择器
-            if selector_str:
-                selector_info = self.selector_engine.parse_selector(selector_str)
-                selector = selector_info['value']
-                selector_type = selector_info['type']
-            else:
-                selector = None
-                selector_type = None
-            
-            if action_type == 'goto':
-                await page.goto(value)
-                return {
-                    "status": "success", 
-                    "message": f"跳转到 {value}", 
-                    "url": page.url
-                }
-            
-            elif action_type == 'click':
-                if selector_type == 'xpath':
-                    await page.click(f'xpath:{selector}')
-                else:
-                    await page.click(selector)
-                return {
-                    "status": "success", 
-                    "message": f"点击 {selector}"
-                }
-            
-            elif action_type == 'input':
-                if selector_type == 'xpath':
-                    await page.fill(f'xpath:{selector}', value)
-                else:
-                    await page.fill(selector, value)
-                return {
-                    "status": "success", 
-                    "message": f"在 {selector} 输入 {value}"
-                }
-            
-            elif action_type == 'select':
-                if selector_type == 'xpath':
-                    await page.select_option(f'xpath:{selector}', value)
-                else:
-                    await page.select_option(selector, value)
-                return {
-                    "status": "success", 
-                    "message": f"在 {selector} 选择 {value}"
-                }
-            
-            elif action_type == 'radio':
-                if selector_type == 'xpath':
-                    await page.check(f'xpath:{selector}')
-                else:
-                    await page.check(selector)
-                return {
-                    "status": "success", 
-                    "message": f"选择单选框 {selector}"
-                }
-            
-            elif action_type == 'checkbox':
-                if selector_type == 'xpath':
-                    await page.check(f'xpath:{selector}')
-                else:
-                    await page.check(selector)
-                return {
-                    "status": "success", 
-                    "message": f"选择复选框 {selector}"
-                }
+            # 在延迟之前检查动作类型，不支持的动作立即失败
+            if action_type not in self.supported_actions:
+                raise ValueError(f"不支持的动作类型: {action_type}")
+            handler = self._dispatch.get(action_type)
+            if handler is None:
+                raise ValueError(f"动作类型 {action_type} 没有对应的处理函数")
             
-            elif action_type == 'wait':
-                if selector_type == 'xpath':
-                    await page.wait_for_selector(f'xpath:{selector}', state='visible')
-                else:
-                    await page.wait_for_selector(selector, state='visible')
-                return {
-                    "status": "success", 
-                    "message": f"等待 {selector} 可见"
-                }
+            # 反爬虫策略：仅在会产生请求的动作前随机延迟
+            if self.anti_crawler_enabled:
+                await self.anti_crawler_manager.throttle(
+                    action_type,
+                    self.min_delay, 
+                    self.max_delay
+                )
             
-            else:
-                raise ValueError(f"不支持的动作类型: {action_type}")
+            # 解析选择器并转换为 Playwright 可直接使用的形式
+            selector = self._normalize(*parse_selector(selector_str)) if selector_str else None
+            return await handler(page, selector, value)
         
         except Exception as e:
             self.logger.error(f"执行动作 {action_type} 时发生错误: {e}")
@@ -244,37 +228,188 @@ class ActionExecutor:
 
     async def execute_workflow(self, workflow: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        执行完整的工作流
+        执行完整的工作流，返回全部结果
         
         :param workflow: 工作流动作列表
         :return: 工作流执行结果列表
         """
-        results = []
+        return [result async for result in self.stream_workflow(workflow)]
+
+    async def stream_workflow(self, workflow: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        执行工作流，按动作顺序逐个产出执行结果
+        
+        从浏览器池借用浏览器，为本次工作流创建独立的上下文和页面，
+        结束后关闭上下文并归还浏览器。
+        动作可通过 id/depends_on 声明依赖关系，此时互不依赖的动作会并发执行；
+        未声明依赖时按顺序执行
+        
+        :param workflow: 工作流动作列表
+        :return: 异步迭代器，产出每个动作的执行结果
+        """
+        graph = None
+        if any('depends_on' in action for action in workflow):
+            try:
+                graph = self._build_graph(workflow)
+            except ValueError as e:
+                self.logger.error(f"解析工作流依赖失败: {e}")
+                yield {"status": "error", "message": str(e)}
+                return
+        
+        browser = None
+        context = None
+        discard = False
         
         try:
-            await self.browser_manager.launch()
-            await self.browser_manager.create_context()
-            page = await self.browser_manager.new_page()
+            browser = await self.browser_pool.acquire()
+            
+            # 反爬虫策略：在创建上下文时设置随机 User-Agent
+            context_options = {}
+            if self.anti_crawler_enabled:
+                context_options['user_agent'] = self.anti_crawler_manager.get_random_user_agent()
+            
+            context = await browser.new_context(**context_options)
+            page = await context.new_page()
             
-            for action in workflow:
-                result = await self.execute_action(action, page)
-                results.append(result)
-                
-                # 如果某个动作执行失败，停止工作流
-                if result['status'] == 'error':
-                    break
+            if graph is not None:
+                async for result in self._execute_graph(workflow, graph, context, page):
+                    yield result
+            else:
+                for action in workflow:
+                    result = await self.execute_action(action, page)
+                    yield result
+                    
+                    # 如果某个动作执行失败，停止工作流
+                    if result['status'] == 'error':
+                        break
         
         except Exception as e:
+            discard = True
             self.logger.error(f"执行工作流时发生错误: {e}")
-            results.append({
+            yield {
                 "status": "error", 
                 "message": str(e)
-            })
+            }
         
         finally:
-            await self.browser_manager.close()
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    discard = True
+                    self.logger.warning(f"关闭浏览器上下文失败: {e}")
+            if browser is not None:
+                await self.browser_pool.release(browser, discard=discard)
+
+    @staticmethod
+    def _build_graph(workflow: List[Dict[str, Any]]) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        根据 id/depends_on 构建依赖图并拓扑分层
+        
+        未指定 id 的动作使用其在工作流中的下标作为 id
+        
+        :param workflow: 工作流动作列表
+        :return: (分层后的动作下标列表, 每个动作依赖的动作下标列表)
+        :raises ValueError: 依赖不存在、id 重复或存在循环依赖时
+        """
+        index_of = {}
+        for index, action in enumerate(workflow):
+            action_id = action.get('id', index)
+            if action_id in index_of:
+                raise ValueError(f"重复的动作 id: {action_id}")
+            index_of[action_id] = index
+        
+        deps = []
+        for action in workflow:
+            depends_on = action.get('depends_on') or []
+            missing = [d for d in depends_on if d not in index_of]
+            if missing:
+                raise ValueError(f"依赖的动作不存在: {missing}")
+            deps.append([index_of[d] for d in depends_on])
+        
+        layers = []
+        done = set()
+        pending = list(range(len(workflow)))
+        while pending:
+            ready = [i for i in pending if all(d in done for d in deps[i])]
+            if not ready:
+                raise ValueError("工作流存在循环依赖")
+            layers.append(ready)
+            done.update(ready)
+            pending = [i for i in pending if i not in done]
+        
+        return layers, deps
+
+    async def _execute_graph(self, workflow: List[Dict[str, Any]],
+                             graph: Tuple[List[List[int]], List[List[int]]],
+                             context, page) -> AsyncIterator[Dict[str, Any]]:
+        """
+        按依赖分层并发执行动作
+        
+        无依赖的动作各自使用独立页面（第一个使用主页面），有依赖的动作沿用其第一个依赖所在的页面。
+        同一层中同一页面上的动作串行执行，不同页面之间并发执行，并发页面数受 max_pages 限制
+        
+        :param workflow: 工作流动作列表
+        :param graph: _build_graph 的返回值
+        :param context: 浏览器上下文，用于创建额外页面
+        :param page: 主页面
+        :return: 异步迭代器，按动作顺序产出已完成的执行结果
+        """
+        layers, deps = graph
+        semaphore = asyncio.Semaphore(self.max_pages)
+        pages = {}
+        results = {}
+        next_index = 0
+        main_page_free = True
+        
+        async def run_group(group_page, indexes):
+            async with semaphore:
+                if group_page is None:
+                    group_page = await context.new_page()
+                for index in indexes:
+                    pages[index] = group_page
+                for index in indexes:
+                    result = await self.execute_action(workflow[index], group_page)
+                    results[index] = result
+                    if result['status'] == 'error':
+                        return
         
-        return results
+        for layer_no, layer in enumerate(layers):
+            groups = {}
+            new_page_groups = []
+            for index in layer:
+                if deps[index]:
+                    groups.setdefault(pages[deps[index][0]], []).append(index)
+                elif main_page_free:
+                    main_page_free = False
+                    groups.setdefault(page, []).append(index)
+                else:
+                    new_page_groups.append([index])
+            
+            await asyncio.gather(
+                *[run_group(p, indexes) for p, indexes in groups.items()],
+                *[run_group(None, indexes) for indexes in new_page_groups]
+            )
+            
+            # 产出从头开始已连续完成的结果
+            while next_index in results:
+                yield results[next_index]
+                next_index += 1
+            
+            # 如果某个动作执行失败，停止工作流
+            if any(results.get(i, {}).get('status') == 'error' for i in layer):
+                break
+            
+            # 关闭后续动作不再使用的额外页面
+            remaining = [i for later in layers[layer_no + 1:] for i in later]
+            needed = {pages[deps[i][0]] for i in remaining if deps[i] and deps[i][0] in pages}
+            for p in {pages[i] for i in layer}:
+                if p is not page and p not in needed:
+                    await p.close()
+        
+        for index in sorted(results):
+            if index >= next_index:
+                yield results[index]
 
     def add_action_type(self, action_type: str):
         """
@@ -283,28 +418,37 @@ class ActionExecutor:
         :param action_type: 新的动作类型
         """
         if action_type not in self.supported_actions:
-            self.supported_actions.append(action_type)
+            self.supported_actions = self.supported_actions | {action_type}
             self.logger.info(f"添加新的动作类型: {action_type}")
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        async def close_resources():
-            await self.browser_manager.close()
-        
-        import asyncio
-        asyncio.run(close_resources())
+        """
+        同步上下文管理器出口
+        已有事件循环运行时将关闭操作调度到该循环，否则新建循环执行
+        """
+        if self.browser_manager is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.browser_manager.close())
+            return
+        # 保留任务引用，防止任务在完成前被回收
+        self._close_task = loop.create_task(self.browser_manager.close())
 
     async def __aenter__(self):
         """
         异步上下文管理器入口
+        动作在共享浏览器池借出的浏览器中执行，进入时不启动浏览器
         """
-        await self.browser_manager.launch()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         异步上下文管理器出口
         """
-        await self.browser_manager.close()
+        if self.browser_manager is not None:
+            await self.browser_manager.close()
@@ -1,9 +1,57 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from functools import lru_cache
+import math
+import operator
+import re
+import statistics
+from datetime import datetime
 from ..base_action_handler import BaseActionHandler
 
+# 记录数达到该阈值时使用 pandas 向量化过滤
+VECTORIZE_THRESHOLD = 1000
+
+# 支持的聚合类型
+_AGG_TYPES = frozenset({'count', 'sum', 'average', 'max', 'min'})
+
+@lru_cache(maxsize=256)
+def _compiled(pattern: str) -> 're.Pattern':
+    """
+    编译正则表达式，结果按模式字符串缓存
+
+    :param pattern: 正则表达式
+    :return: 编译后的正则对象
+    :raises ValueError: 正则表达式无效时
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"无效的正则表达式 {pattern!r}: {e}") from e
+
+def _load_pandas():
+    """
+    延迟导入 pandas
+
+    :return: pandas 模块，未安装时返回 None
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    return pd
+
 class DataProcessorHandler(BaseActionHandler):
     """数据处理动作处理器"""
     
+    # 条件操作符到比较函数的映射
+    _OPS = {
+        'equals': operator.eq,
+        'not_equals': operator.ne,
+        'contains': lambda a, b: b in a if a is not None else False,
+        'not_contains': lambda a, b: b not in a if a is not None else True,
+        'greater_than': operator.gt,
+        'less_than': operator.lt
+    }
+    
     async def execute(self, action_data: Dict[str, Any]) -> Any:
         """
         执行数据处理动作
@@ -14,37 +62,58 @@ class DataProcessorHandler(BaseActionHandler):
         data = action_data.get('data', [])
         rules = action_data.get('rules', [])
         
-        processed_data = data
+        # 大数据量时转换为 DataFrame，整个规则链共用，过滤结果按索引映射回原始记录
+        pd = self._vectorizable(data)
+        processed_data = pd.DataFrame.from_records(data) if pd else data
         for rule in rules:
-            processed_data = self._apply_rule(processed_data, rule)
-            
+            processed_data = self._apply_rule(processed_data, rule, records=data)
+        
+        if pd and isinstance(processed_data, pd.DataFrame):
+            return [data[i] for i in processed_data.index]
         return processed_data
 
-    def _apply_rule(self, data: Any, rule: Dict[str, Any]) -> Any:
+    @staticmethod
+    def _vectorizable(data: Any):
+        """
+        判断数据是否适合向量化处理
+
+        :param data: 待处理数据
+        :return: 可以向量化时返回 pandas 模块，否则返回 None
+        """
+        if not isinstance(data, list) or len(data) < VECTORIZE_THRESHOLD:
+            return None
+        if not all(isinstance(item, dict) for item in data):
+            return None
+        return _load_pandas()
+
+    def _apply_rule(self, data: Any, rule: Dict[str, Any], records: Optional[List[Dict[str, Any]]] = None) -> Any:
         """
         应用处理规则
         
         :param data: 待处理数据
         :param rule: 处理规则
+        :param records: data 为 DataFrame 时对应的原始记录列表，按 DataFrame 索引取用
         :return: 处理后的数据
         """
         rule_type = rule.get('type')
         
         if rule_type == 'filter':
-            return self._filter_data(data, rule)
+            return self._filter_data(data, rule, records)
         elif rule_type == 'transform':
             return self._transform_data(data, rule)
         elif rule_type == 'aggregate':
-            return self._aggregate_data(data, rule)
+            return self._aggregate_data(data, rule, records)
         else:
             raise ValueError(f"未知的处理规则类型: {rule_type}")
 
-    def _filter_data(self, data: List[Any], rule: Dict[str, Any]) -> List[Any]:
+    def _filter_data(self, data: List[Any], rule: Dict[str, Any],
+                     records: Optional[List[Dict[str, Any]]] = None) -> List[Any]:
         """
         过滤数据
         
         :param data: 数据列表
         :param rule: 过滤规则
+        :param records: data 为 DataFrame 时对应的原始记录列表
         :return: 过滤后的数据
         """
         condition = rule.get('condition', {})
@@ -54,6 +123,9 @@ class DataProcessorHandler(BaseActionHandler):
         
         if not all([field, operator, value]):
             return data
+        
+        if hasattr(data, 'columns'):
+            return self._filter_frame(data, field, operator, value, records)
             
         filtered = []
         for item in data:
@@ -83,77 +155,143 @@ class DataProcessorHandler(BaseActionHandler):
         
         return data
 
-    def _aggregate_data(self, data: List[Any], rule: Dict[str, Any]) -> Any:
+    def _aggregate_data(self, data: List[Any], rule: Dict[str, Any],
+                        records: Optional[List[Dict[str, Any]]] = None) -> Any:
         """
         聚合数据
         
+        DataFrame 按索引取回原始记录后聚合，结果类型与逐条处理一致：
+        整数求和保持整数，缺失字段被忽略而不是变成 NaN，无法相加的值同样抛出异常
+        
         :param data: 数据列表
         :param rule: 聚合规则
+        :param records: data 为 DataFrame 时对应的原始记录列表
         :return: 聚合结果
         """
         agg_type = rule.get('aggregate_type')
         field = rule.get('field')
         
-        if not field or not isinstance(data, list):
+        if not field or agg_type not in _AGG_TYPES:
+            return data
+        
+        if hasattr(data, 'columns'):
+            data = [records[i] for i in data.index]
+        if not isinstance(data, list):
             return data
             
-        values = []
-        for item in data:
-            if isinstance(item, dict):
-                value = item.get(field)
-                if value is not None:
-                    values.append(value)
+        # 先取出整列再聚合，避免在聚合循环中逐条查找字段
+        values = [item[field] for item in data
+                  if isinstance(item, dict) and item.get(field) is not None]
         
         if agg_type == 'count':
             return len(values)
         elif agg_type == 'sum':
+            # 含浮点数时使用 fsum 减少累加误差，纯整数保持精确的整数结果
+            if any(isinstance(value, float) for value in values):
+                return math.fsum(values)
             return sum(values)
         elif agg_type == 'average':
-            return sum(values) / len(values) if values else 0
+            return statistics.fmean(values) if values else 0
         elif agg_type == 'max':
             return max(values) if values else None
-        elif agg_type == 'min':
+        else:
             return min(values) if values else None
-        
-        return data
 
-    def _evaluate_condition(self, value1: Any, operator: str, value2: Any) -> bool:
+    @staticmethod
+    def _frame_comparable(column, operator: str, value: Any) -> bool:
         """
-        评估条件
+        判断列能否向量化比较且结果与逐条比较一致
+
+        缺失字段在 DataFrame 中是 NaN，逐条比较时是 None；整数列含缺失值时会被转换为浮点数。
+        这些情况下向量化比较的结果或异常与逐条比较不同，需要逐条处理
+
+        :param column: 数据列
+        :param operator: 操作符
+        :param value: 比较值
+        :return: 是否可以向量化比较
+        """
+        pd = _load_pandas()
+        has_missing = bool(column.isna().any())
+        if operator in ('equals', 'not_equals'):
+            # 非数值列不会因缺失值转换类型，NaN 与 None 的相等比较结果相同
+            return not has_missing or not pd.api.types.is_numeric_dtype(column)
         
-        :param value1: 第一个值
+        is_string = pd.api.types.infer_dtype(column, skipna=True) == 'string'
+        if operator in ('contains', 'not_contains'):
+            return is_string and isinstance(value, str)
+        if operator in ('greater_than', 'less_than') and not has_missing:
+            if is_string:
+                return isinstance(value, str)
+            return (pd.api.types.is_numeric_dtype(column)
+                    and isinstance(value, (int, float)) and not isinstance(value, bool))
+        return False
+
+    def _filter_frame(self, df, field: str, operator: str, value: Any,
+                      records: List[Dict[str, Any]]):
+        """
+        使用布尔掩码过滤 DataFrame，无法保证与逐条比较一致时对原始记录逐条比较
+
+        :param df: 数据表
+        :param field: 过滤字段
         :param operator: 操作符
-        :param value2: 第二个值
-        :return: 条件是否成立
+        :param value: 比较值
+        :param records: 与数据表索引对应的原始记录列表
+        :return: 过滤后的数据表
         """
+        if field not in df.columns or not self._frame_comparable(df[field], operator, value):
+            kept = [i for i in df.index
+                    if self._evaluate_condition(records[i].get(field), operator, value)]
+            return df.loc[kept]
+        
+        column = df[field]
         if operator == 'equals':
-            return value1 == value2
+            mask = column.eq(value)
         elif operator == 'not_equals':
-            return value1 != value2
+            mask = column.ne(value)
         elif operator == 'contains':
-            return value2 in value1 if value1 is not None else False
+            mask = column.str.contains(value, regex=False, na=False)
         elif operator == 'not_contains':
-            return value2 not in value1 if value1 is not None else True
+            mask = ~column.str.contains(value, regex=False, na=False)
         elif operator == 'greater_than':
-            return value1 > value2
-        elif operator == 'less_than':
-            return value1 < value2
+            mask = column.gt(value)
+        else:
+            mask = column.lt(value)
         
-        return False
+        return df[mask.fillna(False).astype(bool)]
+
+    def _evaluate_condition(self, value1: Any, operator: str, value2: Any) -> bool:
+        """
+        评估条件
+        
+        :param value1: 第一个值
+        :param operator: 操作符
+        :param value2: 第二个值
+        :return: 条件是否成立
+        """
+        op = self._OPS.get(operator)
+        return op(value1, value2) if op else False
 
     def _replace_text(self, data: str, rule: Dict[str, Any]) -> str:
         """
         替换文本
+        规则中 regex 为真时 old_value 按正则表达式处理
         
         :param data: 文本数据
         :param rule: 替换规则
         :return: 替换后的文本
+        :raises ValueError: 正则表达式或替换模板无效时
         """
         if not isinstance(data, str):
             return data
             
         old_value = rule.get('old_value', '')
         new_value = rule.get('new_value', '')
+        if rule.get('regex'):
+            pattern = _compiled(old_value)
+            try:
+                return pattern.sub(new_value, data)
+            except re.error as e:
+                raise ValueError(f"无效的替换模板 {new_value!r}: {e}") from e
         return data.replace(old_value, new_value)
 
     def _extract_pattern(self, data: str, rule: Dict[str, Any]) -> str:
@@ -163,17 +301,13 @@ class DataProcessorHandler(BaseActionHandler):
         :param data: 文本数据
         :param rule: 提取规则
         :return: 提取的文本
+        :raises ValueError: 正则表达式无效时
         """
         if not isinstance(data, str):
             return data
             
-        import re
-        pattern = rule.get('pattern', '')
-        try:
-            match = re.search(pattern, data)
-            return match.group(0) if match else data
-        except:
-            return data
+        match = _compiled(rule.get('pattern', '')).search(data)
+        return match.group(0) if match else data
 
     def _format_data(self, data: Any, rule: Dict[str, Any]) -> str:
         """
@@ -187,19 +321,21 @@ class DataProcessorHandler(BaseActionHandler):
         
         if format_type == 'number':
             try:
-                decimal_places = rule.get('decimal_places', 2)
-                return format(float(data), f'.{decimal_places}f')
-            except:
+                number = float(data)
+            except (TypeError, ValueError):
                 return data
+            decimal_places = rule.get('decimal_places', 2)
+            return format(number, f'.{decimal_places}f')
         elif format_type == 'date':
+            if not isinstance(data, str) or not data:
+                return data
+            input_format = rule.get('input_format', '%Y-%m-%d')
+            output_format = rule.get('output_format', '%Y-%m-%d')
             try:
-                from datetime import datetime
-                input_format = rule.get('input_format', '%Y-%m-%d')
-                output_format = rule.get('output_format', '%Y-%m-%d')
                 date = datetime.strptime(data, input_format)
-                return date.strftime(output_format)
-            except:
+            except ValueError:
                 return data
+            return date.strftime(output_format)
         
         return data
 
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional
 from ..base_action_handler import BaseActionHandler
+from core.components.selector.selector_handlers.base_selector_handler import ElementNotFoundError
 
 class ExtractTextHandler(BaseActionHandler):
     """提取元素文本内容的处理器"""
@@ -92,6 +93,13 @@ class ExtractUrlHandler(BaseActionHandler):
 class ExtractMultipleHandler(BaseActionHandler):
     """提取多个元素内容的处理器"""
     
+    # 提取类型到页面脚本的映射，脚本接收匹配的元素列表和属性名
+    EXTRACT_SCRIPTS = {
+        'text': '(els) => els.map(e => e.textContent)',
+        'html': '(els) => els.map(e => e.innerHTML)',
+        'attribute': '(els, a) => els.map(e => e.getAttribute(a))'
+    }
+    
     async def execute(self, action_data: Dict[str, Any]) -> list:
         """
         执行多元素提取动作
@@ -99,22 +107,20 @@ class ExtractMultipleHandler(BaseActionHandler):
         :param action_data: 动作数据，包含选择器信息和提取类型
         :return: 提取的内容列表
         """
-        elements = await self.selector_engine.find_elements(action_data['selector'])
         extract_type = action_data.get('extract_type', 'text')  # 默认提取文本
+        script = self.EXTRACT_SCRIPTS.get(extract_type)
+        if script is None:
+            raise ValueError(f"Unknown extract type: {extract_type}")
         
-        results = []
-        for element in elements:
-            if extract_type == 'text':
-                content = await element.text_content()
-            elif extract_type == 'html':
-                content = await element.inner_html()
-            elif extract_type == 'attribute':
-                attribute = action_data.get('attribute', 'value')
-                content = await element.get_attribute(attribute)
-            else:
-                raise ValueError(f"Unknown extract type: {extract_type}")
-                
-            results.append(content)
+        # 在页面中一次性读取所有匹配元素的内容，避免逐个元素往返浏览器
+        selector = action_data['selector']
+        results = await self.page.eval_on_selector_all(
+            self.selector_engine.to_playwright_selector(selector),
+            script,
+            action_data.get('attribute', 'value')
+        )
+        if not results:
+            raise ElementNotFoundError(selector)
             
         return results
 
@@ -129,4 +135,4 @@ class ExtractMultipleHandler(BaseActionHandler):
             return False
             
         extract_type = action_data.get('extract_type', 'text')
-        return extract_type in ['text', 'html', 'attribute'] 
\ No newline at end of file
+        return extract_type in self.EXTRACT_SCRIPTS 
\ No newline at end of file
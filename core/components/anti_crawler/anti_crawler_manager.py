@@ -1,46 +1,89 @@
 import random
 import json
+import math
 import os
+import asyncio
+import aiohttp
+from functools import lru_cache
 from typing import Dict, List, Optional
+from core.components.browser.browser_pool import BrowserPool
 from datetime import datetime, timedelta
 
+# 默认 User-Agent 列表
+DEFAULT_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# 代理验证地址，返回 204 空响应，避免每次下载完整页面
+PROXY_CHECK_URL = "http://www.google.com/generate_204"
+# 代理验证超时（秒）
+PROXY_CHECK_TIMEOUT = 5
+# 批量验证时的最大并发连接数
+PROXY_CHECK_CONCURRENCY = 20
+
+@lru_cache(maxsize=8)
+def _read_json(config_path: str, mtime_ns: int, size: int):
+    """
+    读取 JSON 配置文件，按文件修改时间和大小缓存解析结果
+    返回值在各实例间共享，调用方需自行复制后再修改
+
+    :param config_path: 配置文件路径
+    :param mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+    :param size: 文件大小，仅用作缓存键
+    :return: 解析后的配置数据
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_json(config_path: str):
+    """
+    加载 JSON 配置文件，文件未修改时直接返回缓存结果
+
+    :param config_path: 配置文件路径
+    :return: 解析后的配置数据
+    :raises FileNotFoundError: 配置文件不存在
+    """
+    st = os.stat(config_path)
+    return _read_json(config_path, st.st_mtime_ns, st.st_size)
+
 class AntiCrawlerManager:
     """反爬虫管理器"""
 
+    # 需要限速的动作类型，其余动作只操作已加载的页面，不产生额外请求
+    RATE_LIMITED_ACTIONS = frozenset({'goto', 'click', 'input', 'select'})
+    # 对数正态延迟的形状参数
+    DELAY_SIGMA = 0.5
+    # 每隔多少个限速动作插入一次阅读停顿
+    READING_BREAK_INTERVAL = (15, 25)
+    # 阅读停顿时长（秒）
+    READING_BREAK_DURATION = (5.0, 15.0)
+
     def __init__(self):
+        # 每个实例使用独立的随机数生成器，避免多线程争用全局随机状态
+        self._rng = random.Random()
         self.user_agents = self._load_user_agents()
         self.proxies = self._load_proxies()
         self.delay_config = self._load_delay_config()
         self.last_request_time = None
+        self._action_count = 0
+        self._next_break = self._rng.randint(*self.READING_BREAK_INTERVAL)
 
     def _load_user_agents(self) -> List[str]:
         """加载 User-Agent 列表"""
-        default_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        ]
-        
         try:
-            config_path = os.path.join("config", "user_agents.json")
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return default_agents
-        except Exception:
-            return default_agents
+            return list(_load_json(os.path.join("config", "user_agents.json")))
+        except FileNotFoundError:
+            return list(DEFAULT_USER_AGENTS)
 
     def _load_proxies(self) -> List[Dict[str, str]]:
         """加载代理配置"""
         try:
-            config_path = os.path.join("config", "proxies.json")
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
-        except Exception:
+            return [dict(proxy) for proxy in _load_json(os.path.join("config", "proxies.json"))]
+        except FileNotFoundError:
             return []
 
     def _load_delay_config(self) -> Dict[str, float]:
@@ -52,31 +95,72 @@ class AntiCrawlerManager:
         }
         
         try:
-            config_path = os.path.join("config", "delay_config.json")
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return default_config
-        except Exception:
+            return dict(_load_json(os.path.join("config", "delay_config.json")))
+        except FileNotFoundError:
             return default_config
 
     def get_random_user_agent(self) -> str:
         """获取随机 User-Agent"""
-        return random.choice(self.user_agents)
+        return self._rng.choice(self.user_agents)
 
     def get_random_proxy(self) -> Optional[Dict[str, str]]:
         """获取随机代理"""
-        return random.choice(self.proxies) if self.proxies else None
+        return self._rng.choice(self.proxies) if self.proxies else None
 
     def get_delay_time(self) -> float:
         """获取延迟时间"""
         if self.delay_config["random_delay"]:
-            return random.uniform(
+            return self._rng.uniform(
                 self.delay_config["min_delay"],
                 self.delay_config["max_delay"]
             )
         return self.delay_config["min_delay"]
 
+    def human_delay(self, min_delay: float, max_delay: float) -> float:
+        """
+        生成模拟人工操作的延迟时间
+        服从以区间中点为中位数的对数正态分布，并截断到 [min_delay, max_delay]
+        
+        :param min_delay: 最小延迟时间（秒）
+        :param max_delay: 最大延迟时间（秒）
+        :return: 延迟时间（秒）
+        """
+        median = (min_delay + max_delay) / 2
+        if median <= 0:
+            return 0.0
+        delay = self._rng.lognormvariate(math.log(median), self.DELAY_SIGMA)
+        return min(max(delay, min_delay), max_delay)
+
+    async def random_delay(self, min_delay: float = 1.0, max_delay: float = 3.0):
+        """
+        随机延迟
+        
+        :param min_delay: 最小延迟时间（秒）
+        :param max_delay: 最大延迟时间（秒）
+        """
+        await asyncio.sleep(self.human_delay(min_delay, max_delay))
+
+    async def throttle(self, action_type: str, min_delay: float = 1.0, max_delay: float = 3.0):
+        """
+        在需要限速的动作前等待
+        每执行若干个限速动作插入一次较长的阅读停顿
+        
+        :param action_type: 动作类型
+        :param min_delay: 最小延迟时间（秒）
+        :param max_delay: 最大延迟时间（秒）
+        """
+        if action_type not in self.RATE_LIMITED_ACTIONS:
+            return
+        
+        self._action_count += 1
+        if self._action_count >= self._next_break:
+            self._action_count = 0
+            self._next_break = self._rng.randint(*self.READING_BREAK_INTERVAL)
+            await asyncio.sleep(self._rng.uniform(*self.READING_BREAK_DURATION))
+            return
+        
+        await self.random_delay(min_delay, max_delay)
+
     def should_delay(self) -> bool:
         """判断是否需要延迟"""
         if not self.last_request_time:
@@ -98,6 +182,7 @@ class AntiCrawlerManager:
         config_path = os.path.join(config_dir, "user_agents.json")
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(user_agents, f, ensure_ascii=False, indent=2)
+        _read_json.cache_clear()
         self.user_agents = user_agents
 
     def save_proxies(self, proxies: List[Dict[str, str]]):
@@ -109,6 +194,7 @@ class AntiCrawlerManager:
         config_path = os.path.join(config_dir, "proxies.json")
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(proxies, f, ensure_ascii=False, indent=2)
+        _read_json.cache_clear()
         self.proxies = proxies
 
     def save_delay_config(self, config: Dict[str, float]):
@@ -120,48 +206,112 @@ class AntiCrawlerManager:
         config_path = os.path.join(config_dir, "delay_config.json")
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
+        _read_json.cache_clear()
         self.delay_config = config
 
-    def validate_proxy(self, proxy: Dict[str, str]) -> bool:
-        """验证代理是否可用"""
-        import requests
-        import asyncio
-        from playwright.async_api import async_playwright
-        
-        # 同步验证
+    async def validate_proxy_http(self, proxy: Dict[str, str], session: aiohttp.ClientSession) -> bool:
+        """
+        通过 HTTP 请求验证代理是否可用
+
+        :param proxy: 代理配置
+        :param session: 复用连接池的 HTTP 会话
+        :return: 代理是否可用
+        """
         try:
-            response = requests.get(
-                "http://www.google.com",
-                proxies={
-                    "http": proxy["http"],
-                    "https": proxy["https"]
-                },
-                timeout=5
-            )
-            return response.status_code == 200
-        except Exception:
+            async with session.get(
+                PROXY_CHECK_URL,
+                proxy=proxy["http"],
+                timeout=aiohttp.ClientTimeout(total=PROXY_CHECK_TIMEOUT)
+            ) as response:
+                return response.status < 400
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError):
             return False
 
-    async def validate_proxy_async(self, proxy: Dict[str, str]) -> bool:
-        """异步验证代理是否可用"""
+    async def validate_proxies(self, proxies: List[Dict[str, str]]) -> List[bool]:
+        """
+        并发验证多个代理，共用一个连接池
+
+        :param proxies: 代理配置列表
+        :return: 与代理列表一一对应的验证结果
+        """
+        connector = aiohttp.TCPConnector(limit=PROXY_CHECK_CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return list(await asyncio.gather(
+                *(self.validate_proxy_http(proxy, session) for proxy in proxies)
+            ))
+
+    @staticmethod
+    def _ensure_no_running_loop(async_alternative: str):
+        """
+        确认当前线程没有运行中的事件循环，同步方法在事件循环中调用会阻塞整个循环
+
+        :param async_alternative: 事件循环中应改用的异步方法
+        :raises RuntimeError: 当前线程有运行中的事件循环时
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        raise RuntimeError(f"不能在事件循环中同步验证代理，请改用 {async_alternative}")
+
+    def validate_proxy(self, proxy: Dict[str, str]) -> bool:
+        """
+        验证代理是否可用
+
+        :raises RuntimeError: 在事件循环中调用时，应改用 validate_proxies 或 validate_proxy_async
+        """
+        self._ensure_no_running_loop("validate_proxies 或 validate_proxy_async")
+        return asyncio.run(self.validate_proxies([proxy]))[0]
+
+    async def validate_proxy_async(self, proxy: Dict[str, str],
+                                   browser_pool: Optional[BrowserPool] = None) -> bool:
+        """
+        使用浏览器验证代理是否可用
+
+        从浏览器池借用已启动的浏览器，在带代理的临时上下文中访问验证地址
+        :param proxy: 代理配置
+        :param browser_pool: 可选的浏览器池，默认使用全局共享池
+        :return: 代理是否可用
+        """
+        server = proxy.get("server") or proxy.get("http")
+        if not server:
+            return False
+        
+        pool = browser_pool or BrowserPool.get_instance()
+        browser = await pool.acquire()
+        context = None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(proxy=proxy)
-                page = await browser.new_page()
-                await page.goto("http://www.google.com", timeout=5000)
-                await browser.close()
-                return True
+            context = await browser.new_context(proxy={"server": server})
+            page = await context.new_page()
+            await page.goto(PROXY_CHECK_URL, timeout=PROXY_CHECK_TIMEOUT * 1000)
+            return True
         except Exception:
             return False
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await pool.release(browser)
 
-    def add_proxy(self, proxy: Dict[str, str]) -> bool:
-        """添加新代理"""
-        if self.validate_proxy(proxy):
+    async def add_proxy_async(self, proxy: Dict[str, str]) -> bool:
+        """异步验证并添加新代理"""
+        if (await self.validate_proxies([proxy]))[0]:
             self.proxies.append(proxy)
             self.save_proxies(self.proxies)
             return True
         return False
 
+    def add_proxy(self, proxy: Dict[str, str]) -> bool:
+        """
+        验证并添加新代理
+
+        :raises RuntimeError: 在事件循环中调用时，应改用 add_proxy_async
+        """
+        self._ensure_no_running_loop("add_proxy_async")
+        return asyncio.run(self.add_proxy_async(proxy))
+
     def remove_proxy(self, proxy: Dict[str, str]):
         """移除代理"""
         if proxy in self.proxies:
@@ -187,4 +337,13 @@ class AntiCrawlerManager:
             "max_delay": max_delay,
             "random_delay": random_delay
         }
-        self.save_delay_config(config) 
\ No newline at end of file
+        self.save_delay_config(config)
+
+@lru_cache(maxsize=1)
+def get_anti_crawler_manager() -> AntiCrawlerManager:
+    """
+    获取全局共享的反爬虫管理器
+
+    :return: 反爬虫管理器实例
+    """
+    return AntiCrawlerManager()
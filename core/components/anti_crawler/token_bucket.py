@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """
+    异步令牌桶
+    多个页面共用同一个令牌桶，实现全局的请求速率限制
+    """
+
+    def __init__(self, capacity: int = 1, refill_per_sec: float = 1.0):
+        """
+        初始化令牌桶
+
+        :param capacity: 桶容量，即允许的最大突发请求数
+        :param refill_per_sec: 每秒补充的令牌数
+        """
+        if capacity < 1:
+            raise ValueError("令牌桶容量必须大于 0")
+        if refill_per_sec <= 0:
+            raise ValueError("令牌补充速率必须大于 0")
+
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """按经过的时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_sec)
+        self._updated_at = now
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待补充，等待者按先后顺序获得令牌"""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.refill_per_sec)
+                self._refill()
+            self._tokens -= 1
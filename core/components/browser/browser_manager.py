@@ -1,9 +1,93 @@
 from typing import Optional, Dict, Any
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from contextlib import AsyncExitStack, asynccontextmanager
+from playwright.async_api import async_playwright, Browser, Page, BrowserContext, Playwright
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
 import asyncio
 import logging
 import random
-from core.components.anti_crawler.anti_crawler_manager import AntiCrawlerManager
+import re
+from core.components.anti_crawler.anti_crawler_manager import get_anti_crawler_manager
+from core.components.anti_crawler.token_bucket import AsyncTokenBucket
+from core.components.browser.page_pool import BrowserPagePool
+
+# 配置日志，模块导入时只配置一次，避免每个实例重复添加处理器
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    logger.addHandler(_handler)
+
+# 屏蔽的资源类型，抓取数据时不需要渲染样式和媒体
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'stylesheet', 'media'})
+
+# 常见广告和跟踪服务的域名（包括其子域名）
+_AD_HOSTS = (
+    r'doubleclick\.net|googlesyndication\.com|googleadservices\.com|'
+    r'google-analytics\.com|googletagmanager\.com|googletagservices\.com|'
+    r'adservice\.google\.com|connect\.facebook\.net|adnxs\.com|'
+    r'scorecardresearch\.com|criteo\.com|criteo\.net|taboola\.com|'
+    r'outbrain\.com|hotjar\.com|amazon-adsystem\.com|ads\.yahoo\.com'
+)
+AD_HOST_PATTERN = re.compile(rf'(?:^|\.)(?:{_AD_HOSTS})$')
+
+# 匹配广告请求完整 URL 的正则，只屏蔽广告时作为路由模式交给 Playwright，
+# 其余请求不会经过 Python 端的路由处理器
+AD_URL_PATTERN = re.compile(rf'^[a-z][a-z0-9+.-]*://(?:[^/?#@]*@)?(?:[^/?#:@]*\.)?(?:{_AD_HOSTS})(?::\d+)?(?:[/?#]|$)', re.IGNORECASE)
+
+# 每个事件循环共用一个 Playwright 驱动进程，所有浏览器管理器从中启动浏览器；
+# 按引用计数管理，最后一个使用者释放后停止驱动
+_playwrights: "WeakKeyDictionary[asyncio.AbstractEventLoop, Playwright]" = WeakKeyDictionary()
+_playwright_refs: "WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = WeakKeyDictionary()
+_playwright_locks: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = WeakKeyDictionary()
+
+async def _get_playwright() -> Playwright:
+    """
+    获取当前事件循环共用的 Playwright 实例并增加一次引用，首次调用时启动
+    使用完毕后调用 _release_playwright 释放引用
+    
+    :return: Playwright 实例
+    """
+    loop = asyncio.get_running_loop()
+    playwright = _playwrights.get(loop)
+    if playwright is None:
+        lock = _playwright_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            playwright = _playwrights.get(loop)
+            if playwright is None:
+                playwright = await async_playwright().start()
+                _playwrights[loop] = playwright
+                logger.info("已启动 Playwright 驱动")
+    _playwright_refs[loop] = _playwright_refs.get(loop, 0) + 1
+    return playwright
+
+async def _release_playwright(playwright: Playwright):
+    """
+    释放一次共用 Playwright 实例的引用，最后一个引用释放后停止驱动
+    
+    :param playwright: 通过 _get_playwright 获取的 Playwright 实例
+    """
+    loop = asyncio.get_running_loop()
+    if _playwrights.get(loop) is not playwright:
+        # 驱动已被 shutdown_playwright 停止，或不属于当前事件循环
+        return
+    refs = _playwright_refs.get(loop, 0) - 1
+    if refs > 0:
+        _playwright_refs[loop] = refs
+        return
+    await shutdown_playwright()
+
+async def shutdown_playwright():
+    """停止当前事件循环共用的 Playwright 实例，不论是否仍有浏览器管理器在使用"""
+    loop = asyncio.get_running_loop()
+    _playwright_refs.pop(loop, None)
+    playwright = _playwrights.pop(loop, None)
+    if playwright is not None:
+        await playwright.stop()
+        logger.info("已停止 Playwright 驱动")
 
 class ProxyManager:
     """
@@ -16,6 +100,11 @@ class ProxyManager:
         {"server": "http://138.197.102.119:80"},
         {"server": "http://45.55.196.74:8080"}
     ]
+    # 预先构造好的代理配置，调用方不应修改返回的字典
+    _PROXY_POOL = tuple(
+        {"server": proxy["server"], "bypass": "localhost,127.0.0.1"}
+        for proxy in DEFAULT_PROXIES
+    )
 
     @classmethod
     def get_random_proxy(cls, protocol: str = 'http') -> Optional[Dict[str, str]]:
@@ -25,14 +114,7 @@ class ProxyManager:
         :param protocol: 代理协议（http/https）
         :return: 代理配置字典
         """
-        if not cls.DEFAULT_PROXIES:
-            return None
-        
-        proxy = random.choice(cls.DEFAULT_PROXIES)
-        return {
-            "server": proxy['server'],
-            "bypass": "localhost,127.0.0.1"
-        }
+        return random.choice(cls._PROXY_POOL) if cls._PROXY_POOL else None
 
     @classmethod
     def validate_proxy(cls, proxy: Dict[str, str]) -> bool:
@@ -48,41 +130,127 @@ class ProxyManager:
 class BrowserManager:
     """浏览器管理器"""
 
-    def __init__(self, headless: bool = True, browser_type: str = 'chromium'):
+    def __init__(self, headless: bool = True, browser_type: str = 'chromium',
+                 max_pages: int = BrowserPagePool.DEFAULT_MAX_PAGES,
+                 max_page_uses: int = BrowserPagePool.DEFAULT_MAX_USES,
+                 max_page_age_ms: Optional[int] = None,
+                 prewarm_pages: bool = False,
+                 block_resources: bool = False,
+                 block_ads: bool = False,
+                 requests_per_second: Optional[float] = None,
+                 burst: int = 1,
+                 shared_playwright: bool = True):
         """
         初始化浏览器管理器
         
         :param headless: 是否使用无头模式
         :param browser_type: 浏览器类型（chromium/firefox/webkit）
+        :param max_pages: 页面池中页面的最大数量
+        :param max_page_uses: 池中页面的最大使用次数
+        :param max_page_age_ms: 池中页面的最大存活时间（毫秒）
+        :param prewarm_pages: 初始化时是否预先创建页面池中的全部页面，否则按需创建
+        :param block_resources: 是否屏蔽图片、字体、样式表和媒体请求
+        :param block_ads: 是否屏蔽广告和跟踪请求
+        :param requests_per_second: 所有页面合计的最大导航速率，默认按延迟配置的最小延迟计算
+        :param burst: 允许的最大突发导航数
+        :param shared_playwright: 是否使用共用的 Playwright 驱动，否则单独启动并在关闭时停止
         """
+        self.playwright = None
+        self._owns_playwright = not shared_playwright
+        # 防止并发调用 init/launch 重复启动浏览器
+        self._launch_lock = asyncio.Lock()
         self.browser = None
         self.context = None
-        self.anti_crawler = AntiCrawlerManager()
+        self.page_pool = None
+        self.max_pages = max_pages
+        self.max_page_uses = max_page_uses
+        self.max_page_age_ms = max_page_age_ms
+        self.prewarm_pages = prewarm_pages
+        self.block_resources = block_resources
+        self.block_ads = block_ads
+        self.anti_crawler = get_anti_crawler_manager()
+        
+        # 所有页面共用的导航限速令牌桶
+        if requests_per_second is None:
+            min_delay = self.anti_crawler.delay_config.get("min_delay", 0)
+            requests_per_second = 1 / min_delay if min_delay > 0 else None
+        self.rate_limiter = AsyncTokenBucket(burst, requests_per_second) if requests_per_second else None
+        
         self.headless = headless
         self.browser_type = browser_type
         self.proxy_enabled = False
         self.custom_proxy = None
         self.proxy_manager = None
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+
+    async def _ensure_playwright(self) -> Playwright:
+        """
+        获取 Playwright 实例，未启动时启动
         
-        # 配置日志
-        self.logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(handler)
+        :return: Playwright 实例
+        """
+        if self.playwright is None:
+            if self._owns_playwright:
+                self.playwright = await async_playwright().start()
+            else:
+                self.playwright = await _get_playwright()
+        return self.playwright
 
     async def init(self):
         """初始化浏览器"""
-        if not self.browser:
-            try:
-                self.playwright = await async_playwright().start()
-                self.browser = await self.playwright.chromium.launch(headless=self.headless)
-                self.logger.info(f"已启动 {self.browser_type} 浏览器")
-            except Exception as e:
-                self.logger.error(f"初始化浏览器失败: {e}")
-                raise
+        if self.browser and self.page_pool is not None:
+            return
+        
+        async with self._launch_lock:
+            if not self.browser:
+                try:
+                    playwright = await self._ensure_playwright()
+                    self.browser = await playwright.chromium.launch(headless=self.headless)
+                    self.logger.info(f"已启动 {self.browser_type} 浏览器")
+                except Exception as e:
+                    self.logger.error(f"初始化浏览器失败: {e}")
+                    raise
+            
+            if self.page_pool is None:
+                page_pool = BrowserPagePool(
+                    self._new_pooled_context,
+                    max_pages=self.max_pages,
+                    max_uses=self.max_page_uses,
+                    max_age_ms=self.max_page_age_ms
+                )
+                if self.prewarm_pages:
+                    await page_pool.start()
+                self.page_pool = page_pool
+
+    def _context_options(self, user_agent: Optional[str] = None,
+                         viewport: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        生成上下文配置，应用随机 User-Agent 和代理
+        
+        :param user_agent: 自定义用户代理
+        :param viewport: 视窗大小
+        :return: 上下文配置字典
+        """
+        context_options = {
+            'user_agent': user_agent or self.anti_crawler.get_random_user_agent()
+        }
+        
+        if viewport:
+            context_options['viewport'] = viewport
+        
+        if self.proxy_enabled:
+            proxy = self.custom_proxy or self.anti_crawler.get_random_proxy()
+            if proxy:
+                context_options['proxy'] = proxy
+                self.logger.info(f"使用代理: {proxy.get('server', '')}")
+        
+        return context_options
+
+    async def _new_pooled_context(self) -> BrowserContext:
+        """为页面池创建浏览器上下文"""
+        context = await self.browser.new_context(**self._context_options())
+        await self._setup_request_handlers(context)
+        return context
 
     async def create_context(self, user_agent: Optional[str] = None, viewport: Optional[Dict[str, int]] = None):
         """
@@ -96,27 +264,12 @@ class BrowserManager:
             await self.init()
             
         try:
-            # 获取随机 User-Agent
-            self.current_user_agent = user_agent or self.anti_crawler.get_random_user_agent()
-            
-            # 获取随机代理
-            proxy = None
-            if self.proxy_enabled:
-                proxy = self.custom_proxy or self.anti_crawler.get_random_proxy()
-            
-            # 创建上下文
-            context_options = {
-                'user_agent': self.current_user_agent
-            }
-            
-            if viewport:
-                context_options['viewport'] = viewport
-                
-            if proxy:
-                context_options['proxy'] = proxy
-                self.logger.info(f"使用代理: {proxy.get('server', '')}")
+            # 应用随机 User-Agent 和代理
+            context_options = self._context_options(user_agent, viewport)
+            self.current_user_agent = context_options['user_agent']
             
             self.context = await self.browser.new_context(**context_options)
+            await self._setup_request_handlers(self.context)
             self.logger.info("创建新的浏览器上下文")
             return self.context
             
@@ -137,22 +290,48 @@ class BrowserManager:
             self.logger.error(f"创建页面失败: {e}")
             raise
 
-    async def _setup_request_handlers(self, page: Page):
-        """设置请求处理器"""
-        async def handle_request(request):
-            # 检查是否需要延迟
-            if self.anti_crawler.should_delay():
-                delay = self.anti_crawler.get_delay_time()
-                await asyncio.sleep(delay)
-            
-            # 更新最后请求时间
-            self.anti_crawler.update_last_request_time()
-            
-            # 继续请求
-            await request.continue_()
+    def _should_block(self, request) -> bool:
+        """
+        判断请求是否需要屏蔽
+        
+        :param request: Playwright 请求对象
+        :return: 是否屏蔽
+        """
+        if self.block_resources and request.resource_type in BLOCKED_RESOURCE_TYPES:
+            return True
+        if self.block_ads:
+            host = urlsplit(request.url).hostname or ''
+            return AD_HOST_PATTERN.search(host) is not None
+        return False
+
+    @staticmethod
+    async def _abort_request(route, request):
+        """中止请求"""
+        await route.abort()
+
+    async def _setup_request_handlers(self, target):
+        """
+        设置请求处理器，屏蔽不需要的资源和广告请求
+        
+        请求延迟只在页面导航时应用，子资源请求不再逐个延迟
+        :param target: 页面或浏览器上下文，注册在上下文上时对其中所有页面生效
+        """
+        if not (self.block_resources or self.block_ads):
+            return
+        
+        if not self.block_resources:
+            # 只屏蔽广告时按 URL 匹配，其余请求无需经过拦截
+            await target.route(AD_URL_PATTERN, self._abort_request)
+            return
+        
+        async def handle_request(route, request):
+            if self._should_block(request):
+                await route.abort()
+            else:
+                await route.continue_()
             
         # 启用请求拦截
-        await page.route("**/*", handle_request)
+        await target.route("**/*", handle_request)
 
     async def close_context(self):
         """关闭当前上下文"""
@@ -161,21 +340,40 @@ class BrowserManager:
             self.context = None
 
     async def close(self):
-        """关闭浏览器"""
+        """关闭浏览器，重复调用是安全的"""
+        # 先取出并清空引用，并发或重复调用时不会重复关闭
+        page_pool, self.page_pool = self.page_pool, None
+        browser, self.browser = self.browser, None
+        playwright, self.playwright = self.playwright, None
         try:
+            if page_pool:
+                await page_pool.close()
             if self.context:
                 await self.close_context()
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
+            if browser:
+                await browser.close()
                 self.logger.info("关闭浏览器")
         except Exception as e:
             self.logger.error(f"关闭浏览器失败: {e}")
             raise
+        finally:
+            # 单独启动的驱动直接停止，共用的驱动在最后一个浏览器管理器关闭时停止
+            if playwright is not None:
+                if self._owns_playwright:
+                    await playwright.stop()
+                else:
+                    await _release_playwright(playwright)
 
-    async def new_page_with_retry(self, max_retries: int = 3) -> Optional[Page]:
-        """创建新页面（带重试）"""
-        if not self.browser:
+    @asynccontextmanager
+    async def new_page_with_retry(self, max_retries: int = 3):
+        """
+        从页面池借用页面（带重试），退出时自动归还
+        
+        用法: async with browser_manager.new_page_with_retry() as page: ...
+        借用页面失败时重试，使用页面过程中抛出的异常不会重试
+        :param max_retries: 最大尝试次数
+        """
+        if not self.browser or self.page_pool is None:
             if max_retries <= 0:
                 raise Exception("浏览器未初始化且不允许重试")
             try:
@@ -184,15 +382,19 @@ class BrowserManager:
                 self.logger.error(f"初始化浏览器失败: {e}")
                 raise
         
-        for attempt in range(max_retries):
-            try:
-                return await self.create_page()
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                self.logger.warning(f"创建页面失败，尝试重试: {e}")
-                await asyncio.sleep(1)
-                await self.close_context()  # 关闭当前上下文，使用新的代理重试
+        attempts = max(max_retries, 1)
+        async with AsyncExitStack() as stack:
+            for attempt in range(attempts):
+                try:
+                    page = await stack.enter_async_context(self.page_pool.acquire())
+                    break
+                except Exception as e:
+                    if attempt == attempts - 1:
+                        raise
+                    # 创建失败的上下文已被页面池关闭，重试时使用新的代理创建上下文
+                    self.logger.warning(f"创建页面失败，尝试重试: {e}")
+                    await asyncio.sleep(1)
+            yield page
 
     async def navigate(self, page: Page, url: str, timeout: int = 30000):
         """
@@ -203,14 +405,9 @@ class BrowserManager:
         :param timeout: 超时时间（毫秒）
         """
         try:
-            # 应用延迟
-            if self.anti_crawler.should_delay():
-                delay = self.anti_crawler.get_delay_time()
-                await asyncio.sleep(delay)
-                self.logger.info(f"应用延迟: {delay}秒")
-            
-            # 更新最后请求时间
-            self.anti_crawler.update_last_request_time()
+            # 全局限速，所有页面共用同一个令牌桶
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
             
             # 执行导航
             self.logger.info(f"导航到: {url}")
@@ -234,11 +431,26 @@ class BrowserManager:
         """
         启动浏览器
         
+        :param proxy: 可选的代理服务器配置
+        :return: Playwright 浏览器对象
+        """
+        if self.browser:
+            return self.browser
+        
+        async with self._launch_lock:
+            if self.browser:
+                return self.browser
+            return await self._launch(proxy)
+
+    async def _launch(self, proxy: Optional[Dict[str, str]] = None) -> Browser:
+        """
+        启动浏览器，调用方需持有启动锁
+        
         :param proxy: 可选的代理服务器配置
         :return: Playwright 浏览器对象
         """
         try:
-            self.playwright = await async_playwright().start()
+            playwright = await self._ensure_playwright()
             
             browser_launch_options = {
                 'headless': self.headless
@@ -256,11 +468,11 @@ class BrowserManager:
                     self.logger.info(f"使用代理: {proxy['server']}")
             
             if self.browser_type == 'chromium':
-                self.browser = await self.playwright.chromium.launch(**browser_launch_options)
+                self.browser = await playwright.chromium.launch(**browser_launch_options)
             elif self.browser_type == 'firefox':
-                self.browser = await self.playwright.firefox.launch(**browser_launch_options)
+                self.browser = await playwright.firefox.launch(**browser_launch_options)
             elif self.browser_type == 'webkit':
-                self.browser = await self.playwright.webkit.launch(**browser_launch_options)
+                self.browser = await playwright.webkit.launch(**browser_launch_options)
             else:
                 raise ValueError(f"不支持的浏览器类型: {self.browser_type}")
             
@@ -0,0 +1,170 @@
+from typing import Optional, Dict
+from playwright.async_api import async_playwright, Browser
+from .resource_pool import ResourcePool
+import asyncio
+import logging
+
+class BrowserPool(ResourcePool[Browser]):
+    """
+    浏览器池
+    维护一组长期存活的浏览器实例，工作流借用浏览器后在其上创建独立的上下文，
+    避免每次执行都冷启动浏览器
+    """
+    DEFAULT_SIZE = 4
+    MAX_USES_PER_INSTANCE = 50
+
+    _instance: Optional['BrowserPool'] = None
+
+    def __init__(self, size: int = DEFAULT_SIZE, headless: bool = True, browser_type: str = 'chromium'):
+        """
+        初始化浏览器池
+
+        :param size: 池中浏览器实例的最大数量
+        :param headless: 是否使用无头模式
+        :param browser_type: 浏览器类型（chromium/firefox/webkit）
+        """
+        if size < 1:
+            raise ValueError("浏览器池大小必须大于 0")
+
+        self.headless = headless
+        self.browser_type = browser_type
+        self.logger = logging.getLogger(__name__)
+        super().__init__(size)
+
+    @classmethod
+    def get_instance(cls, size: int = DEFAULT_SIZE, headless: bool = True,
+                     browser_type: str = 'chromium') -> 'BrowserPool':
+        """
+        获取全局共享的浏览器池
+
+        :param size: 首次创建时使用的池大小
+        :param headless: 首次创建时是否使用无头模式
+        :param browser_type: 首次创建时使用的浏览器类型
+        :return: 浏览器池实例
+        """
+        if cls._instance is None:
+            cls._instance = cls(size=size, headless=headless, browser_type=browser_type)
+        return cls._instance
+
+    def _reset_pool(self):
+        """重置池状态"""
+        super()._reset_pool()
+        self.playwright = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._uses: Dict[Browser, int] = {}
+
+    async def _bind_loop(self):
+        """
+        绑定当前事件循环
+
+        Playwright 对象与创建它的事件循环绑定，循环变化后旧实例不可再用，
+        先在原事件循环上关闭空闲的浏览器并停止 Playwright，再重新绑定
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            await self._shutdown_stale()
+        self._reset_pool()
+        self._loop = loop
+
+    async def _shutdown(self):
+        """在绑定的事件循环上关闭空闲浏览器并停止 Playwright"""
+        await self._drain()
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+            self.logger.info("浏览器池已关闭")
+
+    async def _shutdown_stale(self):
+        """关闭绑定在其他事件循环上的浏览器池资源"""
+        stale_loop = self._loop
+        if stale_loop.is_closed():
+            # 原事件循环已关闭，其上的 Playwright 驱动和浏览器无法再正常关闭
+            if self.playwright is not None:
+                self.logger.warning("浏览器池绑定的事件循环已关闭，无法关闭其中的浏览器，请在关闭事件循环前调用 close()")
+            return
+        try:
+            if stale_loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._shutdown(), stale_loop))
+            else:
+                await asyncio.to_thread(stale_loop.run_until_complete, self._shutdown())
+        except Exception as e:
+            self.logger.warning(f"关闭原事件循环上的浏览器池失败: {e}")
+
+    async def _create_resource(self) -> Browser:
+        """启动一个新的浏览器实例"""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        if self.browser_type not in ('chromium', 'firefox', 'webkit'):
+            raise ValueError(f"不支持的浏览器类型: {self.browser_type}")
+
+        launcher = getattr(self.playwright, self.browser_type)
+        browser = await launcher.launch(headless=self.headless)
+        self._uses[browser] = 0
+        self.logger.info(f"浏览器池已启动 {self.browser_type} 浏览器 ({self._created}/{self.size})")
+        return browser
+
+    async def _destroy_resource(self, browser: Browser):
+        """关闭浏览器实例"""
+        self._uses.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            self.logger.warning(f"关闭浏览器失败: {e}")
+
+    async def start(self):
+        """预热浏览器池，启动全部浏览器实例"""
+        await self._bind_loop()
+        await self._fill()
+
+    async def acquire(self) -> Browser:
+        """
+        从池中借用一个浏览器
+
+        池未满时按需启动新实例，否则等待其他工作流归还；
+        等待期间有实例被回收时，由等待者启动替代的实例
+        :return: Playwright 浏览器对象
+        """
+        await self._bind_loop()
+        try:
+            browser = await self._checkout()
+        except Exception as e:
+            self.logger.error(f"浏览器池启动浏览器失败: {e}")
+            raise
+        self._uses[browser] += 1
+        return browser
+
+    async def release(self, browser: Browser, discard: bool = False):
+        """
+        归还浏览器
+
+        使用次数达到上限、发生异常或连接已断开的实例会被关闭，下次借用时重新启动
+        :param browser: 借出的浏览器对象
+        :param discard: 是否丢弃该实例
+        """
+        if browser not in self._uses:
+            # 浏览器池已关闭或已绑定到其他事件循环，该实例不再由池管理，直接关闭避免进程残留
+            self.logger.warning("归还的浏览器不属于当前浏览器池，已关闭")
+            try:
+                await browser.close()
+            except Exception as e:
+                self.logger.warning(f"关闭浏览器失败: {e}")
+            return
+
+        uses = self._uses[browser]
+        if discard or uses >= self.MAX_USES_PER_INSTANCE or not browser.is_connected():
+            await self._retire(browser)
+            self.logger.info(f"浏览器实例已回收，累计使用 {uses} 次")
+            return
+
+        await self._checkin(browser)
+
+    async def close(self):
+        """关闭池中所有空闲浏览器并停止 Playwright"""
+        if self._loop is asyncio.get_running_loop():
+            await self._shutdown()
+        elif self._loop is not None:
+            await self._shutdown_stale()
+        self._reset_pool()
@@ -0,0 +1,116 @@
+from typing import Awaitable, Callable, Dict, Optional
+from contextlib import asynccontextmanager
+from playwright.async_api import BrowserContext, Page
+from core.components.browser.resource_pool import ResourcePool
+import logging
+import time
+
+class BrowserPagePool(ResourcePool[Page]):
+    """
+    页面池
+    循环借出一组上下文和页面，避免每次请求都创建新的上下文；页面按需创建，
+    也可以调用 start 预先创建全部页面；页面使用次数或存活时间达到上限后关闭并重建，限制内存增长
+    """
+    DEFAULT_MAX_PAGES = 4
+    DEFAULT_MAX_USES = 100
+
+    def __init__(self, context_factory: Callable[[], Awaitable[BrowserContext]],
+                 max_pages: int = DEFAULT_MAX_PAGES,
+                 max_uses: int = DEFAULT_MAX_USES,
+                 max_age_ms: Optional[int] = None):
+        """
+        初始化页面池
+
+        :param context_factory: 创建浏览器上下文的协程函数
+        :param max_pages: 池中页面的最大数量
+        :param max_uses: 单个页面的最大使用次数
+        :param max_age_ms: 单个页面的最大存活时间（毫秒），None 表示不限制
+        """
+        if max_pages < 1:
+            raise ValueError("页面池大小必须大于 0")
+
+        self.context_factory = context_factory
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.max_age_ms = max_age_ms
+        self.logger = logging.getLogger(__name__)
+
+        self._contexts: Dict[Page, BrowserContext] = {}
+        self._uses: Dict[Page, int] = {}
+        self._created_at: Dict[Page, float] = {}
+        super().__init__(max_pages)
+
+    async def _create_resource(self) -> Page:
+        """创建新的上下文和页面"""
+        context = await self.context_factory()
+        try:
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+        self._contexts[page] = context
+        self._uses[page] = 0
+        self._created_at[page] = time.monotonic()
+        return page
+
+    async def _destroy_resource(self, page: Page):
+        """关闭页面及其上下文"""
+        context = self._contexts.pop(page, None)
+        self._uses.pop(page, None)
+        self._created_at.pop(page, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                self.logger.warning(f"关闭页面上下文失败: {e}")
+
+    def _expired(self, page: Page) -> bool:
+        """判断页面是否需要回收"""
+        if self._uses.get(page, 0) >= self.max_uses or page.is_closed():
+            return True
+        if self.max_age_ms is not None:
+            age_ms = (time.monotonic() - self._created_at.get(page, 0)) * 1000
+            return age_ms >= self.max_age_ms
+        return False
+
+    async def start(self):
+        """预先创建全部页面"""
+        # 逐个创建，避免同时启动大量上下文
+        await self._fill()
+        self.logger.info(f"页面池已就绪，共 {self.max_pages} 个页面")
+
+    async def _put(self, page: Page, discard: bool = False):
+        """归还页面，需要回收的页面直接关闭"""
+        if discard or self._expired(page):
+            self.logger.info(f"回收页面，累计使用 {self._uses.get(page, 0)} 次")
+            await self._retire(page)
+            return
+        await self._checkin(page)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        借用一个页面，退出时自动归还
+
+        用法: async with pool.acquire() as page: ...
+        使用过程中抛出异常时页面会被回收而不是放回池中
+        """
+        try:
+            page = await self._checkout()
+        except Exception as e:
+            self.logger.error(f"页面池创建页面失败: {e}")
+            raise
+        self._uses[page] += 1
+        discard = False
+        try:
+            yield page
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            await self._put(page, discard=discard)
+
+    async def close(self):
+        """关闭池中所有空闲页面"""
+        await self._drain()
+        self.logger.info("页面池已关闭")
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Deque, Generic, TypeVar
+import asyncio
+
+T = TypeVar('T')
+
+class ResourcePool(Generic[T]):
+    """
+    有容量上限的异步资源池基类
+    空闲资源循环借出，池未满时按需创建；资源被回收或创建失败后通知等待者，
+    等待者重新检查是否有空闲资源或可以创建新资源，不会因为资源被回收而一直等待
+
+    子类实现 _create_resource 和 _destroy_resource
+    """
+
+    def __init__(self, size: int):
+        """
+        初始化资源池
+
+        :param size: 池中资源的最大数量
+        """
+        self.size = size
+        self._reset_pool()
+
+    def _reset_pool(self):
+        """重置池状态"""
+        self._idle: Deque[T] = deque()
+        self._created = 0
+        self._condition = asyncio.Condition()
+
+    async def _create_resource(self) -> T:
+        """创建新资源"""
+        raise NotImplementedError
+
+    async def _destroy_resource(self, resource: T):
+        """关闭资源"""
+        raise NotImplementedError
+
+    async def _create_reserved(self) -> T:
+        """创建已预留名额的资源，失败时释放名额并通知等待者"""
+        try:
+            return await self._create_resource()
+        except BaseException:
+            await self._forget()
+            raise
+
+    async def _checkout(self) -> T:
+        """借出一个资源，池未满时按需创建，否则等待其他使用者归还或回收"""
+        async with self._condition:
+            while not self._idle and self._created >= self.size:
+                await self._condition.wait()
+            if self._idle:
+                return self._idle.popleft()
+            self._created += 1
+        return await self._create_reserved()
+
+    async def _checkin(self, resource: T):
+        """归还资源并唤醒一个等待者"""
+        async with self._condition:
+            self._idle.append(resource)
+            self._condition.notify()
+
+    async def _forget(self):
+        """释放一个资源名额并唤醒一个等待者，等待者可以创建替代的资源"""
+        async with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+    async def _retire(self, resource: T):
+        """回收借出的资源"""
+        await self._forget()
+        await self._destroy_resource(resource)
+
+    async def _fill(self):
+        """逐个创建资源直到池满，用于预热"""
+        while True:
+            async with self._condition:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            await self._checkin(await self._create_reserved())
+
+    async def _drain(self):
+        """关闭全部空闲资源"""
+        async with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._created -= len(idle)
+            self._condition.notify(len(idle))
+        for resource in idle:
+            await self._destroy_resource(resource)
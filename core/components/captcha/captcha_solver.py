@@ -4,6 +4,28 @@ import aiohttp
 import asyncio
 from typing import Optional, Dict, Any
 
+# 分块编码的块大小，取 3 的倍数保证各块的 Base64 结果可以直接拼接
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+# 已经是 Base64 文本的文件后缀
+BASE64_SUFFIXES = ('.b64', '.base64')
+
+def _read_image_base64(image_path: str) -> str:
+    """
+    分块读取图像文件并编码为 Base64，避免同时持有完整的原始数据和编码结果
+
+    :param image_path: 图像文件路径
+    :return: Base64 编码字符串
+    """
+    if image_path.lower().endswith(BASE64_SUFFIXES):
+        with open(image_path, 'r', encoding='ascii') as image_file:
+            return ''.join(image_file.read().split())
+
+    encoded = bytearray()
+    with open(image_path, 'rb') as image_file:
+        while chunk := image_file.read(BASE64_CHUNK_SIZE):
+            encoded += base64.b64encode(chunk)
+    return encoded.decode('ascii')
+
 class CaptchaSolver:
     """
     验证码识别服务基类
@@ -17,7 +39,32 @@ class CaptchaSolver:
         """
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
-        logging.basicConfig(level=logging.INFO)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取共享的 HTTP 会话，首次使用时创建
+        多次识别复用同一连接池，避免重复的 DNS 解析和 TCP/TLS 握手
+
+        :return: aiohttp 会话
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def aclose(self):
+        """关闭共享的 HTTP 会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
 
     async def solve_image_captcha(self, 
                                   image_path: Optional[str] = None, 
@@ -33,10 +80,9 @@ class CaptchaSolver:
             raise ValueError("必须提供图像路径或 Base64 编码")
         
         try:
-            # 如果提供了文件路径，读取并转换为 Base64
+            # 如果提供了文件路径，在线程中读取并转换为 Base64，避免阻塞事件循环
             if image_path:
-                with open(image_path, 'rb') as image_file:
-                    image_base64 = base64.b64encode(image_file.read()).decode('utf-8')
+                image_base64 = await asyncio.to_thread(_read_image_base64, image_path)
             
             # 调用具体的验证码识别服务
             result = await self._solve_captcha(image_base64)
@@ -70,6 +116,9 @@ class TwoCaptchaSolver(CaptchaSolver):
     """
     BASE_URL = "https://2captcha.com/in.php"
     RESULT_URL = "https://2captcha.com/res.php"
+    # 轮询识别结果的初始间隔和最大间隔（秒）
+    POLL_INITIAL_DELAY = 1.0
+    POLL_MAX_DELAY = 5.0
 
     async def _solve_captcha(self, image_base64: str) -> Dict[str, Any]:
         """
@@ -81,46 +130,49 @@ class TwoCaptchaSolver(CaptchaSolver):
         if not self.api_key:
             raise ValueError("未提供 2Captcha API Key")
         
-        async with aiohttp.ClientSession() as session:
-            # 提交验证码识别请求
-            submit_params = {
+        session = self._get_session()
+
+        # 提交验证码识别请求
+        submit_params = {
+            'key': self.api_key,
+            'method': 'base64',
+            'body': image_base64,
+            'json': 1
+        }
+        
+        async with session.get(self.BASE_URL, params=submit_params) as response:
+            submit_result = await response.json()
+            
+            if submit_result.get('request') == 'ERROR_ZERO_BALANCE':
+                raise ValueError("2Captcha 余额不足")
+            
+            captcha_id = submit_result.get('request')
+        
+        # 等待并获取识别结果，轮询间隔按指数退避增长
+        delay = self.POLL_INITIAL_DELAY
+        while True:
+            result_params = {
                 'key': self.api_key,
-                'method': 'base64',
-                'body': image_base64,
+                'action': 'get',
+                'id': captcha_id,
                 'json': 1
             }
             
-            async with session.get(self.BASE_URL, params=submit_params) as response:
-                submit_result = await response.json()
-                
-                if submit_result.get('request') == 'ERROR_ZERO_BALANCE':
-                    raise ValueError("2Captcha 余额不足")
-                
-                captcha_id = submit_result.get('request')
+            async with session.get(self.RESULT_URL, params=result_params) as response:
+                result = await response.json()
+            
+            if result.get('request') == 'CAPCHA_NOT_READY':
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.POLL_MAX_DELAY)
+                continue
+            
+            if result.get('request') == 'ERROR_CAPTCHA_UNSOLVABLE':
+                raise ValueError("验证码无法识别")
             
-            # 等待并获取识别结果
-            while True:
-                result_params = {
-                    'key': self.api_key,
-                    'action': 'get',
-                    'id': captcha_id,
-                    'json': 1
-                }
-                
-                async with session.get(self.RESULT_URL, params=result_params) as response:
-                    result = await response.json()
-                    
-                    if result.get('request') == 'CAPCHA_NOT_READY':
-                        await asyncio.sleep(5)  # 等待 5 秒后重试
-                        continue
-                    
-                    if result.get('request') == 'ERROR_CAPTCHA_UNSOLVABLE':
-                        raise ValueError("验证码无法识别")
-                    
-                    return {
-                        "text": result.get('request'),
-                        "confidence": 0.8
-                    }
+            return {
+                "text": result.get('request'),
+                "confidence": 0.8
+            }
 
 class AntiCaptchaManager:
     """
@@ -155,4 +207,8 @@ class AntiCaptchaManager:
         :param image_base64: Base64 编码的验证码图像
         :return: 验证码识别结果
         """
-        return await self.solver.solve_image_captcha(image_path, image_base64) 
\ No newline at end of file
+        return await self.solver.solve_image_captcha(image_path, image_base64)
+
+    async def aclose(self):
+        """关闭识别服务占用的连接"""
+        await self.solver.aclose() 
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .selector_handlers.css_selector_handler import CSSSelectorHandler
+from .selector_handlers.xpath_selector_handler import XPathSelectorHandler
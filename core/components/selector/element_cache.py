@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from typing import Optional
+from playwright.async_api import Page, ElementHandle
+import logging
+
+class ElementCache:
+    """
+    选择器到元素的 LRU 缓存
+    页面中的 MutationObserver 在 DOM 变化时通知 Python 端清空缓存，页面导航时同样清空
+    """
+    DEFAULT_MAX_SIZE = 256
+    BINDING_NAME = '__selectorCacheBump'
+
+    # 监听 DOM 变化，同一批变化只通知一次
+    OBSERVER_SCRIPT = """
+    (() => {
+        if (window.__selectorCacheObserver) return;
+        window.__selectorCacheObserver = new MutationObserver(() => {
+            if (window.__selectorCacheBump) window.__selectorCacheBump();
+        });
+        window.__selectorCacheObserver.observe(document, {
+            subtree: true, childList: true, attributes: true
+        });
+    })()
+    """
+
+    def __init__(self, page: Page, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        初始化元素缓存
+
+        :param page: Playwright 页面对象
+        :param max_size: 缓存的最大条目数
+        """
+        if max_size < 1:
+            raise ValueError("缓存大小必须大于 0")
+
+        self.page = page
+        self.max_size = max_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._elements: "OrderedDict[str, ElementHandle]" = OrderedDict()
+        self._installed = False
+
+    async def install(self):
+        """在页面中注册 DOM 变化监听和导航监听，重复调用时只注册一次"""
+        if self._installed:
+            return
+        self._installed = True
+
+        await self.page.expose_binding(self.BINDING_NAME, lambda source: self.clear())
+        # 之后加载的文档由初始化脚本注册监听，当前文档直接执行
+        await self.page.add_init_script(self.OBSERVER_SCRIPT)
+        await self.page.evaluate(self.OBSERVER_SCRIPT)
+        self.page.on("framenavigated", lambda frame: self.clear())
+
+    def get(self, selector: str) -> Optional[ElementHandle]:
+        """
+        获取缓存的元素
+
+        :param selector: 选择器字符串
+        :return: 缓存的元素，未命中返回 None
+        """
+        element = self._elements.get(selector)
+        if element is not None:
+            self._elements.move_to_end(selector)
+        return element
+
+    def put(self, selector: str, element: ElementHandle):
+        """
+        缓存元素，超出容量时淘汰最久未使用的条目
+
+        :param selector: 选择器字符串
+        :param element: 元素句柄
+        """
+        self._elements[selector] = element
+        self._elements.move_to_end(selector)
+        if len(self._elements) > self.max_size:
+            self._elements.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        if self._elements:
+            self.logger.debug(f"清空 {len(self._elements)} 个缓存的元素")
+            self._elements.clear()
+
+    def __len__(self) -> int:
+        return len(self._elements)
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+from playwright.async_api import Page, ElementHandle
+import asyncio
+import logging
+from .selector_handlers.base_selector_handler import InvalidSelectorError
+
+class SelectorBatcher:
+    """
+    选择器查询合并器
+    同一轮事件循环中发起的多个查询合并为一次页面脚本调用，
+    将 N 次与浏览器之间的往返减少为固定的几次
+    """
+    # 每项查询为 [类型, 表达式, 是否查询全部]，返回 [各查询的匹配数, ...全部匹配元素]
+    # 无效的选择器匹配数为 -1
+    QUERY_SCRIPT = """
+    (queries) => {
+        const counts = [];
+        const found = [counts];
+        for (const [kind, expr, all] of queries) {
+            let nodes = [];
+            try {
+                if (kind === 'xpath') {
+                    if (all) {
+                        const result = document.evaluate(
+                            expr, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+                        );
+                        for (let i = 0; i < result.snapshotLength; i++) {
+                            nodes.push(result.snapshotItem(i));
+                        }
+                    } else {
+                        const node = document.evaluate(
+                            expr, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                        ).singleNodeValue;
+                        if (node) nodes.push(node);
+                    }
+                } else if (all) {
+                    nodes = Array.from(document.querySelectorAll(expr));
+                } else {
+                    const node = document.querySelector(expr);
+                    if (node) nodes.push(node);
+                }
+            } catch (e) {
+                nodes = null;
+            }
+            counts.push(nodes === null ? -1 : nodes.length);
+            if (nodes) found.push(...nodes);
+        }
+        return found;
+    }
+    """
+
+    def __init__(self, page: Page):
+        """
+        初始化查询合并器
+
+        :param page: Playwright 页面对象
+        """
+        self.page = page
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._pending: List[Tuple[list, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def query(self, kind: str, expression: str, all_matches: bool = False) -> List[ElementHandle]:
+        """
+        查询匹配的元素，与同一轮事件循环中的其他查询合并执行
+
+        :param kind: 查询类型（css/xpath）
+        :param expression: CSS 选择器或 XPath 表达式
+        :param all_matches: 是否返回全部匹配元素，否则最多返回第一个
+        :return: 匹配的元素列表
+        :raises InvalidSelectorError: 当浏览器无法解析选择器时
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(([kind, expression, all_matches], future))
+        # 当前轮次已经入队的查询会先于合并任务执行，从而进入同一批
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """执行当前批次的全部查询并分发结果"""
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        try:
+            results = await self._run([query for query, _ in batch])
+        except Exception as e:
+            self.logger.error(f"批量查询 {len(batch)} 个选择器失败: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (query, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                future.set_exception(InvalidSelectorError(query[1], "无效的选择器"))
+            else:
+                future.set_result(result)
+
+    async def _run(self, queries: List[list]) -> List[Optional[List[ElementHandle]]]:
+        """
+        在页面中执行一批查询
+
+        :param queries: 查询列表
+        :return: 各查询匹配的元素列表，无效的选择器对应 None
+        """
+        self.logger.debug(f"合并执行 {len(queries)} 个选择器查询")
+        array_handle = await self.page.evaluate_handle(self.QUERY_SCRIPT, queries)
+        try:
+            properties = await array_handle.get_properties()
+        finally:
+            await array_handle.dispose()
+
+        counts_handle = properties['0']
+        counts = await counts_handle.json_value()
+        await counts_handle.dispose()
+
+        results = []
+        offset = 1
+        for count in counts:
+            if count < 0:
+                results.append(None)
+                continue
+            results.append([properties[str(index)].as_element() for index in range(offset, offset + count)])
+            offset += count
+        return results
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
 import logging
+import re
 from playwright.async_api import Page, ElementHandle
 from .selector_handlers.base_selector_handler import (
     ElementNotFoundError, 
@@ -11,45 +13,142 @@ from .selector_handlers.xpath_selector_handler import XPathSelectorHandler
 from .selector_handlers.id_selector_handler import IDSelectorHandler
 from .selector_handlers.name_selector_handler import NameSelectorHandler
 from .selector_handlers.class_selector_handler import ClassSelectorHandler
+from .selector_batcher import SelectorBatcher
+from .element_cache import ElementCache
 
-class BaseSelectorHandler:
+# CSS 选择器至少包含的语法字符
+_CSS_RE = re.compile(r'[#.\[\]:>]')
+# XPath 选择器至少包含的语法字符
+_XPATH_RE = re.compile(r'[@=\[\]]')
+
+def _is_valid_css_selector(selector: str) -> bool:
     """
-    选择器处理器基类
+    简单验证 CSS 选择器的有效性
+    
+    :param selector: CSS 选择器字符串
+    :return: 是否为有效的 CSS 选择器
     """
-    @staticmethod
-    async def find_element(page: Page, selector: str) -> Optional[ElementHandle]:
-        """
-        在页面中查找单个元素
-        
-        :param page: Playwright 页面对象
-        :param selector: 选择器字符串
-        :return: 找到的元素，如果未找到则返回 None
-        """
-        raise NotImplementedError("子类必须实现 find_element 方法")
+    # 包含基本的 CSS 选择器字符且括号匹配
+    return _CSS_RE.search(selector) is not None and selector.count('[') == selector.count(']')
 
-    @staticmethod
-    async def find_elements(page: Page, selector: str) -> List[ElementHandle]:
-        """
-        在页面中查找多个元素
-        
-        :param page: Playwright 页面对象
-        :param selector: 选择器字符串
-        :return: 找到的元素列表
-        """
-        raise NotImplementedError("子类必须实现 find_elements 方法")
+def _is_valid_xpath_selector(selector: str) -> bool:
+    """
+    简单验证 XPath 选择器的有效性
+    
+    :param selector: XPath 选择器字符串
+    :return: 是否为有效的 XPath 选择器
+    """
+    # 以 // 或 ( 开头，包含基本的 XPath 语法元素且括号匹配
+    return (selector.startswith(('//', '('))
+            and _XPATH_RE.search(selector) is not None
+            and selector.count('[') == selector.count(']'))
+
+# 带前缀的选择器类型及其值的校验函数和错误信息
+_PREFIX_VALIDATORS = {
+    'css': (_is_valid_css_selector, "无效的 CSS 选择器"),
+    'xpath': (_is_valid_xpath_selector, "无效的 XPath 选择器"),
+    'id': None,
+    'name': None,
+    'class': None
+}
+
+# 简写选择器首字符对应的选择器类型
+_FIRST_CHAR_TYPES = {'#': 'id', '.': 'class'}
+
+@lru_cache(maxsize=4096)
+def _parse_selector_cached(selector: str) -> tuple[str, str]:
+    """
+    解析非空选择器字符串，结果按选择器字符串缓存
+    
+    :param selector: 选择器字符串
+    :return: 包含选择器类型和值的元组
+    """
+    # 处理特殊前缀选择器
+    prefix, sep, selector_value = selector.partition(':')
+    if sep and prefix in _PREFIX_VALIDATORS:
+        if not selector_value:
+            raise InvalidSelectorError(selector, "选择器值不能为空")
+        # 简单的选择器语法验证
+        validator = _PREFIX_VALIDATORS[prefix]
+        if validator is not None and not validator[0](selector_value):
+            raise InvalidSelectorError(selector, validator[1])
+        return prefix, selector_value
+    
+    if selector.startswith('[name='):
+        return 'name', selector[6:-1].strip('"')
+    selector_type = _FIRST_CHAR_TYPES.get(selector[0])
+    if selector_type is not None:
+        return selector_type, selector[1:]
+    if sep:
+        # 处理未知的选择器类型
+        raise InvalidSelectorError(selector, "不支持的选择器类型")
+    
+    # 默认为 CSS 选择器
+    return 'css', selector
+
+# 可以直接作为原生 CSS 查询的选择器类型及其前缀
+_NATIVE_CSS_PREFIXES = {'css': '', 'id': '#', 'class': '.'}
+
+@lru_cache(maxsize=4096)
+def _native_css_selector(selector_type: str, selector_value: str) -> str:
+    """
+    将 CSS、ID、Class 选择器值转换为原生 CSS 选择器（结果缓存）
+    
+    :param selector_type: 选择器类型
+    :param selector_value: 选择器值
+    :return: CSS 选择器字符串
+    """
+    if not selector_value.strip():
+        raise InvalidSelectorError(selector_value, "选择器必须是非空字符串")
+    prefix = _NATIVE_CSS_PREFIXES[selector_type]
+    return selector_value if selector_value.startswith(prefix) else prefix + selector_value
 
 class SelectorEngine:
     """
     选择器引擎，用于处理不同类型的选择器
     """
-    def __init__(self, page: Optional[Page] = None):
+    # 选择器类型到 Playwright 选择器的格式化函数
+    _PLAYWRIGHT_FORMATS = {
+        'css': str,
+        'xpath': 'xpath={}'.format,
+        'id': '#{}'.format,
+        'name': '[name="{}"]'.format,
+        'class': '.{}'.format
+    }
+
+    # 在页面中一次查询多个选择器，每项为 [类型, 表达式]，无效或未匹配的选择器返回 null
+    _FIND_MANY_SCRIPT = """
+    (queries) => queries.map(([kind, expr]) => {
+        try {
+            if (kind === 'xpath') {
+                return document.evaluate(
+                    expr, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+            }
+            return document.querySelector(expr);
+        } catch (e) {
+            return null;
+        }
+    })
+    """
+
+    # extract_many 允许读取的元素属性及对应的页面脚本，只允许固定的属性，不执行任意脚本
+    _EXTRACT_SCRIPTS = {
+        accessor: f'(els) => els.map(e => e.{accessor})'
+        for accessor in ('innerText', 'textContent', 'innerHTML', 'value', 'href', 'src')
+    }
+
+    def __init__(self, page: Optional[Page] = None, batch_lookups: bool = False):
         """
         初始化选择器引擎
         
         :param page: Playwright 页面对象，可选
+        :param batch_lookups: 是否将并发的查找合并为一次页面脚本调用
         """
         self.page = page
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.batcher = SelectorBatcher(page) if batch_lookups and page is not None else None
+        self.element_cache: Optional[ElementCache] = None
         
         # 使用工厂方法创建处理器
         self.handlers = {
@@ -59,23 +158,19 @@ class SelectorEngine:
             'name': NameSelectorHandler(page),
             'class': ClassSelectorHandler(page)
         }
-
-    def _create_handler(self, selector_type: str):
-        """
-        创建选择器处理器的辅助方法
         
-        :param selector_type: 选择器类型
-        :return: 选择器处理器实例
-        """
-        handler_class = self.handlers.get(selector_type)
-        if not handler_class:
-            raise InvalidSelectorError(selector_type, f"找不到选择器类型 '{selector_type}' 的处理器")
-        return handler_class
+        # 选择器类型到查找方法的分发表
+        self._find_one = {
+            selector_type: handler.find_element for selector_type, handler in self.handlers.items()
+        }
+        self._find_all = {
+            selector_type: handler.find_elements for selector_type, handler in self.handlers.items()
+        }
 
     @classmethod
     def parse_selector(cls, selector: str) -> tuple[str, str]:
         """
-        解析选择器，提取选择器类型和值
+        解析选择器，提取选择器类型和值，结果按选择器字符串缓存
         
         :param selector: 选择器字符串
         :return: 包含选择器类型和值的元组
@@ -83,115 +178,113 @@ class SelectorEngine:
         # 处理 None 和空字符串
         if selector is None or selector == '':
             raise InvalidSelectorError(str(selector), "选择器必须是非空字符串")
+        return _parse_selector_cached(selector)
+
+    @classmethod
+    def to_playwright_selector(cls, selector: str) -> str:
+        """
+        将选择器转换为 Playwright 可直接使用的选择器字符串
         
-        # 处理特殊前缀选择器
-        if selector.startswith('css:'):
-            selector_value = selector[4:]
-            if not selector_value:
-                raise InvalidSelectorError(selector, "选择器值不能为空")
-            # 简单的 CSS 选择器语法验证
-            if not cls._is_valid_css_selector(selector_value):
-                raise InvalidSelectorError(selector, "无效的 CSS 选择器")
-            return 'css', selector_value
-        elif selector.startswith('xpath:'):
-            selector_value = selector[6:]
-            if not selector_value:
-                raise InvalidSelectorError(selector, "选择器值不能为空")
-            # 简单的 XPath 选择器语法验证
-            if not cls._is_valid_xpath_selector(selector_value):
-                raise InvalidSelectorError(selector, "无效的 XPath 选择器")
-            return 'xpath', selector_value
-        elif selector.startswith('id:'):
-            selector_value = selector[3:]
-            if not selector_value:
-                raise InvalidSelectorError(selector, "选择器值不能为空")
-            return 'id', selector_value
-        elif selector.startswith('name:'):
-            selector_value = selector[5:]
-            if not selector_value:
-                raise InvalidSelectorError(selector, "选择器值不能为空")
-            return 'name', selector_value
-        elif selector.startswith('class:'):
-            selector_value = selector[6:]
-            if not selector_value:
-                raise InvalidSelectorError(selector, "选择器值不能为空")
-            return 'class', selector_value
-        elif selector.startswith('[name='):
-            selector_value = selector[6:-1].strip('"')
-            return 'name', selector_value
-        elif selector.startswith('#'):
-            return 'id', selector[1:]
-        elif selector.startswith('.'):
-            return 'class', selector[1:]
-        elif ':' in selector:
-            # 处理未知的选择器类型
-            raise InvalidSelectorError(selector, "不支持的选择器类型")
-        
-        # 默认为 CSS 选择器
-        return 'css', selector
-
-    @staticmethod
-    def _is_valid_css_selector(selector: str) -> bool:
-        """
-        简单验证 CSS 选择器的有效性
-        
-        :param selector: CSS 选择器字符串
-        :return: 是否为有效的 CSS 选择器
+        :param selector: 选择器字符串
+        :return: Playwright 选择器
         """
-        try:
-            # 检查是否包含基本的 CSS 选择器字符
-            if not any(char in selector for char in ['#', '.', '[', ']', ':', '>']):
-                return False
-            
-            # 检查括号是否匹配
-            if selector.count('[') != selector.count(']'):
-                return False
-            
-            return True
-        except Exception:
-            return False
-
-    @staticmethod
-    def _is_valid_xpath_selector(selector: str) -> bool:
-        """
-        简单验证 XPath 选择器的有效性
-        
-        :param selector: XPath 选择器字符串
-        :return: 是否为有效的 XPath 选择器
+        selector_type, selector_value = cls.parse_selector(selector)
+        return cls._PLAYWRIGHT_FORMATS[selector_type](selector_value)
+
+    async def enable_element_cache(self, max_size: int = ElementCache.DEFAULT_MAX_SIZE):
+        """
+        启用元素缓存，find_element 对同一选择器复用上次找到的元素，
+        页面 DOM 变化或导航后缓存自动失效
+        
+        :param max_size: 缓存的最大条目数
+        """
+        if self.element_cache is None:
+            self.element_cache = ElementCache(self.page, max_size)
+        await self.element_cache.install()
+
+    def clear_cache(self):
+        """清空元素缓存，DOM 频繁变化的循环中可在每轮之间调用以强制重新查找"""
+        if self.element_cache is not None:
+            self.element_cache.clear()
+
+    async def _find_batched(self, selector: str, selector_type: str, selector_value: str,
+                            all_matches: bool) -> List[ElementHandle]:
         """
+        通过查询合并器查找元素
+        
+        :param selector: 原始选择器字符串
+        :param selector_type: 选择器类型
+        :param selector_value: 选择器值
+        :param all_matches: 是否查找全部匹配元素
+        :return: 找到的元素列表
+        """
+        if selector_type == 'xpath':
+            kind, expression = 'xpath', selector_value
+        elif selector_type in _NATIVE_CSS_PREFIXES:
+            kind, expression = 'css', _native_css_selector(selector_type, selector_value)
+        else:
+            kind, expression = 'css', self._PLAYWRIGHT_FORMATS[selector_type](selector_value)
+        
         try:
-            # 检查是否以 // 或 ( 开头
-            if not (selector.startswith('//') or selector.startswith('(')):
-                return False
-            
-            # 检查是否包含基本的 XPath 语法元素
-            if not any(char in selector for char in ['@', '=', '[', ']']):
-                return False
-            
-            # 检查括号是否匹配
-            if selector.count('[') != selector.count(']'):
-                return False
-            
-            return True
-        except Exception:
-            return False
+            elements = await self.batcher.query(kind, expression, all_matches)
+        except InvalidSelectorError:
+            raise
+        except Exception as e:
+            self.logger.error(f"查找元素时发生错误，选择器: {selector}, 错误信息: {e}")
+            raise ElementNotFoundError(selector) from e
+        if not elements:
+            raise ElementNotFoundError(selector)
+        return elements
 
     async def find_element(self, selector: str) -> Optional[ElementHandle]:
         """
         使用指定选择器查找单个元素
         
+        :param selector: 选择器字符串
+        :return: 找到的元素
+        """
+        if self.element_cache is not None:
+            element = self.element_cache.get(selector)
+            if element is not None:
+                return element
+            element = await self._find_element(selector)
+            self.element_cache.put(selector, element)
+            return element
+        return await self._find_element(selector)
+
+    async def _find_element(self, selector: str) -> Optional[ElementHandle]:
+        """
+        在页面中查找单个元素，不使用缓存
+        
         :param selector: 选择器字符串
         :return: 找到的元素
         """
         selector_type, selector_value = self.parse_selector(selector)
-        handler = self.handlers.get(selector_type)
         
-        if handler is None:
+        if self.batcher is not None:
+            elements = await self._find_batched(selector, selector_type, selector_value, False)
+            return elements[0]
+        
+        # CSS、ID、Class 选择器直接使用原生 CSS 查询，跳过处理器
+        if selector_type in _NATIVE_CSS_PREFIXES:
+            css_selector = _native_css_selector(selector_type, selector_value)
+            try:
+                element = await self.page.query_selector(css_selector)
+            except Exception as e:
+                self.logger.error(f"查找元素时发生错误，选择器: {selector}, 错误信息: {e}")
+                raise ElementNotFoundError(selector) from e
+            if element is None:
+                raise ElementNotFoundError(selector)
+            return element
+        
+        find = self._find_one.get(selector_type)
+        
+        if find is None:
             raise InvalidSelectorError(selector, f"不支持的选择器类型: {selector_type}")
         
         try:
             self.logger.debug(f"使用 {selector_type} 选择器查找元素: {selector_value}")
-            element = await handler.find_element(selector_value)
+            element = await find(selector_value)
 
             if element is not None:
                 self.logger.info(f"成功找到元素，选择器: {selector}, 类型: {selector_type}")
@@ -218,14 +311,30 @@ class SelectorEngine:
         :return: 找到的元素列表
         """
         selector_type, selector_value = self.parse_selector(selector)
-        handler = self.handlers.get(selector_type)
         
-        if handler is None:
+        if self.batcher is not None:
+            return await self._find_batched(selector, selector_type, selector_value, True)
+        
+        # CSS、ID、Class 选择器直接使用原生 CSS 查询，跳过处理器
+        if selector_type in _NATIVE_CSS_PREFIXES:
+            css_selector = _native_css_selector(selector_type, selector_value)
+            try:
+                elements = await self.page.query_selector_all(css_selector)
+            except Exception as e:
+                self.logger.error(f"查找元素时发生错误，选择器: {selector}, 错误信息: {e}")
+                raise ElementNotFoundError(selector) from e
+            if not elements:
+                raise ElementNotFoundError(selector)
+            return elements
+        
+        find = self._find_all.get(selector_type)
+        
+        if find is None:
             raise InvalidSelectorError(selector, f"不支持的选择器类型: {selector_type}")
         
         try:
             self.logger.debug(f"使用 {selector_type} 选择器查找多个元素: {selector_value}")
-            elements = await handler.find_elements(selector_value)
+            elements = await find(selector_value)
 
             if elements and len(elements) > 0:
                 self.logger.info(f"成功找到 {len(elements)} 个元素，选择器: {selector}, 类型: {selector_type}")
@@ -243,3 +352,68 @@ class SelectorEngine:
         except Exception as e:
             self.logger.error(f"查找多个元素时发生未预期的错误，选择器: {selector}, 错误信息: {e}")
             raise SelectorError(f"查找多个元素时发生未预期的错误: {selector}, {e}") from e
+
+    async def find_many(self, selectors: List[str]) -> Dict[str, Optional[ElementHandle]]:
+        """
+        批量查找多个选择器对应的第一个元素
+        所有选择器在浏览器中通过一次脚本调用完成查询，避免逐个查询的往返开销；
+        CSS 类选择器使用浏览器原生的 querySelector，不支持 Playwright 扩展语法
+        
+        :param selectors: 选择器字符串列表
+        :return: 选择器到元素的映射，未找到的选择器对应 None
+        """
+        # 先在本地解析全部选择器，无效的选择器直接抛出异常
+        unique_selectors = list(dict.fromkeys(selectors))
+        queries = []
+        for selector in unique_selectors:
+            selector_type, selector_value = self.parse_selector(selector)
+            if selector_type == 'xpath':
+                queries.append(['xpath', selector_value])
+            else:
+                queries.append(['css', self._PLAYWRIGHT_FORMATS[selector_type](selector_value)])
+        
+        if not queries:
+            return {}
+        
+        try:
+            array_handle = await self.page.evaluate_handle(self._FIND_MANY_SCRIPT, queries)
+            try:
+                properties = await array_handle.get_properties()
+            finally:
+                await array_handle.dispose()
+        except Exception as e:
+            self.logger.error(f"批量查找元素时发生未预期的错误，选择器: {unique_selectors}, 错误信息: {e}")
+            raise SelectorError(f"批量查找元素时发生未预期的错误: {unique_selectors}, {e}") from e
+        
+        results = {}
+        for index, selector in enumerate(unique_selectors):
+            handle = properties.get(str(index))
+            results[selector] = handle.as_element() if handle is not None else None
+        
+        found = sum(element is not None for element in results.values())
+        self.logger.info(f"批量查找完成，共 {len(results)} 个选择器，找到 {found} 个元素")
+        return results
+
+    async def extract_many(self, selector: str, accessor: str = 'textContent') -> List[Any]:
+        """
+        读取所有匹配元素的指定属性
+        在浏览器中通过一次脚本调用完成，返回可序列化的值，不需要为每个元素单独往返
+        
+        :param selector: 选择器字符串
+        :param accessor: 元素属性（innerText/textContent/innerHTML/value/href/src）
+        :return: 各匹配元素的属性值列表，没有匹配元素时为空列表
+        :raises ValueError: 当属性不在允许的范围内时
+        """
+        script = self._EXTRACT_SCRIPTS.get(accessor)
+        if script is None:
+            raise ValueError(f"不支持的提取属性: {accessor}")
+        
+        playwright_selector = self.to_playwright_selector(selector)
+        try:
+            values = await self.page.eval_on_selector_all(playwright_selector, script)
+        except Exception as e:
+            self.logger.error("批量提取元素属性时发生错误，选择器: %s, 错误信息: %s", selector, e)
+            raise SelectorError(f"批量提取元素属性时发生错误: {selector}, {e}") from e
+        
+        self.logger.debug("批量提取 %d 个元素的 %s，选择器: %s", len(values), accessor, selector)
+        return values
@@ -34,6 +34,8 @@ class BaseSelectorHandler(ABC):
     选择器处理器抽象基类
     定义选择器处理的标准接口
     """
+    __slots__ = ('page', 'logger')
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化选择器处理器
@@ -1,12 +1,43 @@
 from typing import List, Optional
+from functools import lru_cache
 from playwright.async_api import Page, ElementHandle
 from .base_selector_handler import BaseSelectorHandler, ElementNotFoundError, InvalidSelectorError
 
+@lru_cache(maxsize=1024)
+def _normalize_class_selector_cached(selector_value: str) -> str:
+    """
+    将 Class 选择器规范化为以 '.' 开头的形式（结果缓存）
+    
+    :param selector_value: Class 选择器值
+    :return: 以 '.' 开头的 CSS 选择器
+    :raises InvalidSelectorError: 当选择器无效时
+    """
+    if selector_value.startswith('class:'):
+        selector_value = selector_value[len('class:'):]
+    if not selector_value:
+        raise InvalidSelectorError(selector_value, "Class 选择器必须是非空字符串")
+    return selector_value if selector_value.startswith('.') else f'.{selector_value}'
+
+def _normalize_class_selector(selector_value: str) -> str:
+    """
+    验证并规范化 Class 选择器
+    
+    :param selector_value: Class 选择器值
+    :return: 以 '.' 开头的 CSS 选择器
+    :raises InvalidSelectorError: 当选择器无效时
+    """
+    # 非字符串无法作为缓存键，先行检查
+    if not selector_value or not isinstance(selector_value, str):
+        raise InvalidSelectorError(selector_value, "Class 选择器必须是非空字符串")
+    return _normalize_class_selector_cached(selector_value)
+
 class ClassSelectorHandler(BaseSelectorHandler):
     """
     Class 选择器处理器
     实现 Class 选择器的元素查找功能
     """
+    __slots__ = ()
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化 Class 选择器处理器
@@ -24,25 +55,17 @@ class ClassSelectorHandler(BaseSelectorHandler):
         :raises ElementNotFoundError: 当无法找到元素时
         :raises InvalidSelectorError: 当选择器无效时
         """
-        # 验证选择器的基本语法
-        if not selector_value or not isinstance(selector_value, str):
-            raise InvalidSelectorError(selector_value, "Class 选择器必须是非空字符串")
+        selector_value = _normalize_class_selector(selector_value)
         
-        # 确保 Class 选择器以 '.' 开头
-        if not selector_value.startswith('.') and not selector_value.startswith('class:'):
-            selector_value = f'.{selector_value}'
-        elif selector_value.startswith('class:'):
-            selector_value = f'.{selector_value.split(":", 1)[1]}'
-        
-        self.logger.debug(f"Class 选择器查找单个元素 - 选择器: {selector_value}, 页面: {self.page}")
+        self.logger.debug("Class 选择器查找单个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
         
         element = await self.page.query_selector(selector_value)
         
         if element is None:
-            self.logger.warning(f"未找到匹配 Class 选择器的元素 - 选择器: {selector_value}")
+            self.logger.warning("未找到匹配 Class 选择器的元素 - 选择器: %s", selector_value)
             raise ElementNotFoundError(selector_value)
         
-        self.logger.info(f"成功使用 Class 选择器找到元素 - 选择器: {selector_value}")
+        self.logger.info("成功使用 Class 选择器找到元素 - 选择器: %s", selector_value)
         return element
 
     async def find_elements(self, selector_value: str) -> List[ElementHandle]:
@@ -54,23 +77,15 @@ class ClassSelectorHandler(BaseSelectorHandler):
         :raises ElementNotFoundError: 当无法找到元素时
         :raises InvalidSelectorError: 当选择器无效时
         """
-        # 验证选择器的基本语法
-        if not selector_value or not isinstance(selector_value, str):
-            raise InvalidSelectorError(selector_value, "Class 选择器必须是非空字符串")
-        
-        # 确保 Class 选择器以 '.' 开头
-        if not selector_value.startswith('.') and not selector_value.startswith('class:'):
-            selector_value = f'.{selector_value}'
-        elif selector_value.startswith('class:'):
-            selector_value = f'.{selector_value.split(":", 1)[1]}'
+        selector_value = _normalize_class_selector(selector_value)
         
-        self.logger.debug(f"Class 选择器查找多个元素 - 选择器: {selector_value}, 页面: {self.page}")
+        self.logger.debug("Class 选择器查找多个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
         
         elements = await self.page.query_selector_all(selector_value)
         
         if not elements:
-            self.logger.warning(f"未找到匹配 Class 选择器的元素 - 选择器: {selector_value}")
+            self.logger.warning("未找到匹配 Class 选择器的元素 - 选择器: %s", selector_value)
             raise ElementNotFoundError(selector_value)
         
-        self.logger.info(f"成功使用 Class 选择器找到 {len(elements)} 个元素 - 选择器: {selector_value}")
+        self.logger.info("成功使用 Class 选择器找到 %d 个元素 - 选择器: %s", len(elements), selector_value)
         return elements 
\ No newline at end of file
@@ -1,6 +1,5 @@
 from typing import List, Optional
 from playwright.async_api import Page, ElementHandle
-import logging
 from .base_selector_handler import BaseSelectorHandler, ElementNotFoundError, InvalidSelectorError, SelectorError
 
 class CSSSelectorHandler(BaseSelectorHandler):
@@ -8,6 +7,8 @@ class CSSSelectorHandler(BaseSelectorHandler):
     CSS 选择器处理器
     实现 CSS 选择器的元素查找功能
     """
+    __slots__ = ()
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化 CSS 选择器处理器
@@ -31,22 +32,22 @@ class CSSSelectorHandler(BaseSelectorHandler):
             raise InvalidSelectorError(selector, "CSS 选择器必须是非空字符串")
 
         try:
-            self.logger.debug(f"CSS 选择器查找单个元素: {selector}")
+            self.logger.debug("CSS 选择器查找单个元素: %s", selector)
             
             # 使用 query_selector 方法查找元素
             element = await self.page.query_selector(selector)
 
             if element:
-                self.logger.info(f"成功找到 CSS 元素: {selector}")
+                self.logger.info("成功找到 CSS 元素: %s", selector)
                 return element
             else:
-                self.logger.warning(f"未找到匹配 CSS 选择器的元素: {selector}")
+                self.logger.warning("未找到匹配 CSS 选择器的元素: %s", selector)
                 raise ElementNotFoundError(selector)
 
         except ElementNotFoundError:
             raise
         except Exception as e:
-            self.logger.error(f"CSS 选择器查找元素时发生错误: {selector}, 错误信息: {e}")
+            self.logger.error("CSS 选择器查找元素时发生错误: %s, 错误信息: %s", selector, e)
             raise ElementNotFoundError(selector) from e
 
     async def find_elements(self, selector: str) -> List[ElementHandle]:
@@ -64,20 +65,20 @@ class CSSSelectorHandler(BaseSelectorHandler):
             raise InvalidSelectorError(selector, "CSS 选择器必须是非空字符串")
 
         try:
-            self.logger.debug(f"CSS 选择器查找多个元素: {selector}")
+            self.logger.debug("CSS 选择器查找多个元素: %s", selector)
             
             # 使用 query_selector_all 方法查找元素
             elements = await self.page.query_selector_all(selector)
 
             if elements:
-                self.logger.info(f"成功找到 {len(elements)} 个 CSS 元素: {selector}")
+                self.logger.info("成功找到 %d 个 CSS 元素: %s", len(elements), selector)
                 return elements
             else:
-                self.logger.warning(f"未找到匹配 CSS 选择器的元素: {selector}")
+                self.logger.warning("未找到匹配 CSS 选择器的元素: %s", selector)
                 raise ElementNotFoundError(selector)
 
         except ElementNotFoundError:
             raise
         except Exception as e:
-            self.logger.error(f"CSS 选择器查找多个元素时发生错误: {selector}, 错误信息: {e}")
+            self.logger.error("CSS 选择器查找多个元素时发生错误: %s, 错误信息: %s", selector, e)
             raise ElementNotFoundError(selector) from e 
\ No newline at end of file
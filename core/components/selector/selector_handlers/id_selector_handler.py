@@ -7,6 +7,8 @@ class IDSelectorHandler(BaseSelectorHandler):
     ID 选择器处理器
     实现 ID 选择器的元素查找功能
     """
+    __slots__ = ()
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化 ID 选择器处理器
@@ -33,15 +35,15 @@ class IDSelectorHandler(BaseSelectorHandler):
             if not selector_value.startswith('#'):
                 selector_value = f'#{selector_value}'
             
-            self.logger.debug(f"ID 选择器查找单个元素 - 选择器: {selector_value}, 页面: {self.page}")
+            self.logger.debug("ID 选择器查找单个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
             
             element = await self.page.query_selector(selector_value)
             
             if element is None:
-                self.logger.warning(f"未找到匹配 ID 选择器的元素 - 选择器: {selector_value}")
+                self.logger.warning("未找到匹配 ID 选择器的元素 - 选择器: %s", selector_value)
                 raise ElementNotFoundError(selector_value)
             
-            self.logger.info(f"成功使用 ID 选择器找到元素 - 选择器: {selector_value}")
+            self.logger.info("成功使用 ID 选择器找到元素 - 选择器: %s", selector_value)
             return element
         
         except InvalidSelectorError:
@@ -51,7 +53,7 @@ class IDSelectorHandler(BaseSelectorHandler):
             raise
         
         except Exception as e:
-            self.logger.error(f"使用 ID 选择器查找元素时发生错误 - 选择器: {selector_value}, 错误: {e}")
+            self.logger.error("使用 ID 选择器查找元素时发生错误 - 选择器: %s, 错误: %s", selector_value, e)
             raise ElementNotFoundError(selector_value) from e
 
     async def find_elements(self, selector_value: str) -> List[ElementHandle]:
@@ -72,15 +74,15 @@ class IDSelectorHandler(BaseSelectorHandler):
             if not selector_value.startswith('#'):
                 selector_value = f'#{selector_value}'
             
-            self.logger.debug(f"ID 选择器查找多个元素 - 选择器: {selector_value}, 页面: {self.page}")
+            self.logger.debug("ID 选择器查找多个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
             
             elements = await self.page.query_selector_all(selector_value)
             
             if not elements:
-                self.logger.warning(f"未找到匹配 ID 选择器的元素 - 选择器: {selector_value}")
+                self.logger.warning("未找到匹配 ID 选择器的元素 - 选择器: %s", selector_value)
                 raise ElementNotFoundError(selector_value)
             
-            self.logger.info(f"成功使用 ID 选择器找到 {len(elements)} 个元素 - 选择器: {selector_value}")
+            self.logger.info("成功使用 ID 选择器找到 %d 个元素 - 选择器: %s", len(elements), selector_value)
             return elements
         
         except InvalidSelectorError:
@@ -90,5 +92,5 @@ class IDSelectorHandler(BaseSelectorHandler):
             raise
         
         except Exception as e:
-            self.logger.error(f"使用 ID 选择器查找多个元素时发生错误 - 选择器: {selector_value}, 错误: {e}")
+            self.logger.error("使用 ID 选择器查找多个元素时发生错误 - 选择器: %s, 错误: %s", selector_value, e)
             raise ElementNotFoundError(selector_value) from e 
\ No newline at end of file
@@ -1,12 +1,50 @@
 from typing import List, Optional
+from functools import lru_cache
+import re
 from playwright.async_api import Page, ElementHandle
 from .base_selector_handler import BaseSelectorHandler, ElementNotFoundError, InvalidSelectorError
 
+# 已经带有 Name 选择器前缀的输入
+_NAME_PREFIX_RE = re.compile(r'\[name="|name:')
+
+@lru_cache(maxsize=4096)
+def _normalize_name_selector_cached(selector_value: str) -> str:
+    """
+    将 Name 选择器规范化为 '[name="..."]' 格式（结果缓存）
+    
+    :param selector_value: Name 选择器值
+    :return: CSS 属性选择器
+    :raises InvalidSelectorError: 当选择器无效时
+    """
+    match = _NAME_PREFIX_RE.match(selector_value)
+    if match is None:
+        return f'[name="{selector_value}"]'
+    if match.group() == 'name:':
+        if len(selector_value) == 5:
+            raise InvalidSelectorError(selector_value, "Name 选择器必须是非空字符串")
+        return f'[name="{selector_value[5:]}"]'
+    return selector_value
+
+def _normalize_name_selector(selector_value: str) -> str:
+    """
+    验证并规范化 Name 选择器
+    
+    :param selector_value: Name 选择器值
+    :return: CSS 属性选择器
+    :raises InvalidSelectorError: 当选择器无效时
+    """
+    # 非字符串无法作为缓存键，先行检查
+    if not selector_value or not isinstance(selector_value, str):
+        raise InvalidSelectorError(selector_value, "Name 选择器必须是非空字符串")
+    return _normalize_name_selector_cached(selector_value)
+
 class NameSelectorHandler(BaseSelectorHandler):
     """
     Name 选择器处理器
     实现 Name 选择器的元素查找功能
     """
+    __slots__ = ()
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化 Name 选择器处理器
@@ -24,36 +62,25 @@ class NameSelectorHandler(BaseSelectorHandler):
         :raises ElementNotFoundError: 当无法找到元素时
         :raises InvalidSelectorError: 当选择器无效时
         """
+        selector_value = _normalize_name_selector(selector_value)
+        
         try:
-            # 验证选择器的基本语法
-            if not selector_value or not isinstance(selector_value, str):
-                raise InvalidSelectorError(selector_value, "Name 选择器必须是非空字符串")
-            
-            # 确保 Name 选择器以 '[name=""]' 格式
-            if not selector_value.startswith('[name="') and not selector_value.startswith('name:'):
-                selector_value = f'[name="{selector_value}"]'
-            elif selector_value.startswith('name:'):
-                selector_value = f'[name="{selector_value.split(":", 1)[1]}"]'
-            
-            self.logger.debug(f"Name 选择器查找单个元素 - 选择器: {selector_value}, 页面: {self.page}")
+            self.logger.debug("Name 选择器查找单个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
             
             element = await self.page.query_selector(selector_value)
             
             if element is None:
-                self.logger.warning(f"未找到匹配 Name 选择器的元素 - 选择器: {selector_value}")
+                self.logger.warning("未找到匹配 Name 选择器的元素 - 选择器: %s", selector_value)
                 raise ElementNotFoundError(selector_value)
             
-            self.logger.info(f"成功使用 Name 选择器找到元素 - 选择器: {selector_value}")
+            self.logger.info("成功使用 Name 选择器找到元素 - 选择器: %s", selector_value)
             return element
         
-        except InvalidSelectorError:
-            raise
-        
         except ElementNotFoundError:
             raise
         
         except Exception as e:
-            self.logger.error(f"使用 Name 选择器查找元素时发生错误 - 选择器: {selector_value}, 错误: {e}")
+            self.logger.error("使用 Name 选择器查找元素时发生错误 - 选择器: %s, 错误: %s", selector_value, e)
             raise ElementNotFoundError(selector_value) from e
 
     async def find_elements(self, selector_value: str) -> List[ElementHandle]:
@@ -65,34 +92,23 @@ class NameSelectorHandler(BaseSelectorHandler):
         :raises ElementNotFoundError: 当无法找到元素时
         :raises InvalidSelectorError: 当选择器无效时
         """
+        selector_value = _normalize_name_selector(selector_value)
+        
         try:
-            # 验证选择器的基本语法
-            if not selector_value or not isinstance(selector_value, str):
-                raise InvalidSelectorError(selector_value, "Name 选择器必须是非空字符串")
-            
-            # 确保 Name 选择器以 '[name=""]' 格式
-            if not selector_value.startswith('[name="') and not selector_value.startswith('name:'):
-                selector_value = f'[name="{selector_value}"]'
-            elif selector_value.startswith('name:'):
-                selector_value = f'[name="{selector_value.split(":", 1)[1]}"]'
-            
-            self.logger.debug(f"Name 选择器查找多个元素 - 选择器: {selector_value}, 页面: {self.page}")
+            self.logger.debug("Name 选择器查找多个元素 - 选择器: %s, 页面: %s", selector_value, self.page)
             
             elements = await self.page.query_selector_all(selector_value)
             
             if not elements:
-                self.logger.warning(f"未找到匹配 Name 选择器的元素 - 选择器: {selector_value}")
+                self.logger.warning("未找到匹配 Name 选择器的元素 - 选择器: %s", selector_value)
                 raise ElementNotFoundError(selector_value)
             
-            self.logger.info(f"成功使用 Name 选择器找到 {len(elements)} 个元素 - 选择器: {selector_value}")
+            self.logger.info("成功使用 Name 选择器找到 %d 个元素 - 选择器: %s", len(elements), selector_value)
             return elements
         
-        except InvalidSelectorError:
-            raise
-        
         except ElementNotFoundError:
             raise
         
         except Exception as e:
-            self.logger.error(f"使用 Name 选择器查找多个元素时发生错误 - 选择器: {selector_value}, 错误: {e}")
+            self.logger.error("使用 Name 选择器查找多个元素时发生错误 - 选择器: %s, 错误: %s", selector_value, e)
             raise ElementNotFoundError(selector_value) from e 
\ No newline at end of file
@@ -1,12 +1,18 @@
 from typing import List, Optional
+import re
 from playwright.async_api import Page, ElementHandle
 from .base_selector_handler import BaseSelectorHandler, ElementNotFoundError, InvalidSelectorError, SelectorError
 
+# XPath 选择器必须以 '//' 或 '(' 开头
+_XPATH_PREFIX_RE = re.compile(r'//|\(')
+
 class XPathSelectorHandler(BaseSelectorHandler):
     """
     XPath 选择器处理器
     实现 XPath 选择器的元素查找功能
     """
+    __slots__ = ()
+
     def __init__(self, page: Optional[Page] = None):
         """
         初始化 XPath 选择器处理器
@@ -25,27 +31,25 @@ class XPathSelectorHandler(BaseSelectorHandler):
         if selector is None or not selector:
             raise InvalidSelectorError(str(selector), "选择器必须是非空字符串")
         
-        if not (selector.startswith('//') or selector.startswith('(')):
+        if not _XPATH_PREFIX_RE.match(selector):
             raise InvalidSelectorError(selector, "XPath 选择器必须以 '//' 或 '(' 开头")
 
-        self.logger.debug(f"XPath 选择器查找单个元素: {selector}")
+        self.logger.debug("XPath 选择器查找单个元素: %s", selector)
         
         try:
-            locator = await self.page.locator(selector)
-            first = await locator.first()
-            if first:
-                element = await first.element_handle()
-                if element is not None:
-                    self.logger.info(f"成功找到 XPath 元素: {selector}")
-                    return element
+            # 一次调用直接取得第一个匹配元素
+            element = await self.page.query_selector(f'xpath={selector}')
+            if element is not None:
+                self.logger.info("成功找到 XPath 元素: %s", selector)
+                return element
             
-            self.logger.warning(f"未找到匹配 XPath 选择器的元素: {selector}")
+            self.logger.warning("未找到匹配 XPath 选择器的元素: %s", selector)
             raise ElementNotFoundError(selector)
             
         except ElementNotFoundError:
             raise
         except Exception as e:
-            self.logger.warning(f"未找到匹配 XPath 选择器的元素: {selector}")
+            self.logger.warning("未找到匹配 XPath 选择器的元素: %s", selector)
             raise ElementNotFoundError(selector) from e
 
     async def find_elements(self, selector: str) -> List[ElementHandle]:
@@ -59,25 +63,22 @@ class XPathSelectorHandler(BaseSelectorHandler):
         if selector is None or not selector:
             raise InvalidSelectorError(str(selector), "选择器必须是非空字符串")
         
-        if not (selector.startswith('//') or selector.startswith('(')):
+        if not _XPATH_PREFIX_RE.match(selector):
             raise InvalidSelectorError(selector, "XPath 选择器必须以 '//' 或 '(' 开头")
 
-        self.logger.debug(f"XPath 选择器查找多个元素: {selector}")
+        self.logger.debug("XPath 选择器查找多个元素: %s", selector)
         
         try:
-            # 使用 locator 方法查找元素
-            locator = await self.page.locator(selector)
-            
-            # 获取所有元素句柄
-            elements = await locator.all_element_handles()
+            # 一次调用取得全部匹配元素
+            elements = await self.page.query_selector_all(f'xpath={selector}')
 
             if elements and len(elements) > 0:
-                self.logger.info(f"成功找到 {len(elements)} 个 XPath 元素: {selector}")
+                self.logger.info("成功找到 %d 个 XPath 元素: %s", len(elements), selector)
                 return elements
             else:
-                self.logger.warning(f"未找到匹配 XPath 选择器的元素: {selector}")
+                self.logger.warning("未找到匹配 XPath 选择器的元素: %s", selector)
                 raise ElementNotFoundError(selector)
 
         except Exception as e:
-            self.logger.warning(f"未找到匹配 XPath 选择器的元素: {selector}")
+            self.logger.warning("未找到匹配 XPath 选择器的元素: %s", selector)
             raise ElementNotFoundError(selector) from e 
\ No newline at end of file
@@ -1,9 +1,99 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 import json
+import mmap
 import os
-from typing import Dict, Any, List, Callable
+import re
+import shutil
+from typing import Dict, Any, List, Callable, Iterator, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库
+    orjson = None
+
+# 进程内递增序号，保证同一微秒内保存的文件名也不会重复
+_file_counter = itertools.count()
+
+def _dumps(obj: Any) -> bytes:
+    """
+    将对象序列化为紧凑的 UTF-8 JSON 字节串
+
+    :param obj: 待序列化对象
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """
+    将对象序列化为两空格缩进的 UTF-8 JSON 字节串，供人工查看
+
+    :param obj: 待序列化对象
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _loads(data: bytes) -> Any:
+    """
+    解析 JSON 字节串
+
+    :param data: JSON 字节串
+    :return: 解析结果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# JSON 的结构字符，字符串之外这些字符前后可能有缩进或空格
+_JSON_STRUCTURAL = frozenset(b'{}[]:,')
+
+@lru_cache(maxsize=64)
+def _prefilter_pattern(prefilter: bytes) -> "re.Pattern[bytes]":
+    """
+    将按紧凑 JSON 格式书写的预过滤字节串编译为忽略结构空白的正则，
+    使 b'"type":"A"' 也能匹配缩进格式文件中的 "type": "A"，字符串内容仍按原样匹配
+
+    :param prefilter: 预过滤字节串
+    :return: 编译后的正则
+    """
+    parts = []
+    in_string = escaped = False
+    for byte in prefilter:
+        char = bytes((byte,))
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == b'\\':
+                escaped = True
+            elif char == b'"':
+                in_string = False
+            parts.append(re.escape(char))
+        elif char == b'"':
+            in_string = True
+            parts.append(re.escape(char))
+        elif byte in _JSON_STRUCTURAL:
+            parts.append(rb'\s*' + re.escape(char) + rb'\s*')
+        elif char.isspace():
+            parts.append(rb'\s*')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(b''.join(parts))
+
 class DataStorageManager:
+    # 并发读取数据文件的最大线程数
+    MAX_READ_WORKERS = 32
+    # 清理时并发删除文件的最大线程数，以及启用并发删除的文件数量下限
+    MAX_UNLINK_WORKERS = 8
+    UNLINK_PARALLEL_THRESHOLD = 64
+    # 超过该大小的数据文件通过内存映射直接解析，不再读入完整的字节串副本
+    MMAP_THRESHOLD = 1 << 20
+
     def __init__(self, storage_dir: str = "data"):
         """
         初始化数据存储管理器
@@ -12,49 +102,87 @@ class DataStorageManager:
         """
         self.storage_dir = storage_dir
         self._ensure_storage_dir()
+        # 目录扫描结果缓存，目录修改时间变化或本实例写入、删除文件后重新扫描
+        self._scan_mtime_ns = None
+        self._scan_entries: List[os.DirEntry] = []
 
     def _ensure_storage_dir(self):
         """确保存储目录存在"""
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
 
-    def _generate_filename(self, workflow_id: int) -> str:
+    def _generate_filename(self, workflow_id: int, now: datetime) -> str:
         """
         生成数据文件名
         
         :param workflow_id: 工作流ID
+        :param now: 保存时间
         :return: 文件名
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        return f"workflow_{workflow_id}_{timestamp}.json"
+        return f"workflow_{workflow_id}_{now:%Y%m%d_%H%M%S_%f}_{next(_file_counter)}.json"
 
-    def store_data(self, workflow_id: int, data: Dict[str, Any]) -> str:
+    def _scan(self) -> List[os.DirEntry]:
         """
-        保存工作流提取的数据
+        扫描存储目录中的数据文件，目录未变化时复用上次的结果
         
+        :return: 数据文件目录项列表，最新的文件排在前面
+        """
+        mtime_ns = os.stat(self.storage_dir).st_mtime_ns
+        if mtime_ns != self._scan_mtime_ns:
+            with os.scandir(self.storage_dir) as it:
+                entries = [entry for entry in it if entry.name.endswith('.json')]
+            # 文件名包含时间戳，按文件名倒序即最新的文件排在前面
+            entries.sort(key=lambda entry: entry.name, reverse=True)
+            self._scan_entries = entries
+            self._scan_mtime_ns = mtime_ns
+        return self._scan_entries
+
+    def _invalidate_scan(self):
+        """使目录扫描缓存失效"""
+        self._scan_mtime_ns = None
+
+    @staticmethod
+    def _wrap(workflow_id: int, data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """
+        校验数据并构建完整的存储结构
+
         :param workflow_id: 工作流ID
         :param data: 提取的数据
-        :return: 保存的文件路径
+        :param now: 保存时间
+        :return: 存储结构
         """
         if not isinstance(data, dict):
             raise ValueError("数据必须是字典类型")
             
         if not data:
             raise ValueError("数据不能为空")
-            
-        filename = self._generate_filename(workflow_id)
-        filepath = os.path.join(self.storage_dir, filename)
-        
-        # 构建完整的数据结构
-        storage_data = {
+
+        return {
             'workflow_id': workflow_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'data': data
         }
+
+    def store_data(self, workflow_id: int, data: Dict[str, Any]) -> str:
+        """
+        保存工作流提取的数据
+        
+        :param workflow_id: 工作流ID
+        :param data: 提取的数据
+        :return: 保存的文件路径
+        """
+        # 构建完整的数据结构
+        # 文件名和时间戳使用同一次读取的时间
+        now = datetime.now()
+        storage_data = self._wrap(workflow_id, data, now)
+        
+        filename = self._generate_filename(workflow_id, now)
+        filepath = os.path.join(self.storage_dir, filename)
         
-        # 写入JSON文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(storage_data, f, ensure_ascii=False, indent=2)
+        # 写入紧凑格式的JSON文件
+        with open(filepath, 'wb') as f:
+            f.write(_dumps(storage_data))
+        self._invalidate_scan()
             
         return filepath
 
@@ -68,8 +196,12 @@ class DataStorageManager:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"数据文件不存在: {filepath}")
             
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            # orjson 可以直接解析内存映射的视图，标准库需要完整的字节串
+            if orjson is None or os.fstat(f.fileno()).st_size < self.MMAP_THRESHOLD:
+                return _loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
 
     def get_workflow_data_files(self, workflow_id: int = None) -> List[str]:
         """
@@ -81,26 +213,49 @@ class DataStorageManager:
         if workflow_id is not None and not workflow_id:
             raise ValueError("工作流ID不能为空")
             
-        files = []
-        for filename in os.listdir(self.storage_dir):
-            if filename.endswith('.json'):
-                if workflow_id is None or f"workflow_{workflow_id}_" in filename:
-                    files.append(os.path.join(self.storage_dir, filename))
-        return sorted(files, reverse=True)  # 最新的文件排在前面
+        entries = self._scan()
+        if workflow_id is None:
+            return [entry.path for entry in entries]
+        
+        # 前缀只构造一次，按文件名开头匹配，避免子串扫描误匹配其他位置
+        prefix = f"workflow_{workflow_id}_"
+        return [entry.path for entry in entries if entry.name.startswith(prefix)]
 
-    def export_data(self, source_path: str, target_path: str):
+    def pretty(self, filepath: str) -> str:
+        """
+        读取数据文件并格式化为缩进的 JSON 文本，供人工查看
+        数据文件以紧凑格式保存，只在需要查看时格式化
+        
+        :param filepath: 数据文件路径
+        :return: 格式化后的 JSON 文本
+        """
+        return _dumps_pretty(self.load_data(filepath)).decode('utf-8')
+
+    def export_data(self, source_path: str, target_path: str,
+                    transform: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                    pretty: bool = False):
         """
         导出数据到指定文件
+        未指定转换函数且不需要格式化时直接复制文件，不解析和重新序列化数据
         
         :param source_path: 源数据文件路径
         :param target_path: 目标文件路径
+        :param transform: 可选的数据转换函数，指定时写出转换后的数据
+        :param pretty: 是否以缩进格式写出，默认写出紧凑格式
         """
         if not os.path.exists(source_path):
             raise FileNotFoundError(f"源数据文件不存在: {source_path}")
+        
+        if transform is None and not pretty:
+            shutil.copyfile(source_path, target_path)
+            return
             
         data = self.load_data(source_path)
-        with open(target_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if transform is not None:
+            data = transform(data)
+        
+        with open(target_path, 'wb') as f:
+            f.write(_dumps_pretty(data) if pretty else _dumps(data))
 
     def delete_data(self, filepath: str) -> bool:
         """
@@ -113,27 +268,94 @@ class DataStorageManager:
             raise FileNotFoundError(f"数据文件不存在: {filepath}")
             
         os.remove(filepath)
+        self._invalidate_scan()
         return True
 
-    def search_data_files(self, workflow_id: int, condition: Callable[[Dict[str, Any]], bool]) -> List[str]:
+    def delete_data_batch(self, filepaths: List[str]) -> int:
+        """
+        批量删除数据文件，整批只使目录扫描缓存失效一次
+        
+        :param filepaths: 数据文件路径列表
+        :return: 实际删除的文件数，不存在或无法删除的文件不计入
+        """
+        deleted = 0
+        for filepath in filepaths:
+            try:
+                os.unlink(filepath)
+            except OSError:
+                continue
+            deleted += 1
+        self._invalidate_scan()
+        return deleted
+
+    @staticmethod
+    def _try_load(filepath: str, prefilter: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """
+        加载数据文件，文件不存在、无法解析或不包含预过滤字节串时返回 None
+        
+        :param filepath: 数据文件路径
+        :param prefilter: 可选的预过滤字节串，忽略 JSON 结构空白后文件内容不包含时不解析
+        :return: 加载的数据
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            if prefilter is not None and not _prefilter_pattern(prefilter).search(raw):
+                return None
+            return _loads(raw)
+        except (OSError, ValueError):
+            return None
+
+    def _load_many(self, filepaths: List[str], prefilter: Optional[bytes] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        在线程池中并发读取多个数据文件，结果顺序与路径顺序一致
+        
+        :param filepaths: 数据文件路径列表
+        :param prefilter: 可选的预过滤字节串
+        :return: 加载的数据列表，无法读取或被预过滤的文件对应 None
+        """
+        load = partial(self._try_load, prefilter=prefilter)
+        if len(filepaths) <= 1:
+            return [load(filepath) for filepath in filepaths]
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_READ_WORKERS, len(filepaths))) as executor:
+            return list(executor.map(load, filepaths))
+
+    def _iter_records(self, workflow_id: int, prefilter: Optional[bytes] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        依次读取工作流的全部数据记录，无法解析的文件会被跳过
+        
+        :param workflow_id: 工作流ID
+        :param prefilter: 可选的预过滤字节串，不包含该字节串的文件不解析
+        :return: (文件路径, 记录) 迭代器
+        """
+        filepaths = self.get_workflow_data_files(workflow_id)
+        for filepath, data in zip(filepaths, self._load_many(filepaths, prefilter)):
+            if data is not None:
+                yield filepath, data
+
+    def search_data_files(self, workflow_id: int, condition: Callable[[Dict[str, Any]], bool],
+                          prefilter: Optional[bytes] = None) -> List[str]:
         """
         搜索符合条件的数据文件
         
         :param workflow_id: 工作流ID
         :param condition: 搜索条件函数
+        :param prefilter: 可选的预过滤字节串，如 b'"status":"ok"'，按紧凑 JSON 格式书写，
+                          同样匹配缩进格式的文件；不包含该字节串的文件直接跳过，不解析也不调用搜索条件
         :return: 符合条件的文件路径列表
         """
         if not callable(condition):
             raise ValueError("搜索条件必须是可调用的函数")
             
         matching_files = []
-        for filepath in self.get_workflow_data_files(workflow_id):
+        for filepath, data in self._iter_records(workflow_id, prefilter):
             try:
-                data = self.load_data(filepath)
-                if condition(data.get('data', {})):
-                    matching_files.append(filepath)
-            except:
+                matched = condition(data.get('data', {}))
+            except Exception:
                 continue
+            if matched:
+                matching_files.append(filepath)
         return matching_files
 
     def aggregate_data(self, workflow_id: int, value_getter: Callable[[Dict[str, Any]], Any], aggregator: Callable[[List[Any]], Any]) -> Any:
@@ -149,16 +371,27 @@ class DataStorageManager:
             raise ValueError("值获取函数和聚合函数必须是可调用的")
             
         values = []
-        for filepath in self.get_workflow_data_files(workflow_id):
+        for _, data in self._iter_records(workflow_id):
             try:
-                data = self.load_data(filepath)
                 value = value_getter(data.get('data', {}))
-                if value is not None:
-                    values.append(value)
-            except:
+            except Exception:
                 continue
+            if value is not None:
+                values.append(value)
         return aggregator(values) if values else None
 
+    @staticmethod
+    def _unlink_quietly(filepath: str):
+        """
+        删除文件，文件已不存在时忽略
+        
+        :param filepath: 文件路径
+        """
+        try:
+            os.unlink(filepath)
+        except FileNotFoundError:
+            pass
+
     def cleanup_old_data(self, days: int = 30):
         """
         清理指定天数之前的数据文件
@@ -167,6 +400,24 @@ class DataStorageManager:
         """
         cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
         
-        for filepath in self.get_workflow_data_files():
-            if os.path.getmtime(filepath) < cutoff:
-                self.delete_data(filepath) 
\ No newline at end of file
+        # 单次扫描目录，直接比较目录项的修改时间，不需要排序和逐个检查文件是否存在
+        expired = []
+        with os.scandir(self.storage_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        expired.append(entry.path)
+                except FileNotFoundError:
+                    continue
+        if not expired:
+            return
+        
+        if len(expired) < self.UNLINK_PARALLEL_THRESHOLD:
+            for filepath in expired:
+                self._unlink_quietly(filepath)
+        else:
+            with ThreadPoolExecutor(max_workers=self.MAX_UNLINK_WORKERS) as executor:
+                list(executor.map(self._unlink_quietly, expired))
+        self._invalidate_scan()
@@ -1,54 +1,94 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from playwright.async_api import Error as PlaywrightError
 from database.crud_manager import CRUDManager
-from core.components.browser.browser_manager import BrowserManager
+from core.components.browser.browser_pool import BrowserPool
 from core.components.action.base_action_handler import BaseActionHandler
+from core.components.action.handlers.extraction_handlers import (
+    ExtractTextHandler, ExtractAttributeHandler, ExtractHtmlHandler,
+    ExtractUrlHandler, ExtractMultipleHandler
+)
+from core.components.selector.selector_engine import SelectorEngine
+from weakref import WeakKeyDictionary
 import logging
 import asyncio
 
 class WorkflowEngine:
     """工作流引擎"""
     
-    def __init__(self):
+    # 动作类型到处理器类的映射
+    ACTION_HANDLERS = {
+        'extract_text': ExtractTextHandler,
+        'extract_attribute': ExtractAttributeHandler,
+        'extract_html': ExtractHtmlHandler,
+        'extract_url': ExtractUrlHandler,
+        'extract_multiple': ExtractMultipleHandler
+    }
+    
+    def __init__(self, browser_pool: Optional[BrowserPool] = None):
+        """
+        初始化工作流引擎
+        
+        :param browser_pool: 可选的浏览器池，默认使用全局共享池
+        """
         self.crud_manager = CRUDManager()
-        self.browser_manager = BrowserManager()
+        self.browser_pool = browser_pool or BrowserPool.get_instance()
+        # 每个页面共用一个选择器引擎，动作处理器按类型创建一次后在该页面的所有步骤中复用
+        self._page_handlers: "WeakKeyDictionary[Any, Tuple[SelectorEngine, Dict[str, BaseActionHandler]]]" = WeakKeyDictionary()
         self.logger = logging.getLogger(__name__)
 
-    async def execute_workflow(self, workflow_id: int) -> Dict[str, Any]:
+    async def execute_workflow(self, workflow_id: int,
+                               workflow: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         执行工作流
         
         :param workflow_id: 工作流ID
+        :param workflow: 已经通过 load_workflow 加载的工作流，未指定时按ID加载
         :return: 执行结果
         """
+        browser = None
+        context = None
+        discard = False
+        
         try:
             # 加载工作流
-            workflow = self.load_workflow(workflow_id)
+            if workflow is None:
+                workflow = await self.load_workflow(workflow_id)
             if not workflow:
                 raise ValueError(f"工作流不存在: {workflow_id}")
             
-            # 初始化浏览器
-            await self.browser_manager.init()
+            # 借用浏览器前先校验步骤依赖，工作流定义错误不占用也不回收浏览器
+            layers = self._build_layers(workflow['steps'])
             
-            # 创建上下文和页面
-            page = await self.browser_manager.create_page()
+            # 从浏览器池借用常驻的浏览器，每次执行只创建独立的上下文和页面
+            browser = await self.browser_pool.acquire()
+            context = await browser.new_context()
+            page = await context.new_page()
             
-            # 执行步骤
+            # 按依赖分层执行步骤，同一层的步骤并发执行
             results = []
-            for step in workflow['steps']:
-                try:
-                    result = await self._execute_step(page, step)
-                    results.append({
-                        'step_id': step['id'],
-                        'status': 'success',
-                        'data': result
-                    })
-                except Exception as e:
-                    self.logger.error(f"步骤执行失败: {e}")
-                    results.append({
-                        'step_id': step['id'],
-                        'status': 'error',
-                        'error': str(e)
-                    })
+            for layer in layers:
+                outcomes = await asyncio.gather(
+                    *[self._execute_step(page, step) for step in layer],
+                    return_exceptions=True
+                )
+                failed = False
+                for step, outcome in zip(layer, outcomes):
+                    if isinstance(outcome, Exception):
+                        self.logger.error("步骤执行失败: %s", outcome)
+                        results.append({
+                            'step_id': step['id'],
+                            'status': 'error',
+                            'error': str(outcome)
+                        })
+                        failed = True
+                    else:
+                        results.append({
+                            'step_id': step['id'],
+                            'status': 'success',
+                            'data': outcome
+                        })
+                # 有步骤失败时不再执行后续步骤
+                if failed:
                     break
             
             return {
@@ -58,32 +98,83 @@ class WorkflowEngine:
             }
             
         except Exception as e:
-            self.logger.error(f"工作流执行失败: {e}")
+            # 只有浏览器或上下文出错时才回收浏览器，连接已断开的实例在归还时由浏览器池回收
+            discard = browser is not None and isinstance(e, PlaywrightError)
+            self.logger.error("工作流执行失败: %s", e)
             return {
                 'workflow_id': workflow_id,
                 'status': 'error',
                 'error': str(e)
             }
         finally:
-            await self.browser_manager.close()
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    discard = True
+                    self.logger.warning("关闭浏览器上下文失败: %s", e)
+            if browser is not None:
+                await self.browser_pool.release(browser, discard=discard)
 
-    def load_workflow(self, workflow_id: int) -> Optional[Dict[str, Any]]:
+    async def load_workflow(self, workflow_id: int) -> Optional[Dict[str, Any]]:
         """
-        加载工作流
+        加载工作流，工作流和步骤在一次查询中获取
         
         :param workflow_id: 工作流ID
-        :return: 工作流数据
+        :return: 工作流数据，工作流不存在时返回 None
         """
-        workflow = self.crud_manager.get_workflow(workflow_id)
-        if not workflow:
+        data = await self.crud_manager.get_workflow_with_steps(workflow_id)
+        if not data:
             return None
-            
-        # 加载步骤
-        steps = self.crud_manager.get_workflow_steps(workflow_id)
-        workflow['steps'] = sorted(steps, key=lambda x: x['step_order'])
         
+        workflow = data['workflow']
+        workflow['steps'] = sorted(data['steps'], key=lambda x: x['step_order'])
         return workflow
 
+    @staticmethod
+    def _build_layers(steps: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        根据步骤依赖拓扑分层
+        
+        步骤可以通过 depends_on 指定所依赖步骤的 id 列表，未指定时依赖上一个步骤，保持顺序执行；
+        depends_on 为空列表的步骤不依赖任何步骤
+        
+        :param steps: 按顺序排列的步骤列表
+        :return: 分层后的步骤列表，每层内的步骤互不依赖
+        :raises ValueError: 依赖不存在、id 重复或存在循环依赖时
+        """
+        step_ids = set()
+        for step in steps:
+            if step['id'] in step_ids:
+                raise ValueError(f"重复的步骤 id: {step['id']}")
+            step_ids.add(step['id'])
+        
+        deps = []
+        previous_id = None
+        for step in steps:
+            if 'depends_on' in step:
+                depends_on = set(step['depends_on'] or [])
+            else:
+                depends_on = set() if previous_id is None else {previous_id}
+            missing = depends_on - step_ids
+            if missing:
+                raise ValueError(f"依赖的步骤不存在: {sorted(missing)}")
+            deps.append(depends_on)
+            previous_id = step['id']
+        
+        layers = []
+        done = set()
+        pending = list(zip(steps, deps))
+        while pending:
+            ready = [step for step, depends_on in pending if depends_on <= done]
+            if not ready:
+                raise ValueError("步骤之间存在循环依赖")
+            layers.append(ready)
+            done.update(step['id'] for step in ready)
+            pending = [(step, depends_on) for step, depends_on in pending if step['id'] not in done]
+        
+        return layers
+
     async def _execute_step(self, page: Any, step: Dict[str, Any]) -> Any:
         """
         执行单个步骤
@@ -109,9 +200,21 @@ class WorkflowEngine:
         """
         获取动作处理器
         
+        同一页面上的同类动作复用同一个处理器实例，页面关闭释放后处理器随之回收
         :param action_type: 动作类型
         :param page: 页面对象
-        :return: 处理器实例
+        :return: 处理器实例，不支持的动作类型返回 None
         """
-        # TODO: 实现动作处理器的获取逻辑
-        return None 
\ No newline at end of file
+        handler_class = self.ACTION_HANDLERS.get(action_type)
+        if handler_class is None:
+            return None
+        
+        page_handlers = self._page_handlers.get(page)
+        if page_handlers is None:
+            page_handlers = self._page_handlers[page] = (SelectorEngine(page), {})
+        selector_engine, handlers = page_handlers
+        
+        handler = handlers.get(action_type)
+        if handler is None:
+            handler = handlers[action_type] = handler_class(page, selector_engine)
+        return handler 
\ No newline at end of file
@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (
     QLineEdit
 )
 from PyQt5.QtCore import Qt
-from core.components.anti_crawler.anti_crawler_manager import AntiCrawlerManager
+from core.components.anti_crawler.anti_crawler_manager import get_anti_crawler_manager
 
 class ProxyDialog(QDialog):
     """代理配置对话框"""
@@ -51,7 +51,7 @@ class AntiCrawlerConfigWidget(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.anti_crawler = AntiCrawlerManager()
+        self.anti_crawler = get_anti_crawler_manager()
         self.setup_ui()
         self.load_config()
 
@@ -132,22 +132,48 @@ class AntiCrawlerConfigWidget(QWidget):
     def load_config(self):
         """加载配置"""
         # 加载 User-Agent
-        self.ua_list.clear()
-        for ua in self.anti_crawler.user_agents:
-            self.ua_list.addItem(ua)
+        self._fill_list(self.ua_list, list(self.anti_crawler.user_agents))
         
         # 加载代理
-        self.proxy_list.clear()
-        for proxy in self.anti_crawler.proxies:
-            self.proxy_list.addItem(
-                f"HTTP: {proxy['http']}, HTTPS: {proxy['https']}"
-            )
+        proxies = list(self.anti_crawler.proxies)
+        self._fill_list(self.proxy_list, [self._proxy_label(proxy) for proxy in proxies], proxies)
         
         # 加载延迟配置
         self.min_delay.setValue(self.anti_crawler.delay_config["min_delay"])
         self.max_delay.setValue(self.anti_crawler.delay_config["max_delay"])
         self.random_delay.setChecked(self.anti_crawler.delay_config["random_delay"])
 
+    @staticmethod
+    def _proxy_label(proxy: dict) -> str:
+        """
+        生成代理在列表中显示的文本
+        
+        :param proxy: 代理配置
+        :return: 显示文本
+        """
+        return f"HTTP: {proxy['http']}, HTTPS: {proxy['https']}"
+
+    @staticmethod
+    def _fill_list(list_widget: QListWidget, texts: list, data: list = None):
+        """
+        批量填充列表，填充期间暂停重绘和信号，避免逐项插入时反复刷新布局
+        
+        :param list_widget: 列表控件
+        :param texts: 列表项文本
+        :param data: 可选的列表项数据，按顺序保存到各项的 Qt.UserRole
+        """
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        try:
+            list_widget.clear()
+            list_widget.addItems(texts)
+            if data is not None:
+                for row, value in enumerate(data):
+                    list_widget.item(row).setData(Qt.UserRole, value)
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
+
     def add_user_agent(self):
         """添加 User-Agent"""
         ua, ok = QInputDialog.getText(
@@ -184,9 +210,9 @@ class AntiCrawlerConfigWidget(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             proxy = dialog.get_proxy()
             if self.anti_crawler.add_proxy(proxy):
-                self.proxy_list.addItem(
-                    f"HTTP: {proxy['http']}, HTTPS: {proxy['https']}"
-                )
+                item = QListWidgetItem(self._proxy_label(proxy))
+                item.setData(Qt.UserRole, proxy)
+                self.proxy_list.addItem(item)
                 QMessageBox.information(self, "成功", "代理添加成功")
             else:
                 QMessageBox.warning(self, "失败", "代理验证失败，请检查代理配置")
@@ -206,12 +232,7 @@ class AntiCrawlerConfigWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            proxy_text = current_item.text()
-            # 解析代理文本
-            http = proxy_text.split("HTTP: ")[1].split(",")[0].strip()
-            https = proxy_text.split("HTTPS: ")[1].strip()
-            proxy = {"http": http, "https": https}
-            
+            proxy = current_item.data(Qt.UserRole)
             self.anti_crawler.remove_proxy(proxy)
             self.proxy_list.takeItem(self.proxy_list.row(current_item))
 
@@ -221,11 +242,7 @@ class AntiCrawlerConfigWidget(QWidget):
         if not current_item:
             return
             
-        proxy_text = current_item.text()
-        # 解析代理文本
-        http = proxy_text.split("HTTP: ")[1].split(",")[0].strip()
-        https = proxy_text.split("HTTPS: ")[1].strip()
-        proxy = {"http": http, "https": https}
+        proxy = current_item.data(Qt.UserRole)
         
         if self.anti_crawler.validate_proxy(proxy):
             QMessageBox.information(self, "测试结果", "代理可用")
@@ -1,23 +1,253 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QComboBox,
+    QTableView, QComboBox,
     QLabel, QGroupBox, QMessageBox, QFileDialog,
-    QHeaderView
+    QHeaderView, QListWidget, QListWidgetItem, QAbstractItemView,
+    QDialog, QTextEdit
+)
+from PyQt5.QtCore import (
+    Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex,
+    QObject, QRunnable, QThreadPool
 )
-from PyQt5.QtCore import Qt
 from database.crud_manager import CRUDManager
 from core.components.storage.data_storage_manager import DataStorageManager
+import csv
+import io
 import json
 import os
+import shutil
+import time
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库
+    orjson = None
+
+# 导出文件时的写缓冲区大小
+CSV_BUFFER_SIZE = 1 << 20
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# 流式导出 JSON 时每写出多少条记录报告一次进度
+EXPORT_PROGRESS_INTERVAL = 1000
+
+# 工作流列表和数据文件列表的缓存时间（秒）
+LISTING_CACHE_TTL = 5.0
+
+# 表格中数据列最多显示的字符数，完整内容双击单元格查看
+PREVIEW_LENGTH = 256
+
+def _dumps_pretty(obj) -> bytes:
+    """
+    将对象序列化为两空格缩进的 UTF-8 JSON 字节串
+    
+    :param obj: 待序列化对象
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _dumps(obj) -> bytes:
+    """
+    将对象序列化为紧凑的 UTF-8 JSON 字节串
+    
+    :param obj: 待序列化对象
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _format_data_content(data_content) -> str:
+    """
+    将数据内容格式化为完整的文本，用于 CSV 导出和详情查看
+    
+    :param data_content: 数据内容
+    :return: 显示文本
+    """
+    if isinstance(data_content, (dict, list)):
+        return _dumps_pretty(data_content).decode('utf-8')
+    return str(data_content)
+
+def _preview_data_content(data_content) -> str:
+    """
+    生成数据内容在表格中显示的预览文本，使用紧凑格式并截断过长的内容
+    
+    :param data_content: 数据内容
+    :return: 预览文本
+    """
+    if isinstance(data_content, (dict, list)):
+        text = _dumps(data_content).decode('utf-8')
+    else:
+        text = str(data_content)
+    return text if len(text) <= PREVIEW_LENGTH else text[:PREVIEW_LENGTH] + '…'
+
+class DataTableModel(QAbstractTableModel):
+    """数据表格模型，按需读取记录，只为实际显示的单元格生成文本"""
+    
+    HEADERS = ("步骤", "类型", "数据")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        # 各行的预览文本缓存，按行号缓存，记录变化时清空
+        self._row_texts = {}
+
+    def set_rows(self, rows: list):
+        """
+        替换显示的记录
+        
+        :param rows: 记录列表
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._row_texts = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        
+        return self.row_texts(index.row())[index.column()]
+
+    def row_texts(self, row: int) -> tuple:
+        """
+        获取一行在表格中显示的文本，每行只格式化一次
+        
+        :param row: 行号
+        :return: (步骤ID, 类型, 数据预览) 文本
+        """
+        texts = self._row_texts.get(row)
+        if texts is None:
+            item = self._rows[row]
+            texts = self._row_texts[row] = (
+                str(item.get('step_id', '')),
+                item.get('type', ''),
+                _preview_data_content(item.get('data', ''))
+            )
+        return texts
+
+    def row_data(self, row: int):
+        """
+        获取一行的数据内容
+        
+        :param row: 行号
+        :return: 数据内容
+        """
+        return self._rows[row].get('data', '')
+
+    def iter_export_rows(self):
+        """
+        按顺序生成当前全部记录的完整文本，用于导出
+        调用时即固定当前的记录，之后模型重置不影响已经取得的迭代器，可以在后台线程中使用
+        
+        :return: (步骤ID, 类型, 数据) 文本迭代器
+        """
+        rows = self._rows
+        return (
+            (str(item.get('step_id', '')), item.get('type', ''), _format_data_content(item.get('data', '')))
+            for item in rows
+        )
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class _IOWorkerSignals(QObject):
+    """后台 I/O 任务的信号"""
+    finished = pyqtSignal(object)  # 完成信号，携带任务的返回值
+    error = pyqtSignal(str)  # 错误信号
+
+class _IOWorker(QRunnable):
+    """在线程池中执行的文件读写任务，结果通过信号回到 UI 线程"""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = _IOWorkerSignals()
+
+    def run(self):
+        """执行任务"""
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+class JsonExportThread(QThread):
+    """JSON 导出线程，逐条写出记录，避免在内存中构建完整的 JSON 文本并阻塞 UI 线程"""
+    
+    progress = pyqtSignal(int)  # 已写出的记录数
+    exported = pyqtSignal(str)  # 导出完成信号，携带导出路径
+    error = pyqtSignal(str)  # 错误信号
+
+    def __init__(self, data: dict, file_path: str):
+        super().__init__()
+        self.data = data
+        self.file_path = file_path
+
+    def run(self):
+        """执行导出"""
+        try:
+            with open(self.file_path, 'wb', buffering=0) as raw:
+                with io.BufferedWriter(raw, EXPORT_BUFFER_SIZE) as f:
+                    self._write(f)
+            self.exported.emit(self.file_path)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _write(self, f):
+        """
+        写出 JSON 对象，data 以外的字段整体写出，data 中的记录逐条写出，每条记录占一行
+        
+        :param f: 二进制文件对象
+        """
+        f.write(b'{')
+        for key, value in self.data.items():
+            if key == 'data':
+                continue
+            f.write(_dumps(str(key)) + b':' + _dumps(value) + b',')
+        
+        f.write(b'"data":[')
+        for index, record in enumerate(self.data.get('data', [])):
+            if index:
+                f.write(b',')
+            f.write(b'\n' + _dumps(record))
+            if (index + 1) % EXPORT_PROGRESS_INTERVAL == 0:
+                self.progress.emit(index + 1)
+        f.write(b'\n]}')
 
 class DataViewerWidget(QWidget):
     """数据查看器组件"""
 
-    def __init__(self):
+    def __init__(self, crud_manager: CRUDManager = None, data_storage: DataStorageManager = None):
+        """
+        初始化数据查看器组件
+        
+        :param crud_manager: 共用的 CRUD 管理器，未指定时创建新的实例
+        :param data_storage: 共用的数据存储管理器，未指定时创建新的实例
+        """
         super().__init__()
-        self.crud_manager = CRUDManager()
-        self.data_storage = DataStorageManager()
+        self.crud_manager = crud_manager or CRUDManager()
+        self.data_storage = data_storage or DataStorageManager()
         self.current_data = None
+        # current_data 对应的源文件路径，查看器不修改数据，导出 JSON 时可以直接复制
+        self.current_data_path = None
+        self.export_thread = None
+        # 工作流列表和各工作流数据文件列表的缓存，值为 (缓存时间, 列表)
+        self._workflows_cache = None
+        self._files_cache = {}
+        # 正在执行的后台 I/O 任务，保持引用直到任务结束
+        self._workers = set()
         self.setup_ui()
 
     def setup_ui(self):
@@ -36,10 +266,12 @@ class DataViewerWidget(QWidget):
         self.workflow_selector.currentIndexChanged.connect(self.on_workflow_changed)
         
         # 数据文件选择
-        self.file_selector = QComboBox()
+        # 支持多选，批量删除时只确认一次
+        self.file_selector = QListWidget()
+        self.file_selector.setSelectionMode(QAbstractItemView.ExtendedSelection)
         selection_layout.addWidget(QLabel("数据文件:"))
         selection_layout.addWidget(self.file_selector)
-        self.file_selector.currentIndexChanged.connect(self.load_data)
+        self.file_selector.currentItemChanged.connect(lambda current, previous: self.load_data())
         
         layout.addWidget(selection_group)
         
@@ -49,7 +281,7 @@ class DataViewerWidget(QWidget):
         
         # 刷新按钮
         refresh_button = QPushButton("刷新")
-        refresh_button.clicked.connect(self.refresh)
+        refresh_button.clicked.connect(lambda: self.refresh(force=True))
         toolbar_layout.addWidget(refresh_button)
         
         # 导出按钮
@@ -65,22 +297,67 @@ class DataViewerWidget(QWidget):
         layout.addWidget(toolbar_group)
         
         # 数据表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)  # 默认3列：步骤、类型、数据
-        self.table.setHorizontalHeaderLabels(["步骤", "类型", "数据"])
+        self.model = DataTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)  # 3列：步骤、类型、数据
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self._show_full_cell)
         layout.addWidget(self.table)
 
     def load_workflows(self):
-        """加载工作流列表"""
-        self.workflow_selector.clear()
-        self.workflow_selector.addItem("全部工作流", None)
-        workflows = self.crud_manager.get_all_workflows()
-        for workflow in workflows:
-            self.workflow_selector.addItem(
-                f"{workflow['name']} (ID: {workflow['id']})",
-                workflow['id']
-            )
+        """
+        加载工作流列表
+        按工作流ID增量更新下拉框，只增删和修改有变化的项，更新期间不触发选择变更信号
+        """
+        workflows = [
+            (workflow['id'], f"{workflow['name']} (ID: {workflow['id']})")
+            for workflow in self._get_workflows()
+        ]
+        selector = self.workflow_selector
+        
+        selector.blockSignals(True)
+        try:
+            if selector.count() == 0:
+                selector.addItem("全部工作流", None)
+            
+            # 删除已经不存在的工作流，第 0 项为“全部工作流”
+            workflow_ids = {workflow_id for workflow_id, _ in workflows}
+            for index in range(selector.count() - 1, 0, -1):
+                if selector.itemData(index) not in workflow_ids:
+                    selector.removeItem(index)
+            
+            # 按顺序插入新增的工作流，移动位置变化的项，更新名称变化的项
+            for position, (workflow_id, label) in enumerate(workflows, start=1):
+                index = selector.findData(workflow_id)
+                if index == position:
+                    if selector.itemText(index) != label:
+                        selector.setItemText(index, label)
+                    continue
+                if index >= 0:
+                    selector.removeItem(index)
+                selector.insertItem(position, label, workflow_id)
+        finally:
+            selector.blockSignals(False)
+
+    def _get_workflows(self) -> list:
+        """获取工作流列表，缓存未过期时不查询数据库"""
+        now = time.monotonic()
+        if self._workflows_cache is None or now - self._workflows_cache[0] >= LISTING_CACHE_TTL:
+            self._workflows_cache = (now, self.crud_manager.get_all_workflows())
+        return self._workflows_cache[1]
+
+    def _list_data_files(self, workflow_id: int = None) -> list:
+        """获取工作流的数据文件列表，缓存未过期时不扫描文件系统"""
+        now = time.monotonic()
+        cached = self._files_cache.get(workflow_id)
+        if cached is None or now - cached[0] >= LISTING_CACHE_TTL:
+            cached = self._files_cache[workflow_id] = (now, self.data_storage.get_workflow_data_files(workflow_id))
+        return cached[1]
+
+    def invalidate_cache(self):
+        """使工作流列表和数据文件列表缓存失效"""
+        self._workflows_cache = None
+        self._files_cache.clear()
 
     def on_workflow_changed(self):
         """工作流选择变更处理"""
@@ -88,64 +365,103 @@ class DataViewerWidget(QWidget):
         self.load_data_files(workflow_id)
 
     def load_data_files(self, workflow_id: int = None):
-        """加载数据文件列表"""
-        self.file_selector.clear()
-        files = self.data_storage.list_workflow_data(workflow_id)
+        """
+        加载数据文件列表
+        重建列表期间不触发选择变更信号，之前选中的文件仍然存在时保持选中，否则选中第一个文件，
+        最后只加载一次数据，选中的文件已经在显示时不重新加载
+        """
+        previous = self._current_file()
+        self.file_selector.blockSignals(True)
+        try:
+            self.file_selector.clear()
+            row = 0
+            for index, filepath in enumerate(self._list_data_files(workflow_id)):
+                item = QListWidgetItem(os.path.basename(filepath))
+                item.setData(Qt.UserRole, filepath)
+                self.file_selector.addItem(item)
+                if filepath == previous:
+                    row = index
+            if self.file_selector.count() > 0:
+                self.file_selector.setCurrentRow(row)
+        finally:
+            self.file_selector.blockSignals(False)
         
-        for filepath in files:
-            filename = os.path.basename(filepath)
-            self.file_selector.addItem(filename, filepath)
-            
-        if self.file_selector.count() > 0:
-            self.load_data()  # 加载第一个文件的数据
-        else:
+        filepath = self._current_file()
+        if filepath is None:
             self.clear_table()
+        elif filepath != self.current_data_path:
+            self.load_data()
+
+    def _current_file(self):
+        """获取当前数据文件路径，没有选中文件时返回 None"""
+        item = self.file_selector.currentItem()
+        return item.data(Qt.UserRole) if item is not None else None
+
+    def _run_io(self, on_finished, on_error, fn, *args):
+        """
+        在线程池中执行文件读写，完成后在 UI 线程中调用回调
+        
+        :param on_finished: 完成回调，参数为任务的返回值
+        :param on_error: 错误回调，参数为错误信息
+        :param fn: 要执行的函数
+        :param args: 函数参数
+        """
+        worker = _IOWorker(fn, *args)
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda result: (self._workers.discard(worker), on_finished(result)))
+        worker.signals.error.connect(lambda error: (self._workers.discard(worker), on_error(error)))
+        QThreadPool.globalInstance().start(worker)
 
     def load_data(self):
-        """加载数据文件内容"""
-        filepath = self.file_selector.currentData()
+        """在后台加载数据文件内容"""
+        filepath = self._current_file()
         if not filepath:
             self.clear_table()
             return
-            
-        try:
-            data = self.data_storage.load_workflow_data(filepath)
+        
+        def on_loaded(data):
+            # 加载期间已切换到其他文件时丢弃结果
+            if self._current_file() != filepath:
+                return
             self.current_data = data
+            self.current_data_path = filepath
             self.display_data(data)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"加载数据失败: {str(e)}")
+        
+        def on_error(error):
+            if self._current_file() != filepath:
+                return
+            QMessageBox.critical(self, "错误", f"加载数据失败: {error}")
             self.clear_table()
+        
+        self._run_io(on_loaded, on_error, self.data_storage.load_data, filepath)
 
     def display_data(self, data: dict):
-        """显示数据到表格"""
-        self.clear_table()
-        
+        """显示数据到表格，单元格文本在显示时按需生成"""
         if not data or 'data' not in data:
+            self.model.set_rows([])
             return
-            
-        extracted_data = data['data']
-        self.table.setRowCount(len(extracted_data))
         
-        for row, item in enumerate(extracted_data):
-            # 步骤ID
-            step_item = QTableWidgetItem(str(item.get('step_id', '')))
-            self.table.setItem(row, 0, step_item)
-            
-            # 数据类型
-            type_item = QTableWidgetItem(item.get('type', ''))
-            self.table.setItem(row, 1, type_item)
-            
-            # 数据内容
-            data_content = item.get('data', '')
-            if isinstance(data_content, (dict, list)):
-                data_content = json.dumps(data_content, ensure_ascii=False, indent=2)
-            data_item = QTableWidgetItem(str(data_content))
-            self.table.setItem(row, 2, data_item)
+        self.model.set_rows(data['data'])
+
+    def _show_full_cell(self, index):
+        """双击单元格时显示该行完整的数据内容"""
+        if not index.isValid():
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("数据详情")
+        dialog.resize(600, 400)
+        text_edit = QTextEdit(dialog)
+        text_edit.setReadOnly(True)
+        text_edit.setPlainText(_format_data_content(self.model.row_data(index.row())))
+        QVBoxLayout(dialog).addWidget(text_edit)
+        dialog.exec_()
 
     def clear_table(self):
         """清空表格"""
-        self.table.setRowCount(0)
+        self.model.set_rows([])
         self.current_data = None
+        self.current_data_path = None
 
     def export_data(self):
         """导出数据"""
@@ -163,71 +479,110 @@ class DataViewerWidget(QWidget):
         if not file_path:
             return
             
-        try:
-            if file_path.endswith('.json'):
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_data, f, ensure_ascii=False, indent=2)
-            elif file_path.endswith('.csv'):
-                self.export_to_csv(file_path)
+        if not file_path.endswith('.csv'):
+            source_path = self.current_data_path
+            if source_path and source_path.endswith('.json') and os.path.exists(source_path):
+                # 源文件本身就是 JSON，直接复制，不重新序列化
+                self._run_io(
+                    lambda _: QMessageBox.information(self, "成功", "数据导出成功"),
+                    lambda error: QMessageBox.critical(self, "错误", f"导出数据失败: {error}"),
+                    shutil.copyfile, source_path, file_path
+                )
             else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_data, f, ensure_ascii=False, indent=2)
-                    
-            QMessageBox.information(self, "成功", "数据导出成功")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"导出数据失败: {str(e)}")
+                self.export_to_json(file_path)
+            return
+        
+        self._run_io(
+            lambda _: QMessageBox.information(self, "成功", "数据导出成功"),
+            lambda error: QMessageBox.critical(self, "错误", f"导出数据失败: {error}"),
+            self.export_to_csv, file_path, self.model.iter_export_rows()
+        )
+
+    def export_to_json(self, file_path: str):
+        """在后台线程中流式导出数据到JSON文件"""
+        if self.export_thread is not None and self.export_thread.isRunning():
+            QMessageBox.warning(self, "警告", "正在导出数据，请稍候")
+            return
+        
+        self.export_thread = JsonExportThread(self.current_data, file_path)
+        self.export_thread.exported.connect(
+            lambda path: QMessageBox.information(self, "成功", "数据导出成功")
+        )
+        self.export_thread.error.connect(
+            lambda error: QMessageBox.critical(self, "错误", f"导出数据失败: {error}")
+        )
+        self.export_thread.start()
 
-    def export_to_csv(self, file_path: str):
-        """导出数据到CSV文件"""
-        import csv
+    def export_to_csv(self, file_path: str, rows=None):
+        """
+        导出数据到CSV文件，直接从表格模型中的记录生成，不逐个读取表格单元格
         
-        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        :param file_path: 导出路径
+        :param rows: 可选的行文本迭代器，默认使用当前显示的全部记录
+        """
+        if rows is None:
+            rows = self.model.iter_export_rows()
+        
+        with open(file_path, 'w', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             # 写入表头
             writer.writerow(["步骤ID", "类型", "数据"])
             
             # 写入数据
-            for row in range(self.table.rowCount()):
-                row_data = []
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    row_data.append(item.text() if item else '')
-                writer.writerow(row_data)
+            writer.writerows(rows)
 
     def delete_data(self):
-        """删除数据文件"""
-        filepath = self.file_selector.currentData()
-        if not filepath:
+        """删除选中的数据文件，多个文件只确认一次并在后台一次删除"""
+        filepaths = [item.data(Qt.UserRole) for item in self.file_selector.selectedItems()]
+        if not filepaths:
             return
             
         reply = QMessageBox.question(
             self,
             "确认删除",
-            "确定要删除选中的数据文件吗？",
+            f"确定要删除选中的 {len(filepaths)} 个数据文件吗？",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         
         if reply == QMessageBox.Yes:
-            try:
-                if self.data_storage.delete_workflow_data(filepath):
-                    QMessageBox.information(self, "成功", "数据文件删除成功")
-                    self.refresh()
-                else:
-                    QMessageBox.warning(self, "警告", "数据文件删除失败")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"删除数据文件失败: {str(e)}")
-
-    def refresh(self):
-        """刷新视图"""
+            self._run_io(
+                lambda deleted: self._on_data_deleted(deleted, len(filepaths)),
+                lambda error: QMessageBox.critical(self, "错误", f"删除数据文件失败: {error}"),
+                self.data_storage.delete_data_batch, filepaths
+            )
+
+    def _on_data_deleted(self, deleted: int, requested: int):
+        """
+        数据文件删除完成处理
+        
+        :param deleted: 实际删除的文件数
+        :param requested: 请求删除的文件数
+        """
+        self.invalidate_cache()
+        if deleted == requested:
+            QMessageBox.information(self, "成功", f"已删除 {deleted} 个数据文件")
+        else:
+            QMessageBox.warning(self, "警告", f"已删除 {deleted} 个数据文件，{requested - deleted} 个文件删除失败")
+        self.refresh()
+
+    def refresh(self, force: bool = False):
+        """
+        刷新视图
+        
+        :param force: 是否忽略缓存重新加载工作流和数据文件列表
+        """
+        if force:
+            self.invalidate_cache()
         current_workflow_id = self.workflow_selector.currentData()
         self.load_workflows()
         
-        # 恢复之前选择的工作流
+        # 恢复之前选择的工作流，不触发选择变更信号，数据文件列表只在最后加载一次
         if current_workflow_id is not None:
             index = self.workflow_selector.findData(current_workflow_id)
-            if index >= 0:
+            if index >= 0 and index != self.workflow_selector.currentIndex():
+                self.workflow_selector.blockSignals(True)
                 self.workflow_selector.setCurrentIndex(index)
+                self.workflow_selector.blockSignals(False)
             
-        self.load_data_files(current_workflow_id) 
\ No newline at end of file
+        self.load_data_files(self.workflow_selector.currentData()) 
\ No newline at end of file
@@ -4,12 +4,26 @@ from PyQt5.QtWidgets import (
     QStatusBar
 )
 from PyQt5.QtCore import Qt
+from functools import partial
+from typing import Optional
+import asyncio
+from database.crud_manager import CRUDManager
+from core.components.storage.data_storage_manager import DataStorageManager
 from .workflow_editor import WorkflowEditorWidget
 from .workflow_executor import WorkflowExecutorWidget
 from .data_viewer import DataViewerWidget
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # 首次切换到时才创建组件的标签页下标
+    EXECUTOR_TAB = 1
+    DATA_VIEWER_TAB = 2
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        初始化主窗口
+        
+        :param loop: 启动程序提供的、在 Qt 线程上运行的事件循环，交给工作流编辑器执行异步操作
+        """
         super().__init__()
         self.setWindowTitle("Web自动化工具")
         self.setMinimumSize(1200, 800)
@@ -25,17 +39,23 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         self.main_layout.addWidget(self.tab_widget)
         
+        # 各标签页共用同一个 CRUD 管理器和数据存储管理器，避免重复建立数据库连接
+        self.crud_manager = CRUDManager()
+        self.data_storage = DataStorageManager()
+        
         # 创建工作流编辑器标签页
-        self.workflow_editor = WorkflowEditorWidget()
+        self.workflow_editor = WorkflowEditorWidget(crud_manager=self.crud_manager, loop=loop)
         self.tab_widget.addTab(self.workflow_editor, "工作流编辑器")
         
-        # 创建工作流执行器标签页
-        self.workflow_executor = WorkflowExecutorWidget()
-        self.tab_widget.addTab(self.workflow_executor, "工作流执行")
-        
-        # 创建数据查看器标签页
-        self.data_viewer = DataViewerWidget()
-        self.tab_widget.addTab(self.data_viewer, "数据查看")
+        # 工作流执行器和数据查看器在首次切换到对应标签页时创建，启动时先放置占位部件
+        self._tab_factories = {
+            self.EXECUTOR_TAB: partial(WorkflowExecutorWidget, self.crud_manager),
+            self.DATA_VIEWER_TAB: partial(DataViewerWidget, self.crud_manager, self.data_storage)
+        }
+        self._tab_widgets = {}
+        self.tab_widget.addTab(QWidget(), "工作流执行")
+        self.tab_widget.addTab(QWidget(), "数据查看")
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
         
         # 创建菜单栏
         self.create_menu_bar()
@@ -45,6 +65,44 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("就绪")
 
+    def _ensure_tab(self, index: int) -> QWidget:
+        """
+        获取标签页组件，延迟创建的组件在首次访问时创建并替换占位部件
+        
+        :param index: 标签页下标
+        :return: 标签页组件
+        """
+        factory = self._tab_factories.pop(index, None)
+        if factory is None:
+            return self._tab_widgets.get(index) or self.tab_widget.widget(index)
+        
+        widget = factory()
+        self._tab_widgets[index] = widget
+        
+        # 替换占位部件时不触发切换信号，并保持当前选中的标签页
+        current_index = self.tab_widget.currentIndex()
+        title = self.tab_widget.tabText(index)
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, widget, title)
+            self.tab_widget.setCurrentIndex(current_index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        return widget
+
+    @property
+    def workflow_executor(self) -> WorkflowExecutorWidget:
+        """工作流执行器组件，首次访问时创建"""
+        return self._ensure_tab(self.EXECUTOR_TAB)
+
+    @property
+    def data_viewer(self) -> DataViewerWidget:
+        """数据查看器组件，首次访问时创建"""
+        return self._ensure_tab(self.DATA_VIEWER_TAB)
+
     def create_menu_bar(self):
         """创建菜单栏"""
         menubar = self.menuBar()
@@ -79,19 +137,19 @@ class MainWindow(QMainWindow):
         
         run_workflow_action = QAction("运行工作流", self)
         run_workflow_action.setShortcut("F5")
-        run_workflow_action.triggered.connect(self.workflow_executor.run_workflow)
+        run_workflow_action.triggered.connect(lambda: self.workflow_executor.run_workflow())
         execution_menu.addAction(run_workflow_action)
         
         stop_workflow_action = QAction("停止工作流", self)
         stop_workflow_action.setShortcut("F6")
-        stop_workflow_action.triggered.connect(self.workflow_executor.stop_workflow)
+        stop_workflow_action.triggered.connect(lambda: self.workflow_executor.stop_workflow())
         execution_menu.addAction(stop_workflow_action)
         
         # 视图菜单
         view_menu = menubar.addMenu("视图")
         
         refresh_action = QAction("刷新", self)
-        refresh_action.setShortcut("F5")
+        refresh_action.setShortcut("Ctrl+R")
         refresh_action.triggered.connect(self.refresh_current_view)
         view_menu.addAction(refresh_action)
         
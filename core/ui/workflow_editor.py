@@ -1,18 +1,20 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QAbstractItemView,
     QPushButton, QLabel, QLineEdit, QComboBox, QFormLayout,
     QGroupBox, QMessageBox, QInputDialog, QScrollArea, QSplitter,
     QFrame, QTextEdit, QDialog, QDialogButtonBox,
     QProgressDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QAbstractListModel, QModelIndex
 from PyQt5.QtGui import QIcon, QDragEnterEvent, QDropEvent, QCloseEvent
 from database.crud_manager import CRUDManager
-from core.components.workflow.workflow_engine import WorkflowEngine
 from PyQt5.QtWidgets import QApplication
 import asyncio
 import logging
-from typing import Optional, List, Dict, Any, TypeVar
+from typing import Optional, List, Dict, Any, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.components.workflow.workflow_engine import WorkflowEngine
 from functools import partial
 
 Event = TypeVar('Event')
@@ -88,150 +90,168 @@ class StepConfigDialog(QDialog):
             'description': self.description.toPlainText()
         }
 
-class DraggableListWidget(QListWidget):
-    """可拖拽的列表组件"""
+class WorkflowStepModel(QAbstractListModel):
+    """工作流步骤列表模型，步骤以字典列表保存，列表视图只为可见的行生成显示文本"""
+    
+    # 步骤预览文本的数据角色
+    PreviewRole = Qt.UserRole + 1
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setDragDropMode(QListWidget.InternalMove)
-        self.setAcceptDrops(True)
-        self.setDefaultDropAction(Qt.MoveAction)
-        
-    def dropEvent(self, event: QDropEvent):
-        super().dropEvent(event)
-        # 通知父组件重新排序
-        if isinstance(self.parent(), WorkflowEditorWidget):
-            self.parent().reorder_steps()
-
-class CreateWorkflowThread(QThread):
-    """
-    工作线程，用于在后台创建工作流，避免阻塞 UI 线程。
-    """
-    workflow_created_signal = pyqtSignal(dict)  # 工作流创建成功信号
-    workflow_creation_failed_signal = pyqtSignal(str)  # 工作流创建失败信号
-
-    def __init__(self, crud_manager: CRUDManager, workflow_name: str, 
-                workflow_description: str, website_id: int, user_id: int) -> None:
+        self.steps: List[Dict[str, Any]] = []
+        # 按步骤 ID 缓存的预览文本，首次选中时生成，步骤被替换时失效
+        self._previews: Dict[Any, str] = {}
+    
+    @staticmethod
+    def step_label(step: Dict[str, Any]) -> str:
+        """步骤在列表中的显示文本"""
+        return f"步骤 {step['step_order']}: {step['action_type']}"
+    
+    @staticmethod
+    def _format_preview(step: Dict[str, Any]) -> str:
+        """步骤的预览文本"""
+        return f"""步骤信息：
+动作类型: {step['action_type']}
+选择器类型: {step.get('selector_type', 'N/A')}
+选择器值: {step.get('selector_value', 'N/A')}
+动作值: {step.get('value', 'N/A')}
+描述: {step.get('description', 'N/A')}
+"""
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.steps)
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        step = self.steps[index.row()]
+        if role == Qt.DisplayRole:
+            return self.step_label(step)
+        if role == Qt.UserRole:
+            return step
+        if role == self.PreviewRole:
+            preview = self._previews.get(step['id'])
+            if preview is None:
+                preview = self._previews[step['id']] = self._format_preview(step)
+            return preview
+        return None
+    
+    def flags(self, index: QModelIndex):
+        # 只允许拖放到步骤之间，不允许拖放到某个步骤上
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled
+    
+    def supportedDropActions(self):
+        return Qt.MoveAction
+    
+    def set_steps(self, steps: List[Dict[str, Any]]) -> None:
         """
-        初始化工作流创建线程
+        替换全部步骤
         
         Args:
-            crud_manager: CRUD管理器实例
-            workflow_name: 工作流名称
-            workflow_description: 工作流描述
-            website_id: 网站ID
-            user_id: 用户ID
+            steps: 步骤列表
         """
-        super().__init__()
-        logging.info(f"初始化工作流创建线程: name={workflow_name}, website_id={website_id}, user_id={user_id}")
-        self.crud_manager = crud_manager
-        self.workflow_name = workflow_name
-        self.workflow_description = workflow_description
-        self.website_id = website_id
-        self.user_id = user_id
-
-    async def _create_workflow(self) -> None:
-        """异步创建工作流"""
-        try:
-            logging.info("开始创建工作流...")
-            if self.isInterruptionRequested():
-                logging.info("线程已被终止")
-                return
-
-            logging.info(f"正在创建工作流: {self.workflow_name}")
-            workflow = await self.crud_manager.create_workflow(
-                name=self.workflow_name,
-                description=self.workflow_description,
-                website_id=self.website_id,
-                user_id=self.user_id
-            )
-            logging.info(f"工作流创建成功: {workflow}")
-            
-            if not self.isInterruptionRequested():
-                self.workflow_created_signal.emit(workflow)
-            else:
-                logging.info("线程已被终止，不发送成功信号")
-                
-        except Exception as e:
-            error_msg = f"创建工作流失败: {str(e)}"
-            logging.error(error_msg)
-            if not self.isInterruptionRequested():
-                self.workflow_creation_failed_signal.emit(error_msg)
-
-    def run(self) -> None:
-        """线程执行体"""
-        asyncio.run(self._create_workflow())
-
-    def terminate(self) -> None:
-        """终止线程"""
-        logging.info("正在终止工作流创建线程...")
-        self.requestInterruption()
-        super().terminate()
-
-class LoadWorkflowThread(QThread):
-    """工作流加载线程"""
-    workflow_loaded = pyqtSignal(dict)  # 工作流加载成功信号
-    workflow_load_failed = pyqtSignal(str)  # 工作流加载失败信号
-    steps_loaded = pyqtSignal(list)  # 步骤加载成功信号
-
-    def __init__(self, crud_manager: CRUDManager, workflow_id: int) -> None:
+        self.beginResetModel()
+        self.steps = list(steps)
+        self._previews.clear()
+        self.endResetModel()
+    
+    def step(self, row: int) -> Dict[str, Any]:
+        """获取指定行的步骤"""
+        return self.steps[row]
+    
+    def append_step(self, step: Dict[str, Any]) -> None:
+        """在末尾添加步骤"""
+        row = len(self.steps)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.steps.append(step)
+        self.endInsertRows()
+    
+    def remove_step(self, row: int) -> None:
+        """删除指定行的步骤"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._previews.pop(self.steps.pop(row)['id'], None)
+        self.endRemoveRows()
+    
+    def update_step(self, row: int, step: Dict[str, Any]) -> None:
+        """替换指定行的步骤"""
+        self._previews.pop(self.steps[row]['id'], None)
+        self._previews.pop(step['id'], None)
+        self.steps[row] = step
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def move_step(self, source: int, destination: int) -> bool:
         """
-        初始化工作流加载线程
+        移动步骤
         
         Args:
-            crud_manager: CRUD管理器实例
-            workflow_id: 工作流ID
+            source: 步骤当前所在行
+            destination: 移动前的插入位置，步骤移动到该行之前
+        
+        Returns:
+            步骤位置是否发生变化
         """
-        super().__init__()
-        self.crud_manager = crud_manager
-        self.workflow_id = workflow_id
-
-    async def _load_workflow(self) -> None:
-        """异步加载工作流"""
-        try:
-            logging.info(f"开始加载工作流 {self.workflow_id}")
-            
-            # 加载工作流
-            workflow = await self.crud_manager.get_workflow(self.workflow_id)
-            if not workflow:
-                raise ValueError(f"工作流 {self.workflow_id} 不存在")
-
-            if self.isInterruptionRequested():
-                logging.info("线程已被终止")
-                return
-
-            # 发送工作流加载成功信号
-            self.workflow_loaded.emit(workflow)
-            
-            # 加载工作流步骤
-            steps = await self.crud_manager.get_workflow_steps(self.workflow_id)
-            if self.isInterruptionRequested():
-                logging.info("线程已被终止")
-                return
-
-            # 发送步骤加载成功信号
-            self.steps_loaded.emit(steps)
-            logging.info(f"工作流 {self.workflow_id} 加载完成")
-
-        except Exception as e:
-            error_msg = f"加载工作流失败: {str(e)}"
-            logging.error(error_msg)
-            if not self.isInterruptionRequested():
-                self.workflow_load_failed.emit(error_msg)
-
-    def run(self) -> None:
-        """线程执行体"""
-        asyncio.run(self._load_workflow())
-
-    def terminate(self) -> None:
-        """终止线程"""
-        logging.info("正在终止工作流加载线程...")
-        self.requestInterruption()
-        super().terminate()
+        if not self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination):
+            return False
+        step = self.steps.pop(source)
+        self.steps.insert(destination - 1 if destination > source else destination, step)
+        self.endMoveRows()
+        return True
+    
+    def renumber(self) -> None:
+        """按当前顺序重新设置步骤序号"""
+        for order, step in enumerate(self.steps, start=1):
+            step['step_order'] = order
+        if self.steps:
+            self.dataChanged.emit(self.index(0), self.index(len(self.steps) - 1))
+
+class DraggableListView(QListView):
+    """可拖拽排序的步骤列表视图"""
+    
+    steps_reordered = pyqtSignal()  # 拖拽改变步骤顺序后发出
+    
+    # 批量布局时每批处理的行数
+    LAYOUT_BATCH_SIZE = 64
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDefaultDropAction(Qt.MoveAction)
+        # 各行高度相同，按批布局，长列表滚动和重绘时不逐行计算尺寸
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(self.LAYOUT_BATCH_SIZE)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        
+    def dropEvent(self, event: QDropEvent):
+        # 直接在模型中移动步骤，不经过 MIME 数据的序列化和删除源行
+        source = self.currentIndex()
+        if event.source() is not self or not source.isValid():
+            event.ignore()
+            return
+        
+        target = self.indexAt(event.pos())
+        if not target.isValid():
+            destination = self.model().rowCount()
+        elif self.dropIndicatorPosition() == QAbstractItemView.BelowItem:
+            destination = target.row() + 1
+        else:
+            destination = target.row()
+        
+        # 拖拽源不再删除行，移动已经由模型完成
+        event.setDropAction(Qt.IgnoreAction)
+        event.accept()
+        if self.model().move_step(source.row(), destination):
+            self.steps_reordered.emit()
 
 class WorkflowEditorWidget(QWidget):
     """工作流编辑器组件"""
     
+    # 拖拽排序停止后等待的毫秒数，连续多次拖拽只写入一次最终顺序
+    REORDER_DELAY_MS = 150
+    
     workflow_updated = pyqtSignal()  # 工作流更新信号
     execution_requested = pyqtSignal(int)  # 工作流执行请求信号
     workflow_created = pyqtSignal(dict)  # 工作流创建成功的信号
@@ -240,21 +260,35 @@ class WorkflowEditorWidget(QWidget):
     workflow_load_failed = pyqtSignal(str)  # 工作流加载失败的信号
     operation_completed = pyqtSignal()  # 操作完成信号
 
-    def __init__(self, parent: Optional[QWidget] = None) -> None:
+    def __init__(self, parent: Optional[QWidget] = None,
+                 crud_manager: Optional[CRUDManager] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
         """
         初始化工作流编辑器组件
         
         Args:
             parent: 父组件
+            crud_manager: 共用的CRUD管理器，未指定时在初始化时创建
+            loop: 启动程序提供的、在 Qt 线程上运行的事件循环，定时器触发的数据库写入在其中执行
         """
         super().__init__(parent)
+        self.loop = loop
+        self._shared_crud_manager = crud_manager
         self.crud_manager: Optional[CRUDManager] = None
-        self.workflow_engine = WorkflowEngine()
+        self._workflow_engine: Optional["WorkflowEngine"] = None
         self.current_workflow: Optional[Dict[str, Any]] = None
         self.current_user_id: Optional[int] = None
         self._is_initialized: bool = False
         self.setup_ui()
 
+    @property
+    def workflow_engine(self) -> "WorkflowEngine":
+        """工作流引擎，依赖 Playwright 等较重的模块，首次访问时才导入并创建"""
+        if self._workflow_engine is None:
+            from core.components.workflow.workflow_engine import WorkflowEngine
+            self._workflow_engine = WorkflowEngine()
+        return self._workflow_engine
+
     async def initialize(self) -> None:
         """
         异步初始化编辑器
@@ -265,7 +299,7 @@ class WorkflowEditorWidget(QWidget):
             return
         
         try:
-            self.crud_manager = CRUDManager()
+            self.crud_manager = self._shared_crud_manager or CRUDManager()
             await self.crud_manager.ensure_connected()
             # 异步加载网站列表
             await self.async_load_websites()
@@ -303,8 +337,14 @@ class WorkflowEditorWidget(QWidget):
         steps_group = QGroupBox("工作流步骤")
         steps_layout = QVBoxLayout()
         
-        self.step_list = DraggableListWidget()
-        self.step_list.currentItemChanged.connect(self.on_step_selected)
+        self.step_model = WorkflowStepModel(self)
+        self.step_list = DraggableListView()
+        self.step_list.setModel(self.step_model)
+        self.step_list.selectionModel().currentChanged.connect(self.on_step_selected)
+        self._reorder_timer = QTimer(self)
+        self._reorder_timer.setSingleShot(True)
+        self._reorder_timer.timeout.connect(self._schedule_reorder)
+        self.step_list.steps_reordered.connect(lambda: self._reorder_timer.start(self.REORDER_DELAY_MS))
         steps_layout.addWidget(self.step_list)
         
         # 步骤操作按钮
@@ -374,9 +414,16 @@ class WorkflowEditorWidget(QWidget):
         Args:
             websites: 网站列表
         """
-        self.website_selector.clear()
-        for website in websites:
-            self.website_selector.addItem(website['name'], website['id'])
+        # 批量填充期间不重绘、不发出信号，填充完成后只刷新一次
+        self.website_selector.setUpdatesEnabled(False)
+        self.website_selector.blockSignals(True)
+        try:
+            self.website_selector.clear()
+            for website in websites:
+                self.website_selector.addItem(website['name'], website['id'])
+        finally:
+            self.website_selector.blockSignals(False)
+            self.website_selector.setUpdatesEnabled(True)
 
     async def save_workflow(self) -> None:
         """异步保存工作流"""
@@ -413,7 +460,7 @@ class WorkflowEditorWidget(QWidget):
                 step_data = dialog.get_step_data()
                 
                 # 获取当前最大步骤序号
-                next_order = self.step_list.count() + 1
+                next_order = self.step_model.rowCount() + 1
                 
                 # 创建新步骤
                 step = await self.crud_manager.add_workflow_step(
@@ -423,9 +470,7 @@ class WorkflowEditorWidget(QWidget):
                 )
                 
                 # 添加到列表
-                item = QListWidgetItem(f"步骤 {next_order}: {step['action_type']}")
-                item.setData(Qt.UserRole, step)
-                self.step_list.addItem(item)
+                self.step_model.append_step(step)
                 self.workflow_updated.emit()
             except Exception as e:
                 error_msg = f"添加步骤失败: {str(e)}"
@@ -434,11 +479,11 @@ class WorkflowEditorWidget(QWidget):
 
     async def remove_step(self) -> None:
         """异步删除工作流步骤"""
-        current_item = self.step_list.currentItem()
-        if not current_item:
+        row = self.step_list.currentIndex().row()
+        if row < 0:
             return
             
-        step = current_item.data(Qt.UserRole)
+        step = self.step_model.step(row)
         reply = QMessageBox.question(
             self,
             "确认删除",
@@ -450,7 +495,7 @@ class WorkflowEditorWidget(QWidget):
         if reply == QMessageBox.Yes:
             try:
                 await self.crud_manager.delete_workflow_step(step['id'])
-                self.step_list.takeItem(self.step_list.row(current_item))
+                self.step_model.remove_step(row)
                 await self.reorder_steps()
                 self.workflow_updated.emit()
             except Exception as e:
@@ -458,19 +503,23 @@ class WorkflowEditorWidget(QWidget):
                 logging.error(error_msg)
                 QMessageBox.critical(self, "错误", error_msg)
 
+    def _schedule_reorder(self) -> None:
+        """在启动程序提供的事件循环上执行延迟的步骤排序写入，没有运行中的事件循环时报错"""
+        if self.loop is None or not self.loop.is_running():
+            error_msg = "重新排序步骤失败: 编辑器没有运行中的事件循环，步骤顺序未保存"
+            logging.error(error_msg)
+            QMessageBox.critical(self, "错误", error_msg)
+            return
+        self.loop.create_task(self.reorder_steps())
+
     async def reorder_steps(self) -> None:
-        """异步重新排序步骤"""
+        """异步重新排序步骤，所有步骤的新顺序在一次数据库请求中更新"""
+        # 本次写入已经包含当前顺序，取消尚未触发的延迟排序
+        self._reorder_timer.stop()
         try:
-            for i in range(self.step_list.count()):
-                item = self.step_list.item(i)
-                step = item.data(Qt.UserRole)
-                step['step_order'] = i + 1
-                updated_step = await self.crud_manager.update_workflow_step(
-                    step['id'],
-                    step_order=step['step_order']
-                )
-                item.setText(f"步骤 {updated_step['step_order']}: {updated_step['action_type']}")
-                item.setData(Qt.UserRole, updated_step)
+            pairs = [(step['id'], i + 1) for i, step in enumerate(self.step_model.steps)]
+            await self.crud_manager.bulk_update_step_orders(pairs)
+            self.step_model.renumber()
         except Exception as e:
             error_msg = f"重新排序步骤失败: {str(e)}"
             logging.error(error_msg)
@@ -478,11 +527,11 @@ class WorkflowEditorWidget(QWidget):
 
     async def edit_step(self) -> None:
         """异步编辑步骤"""
-        current_item = self.step_list.currentItem()
-        if not current_item:
+        row = self.step_list.currentIndex().row()
+        if row < 0:
             return
             
-        step = current_item.data(Qt.UserRole)
+        step = self.step_model.step(row)
         dialog = StepConfigDialog(self, step)
         if dialog.exec_() == QDialog.Accepted:
             try:
@@ -491,15 +540,15 @@ class WorkflowEditorWidget(QWidget):
                     step['id'],
                     **step_data
                 )
-                current_item.setData(Qt.UserRole, updated_step)
-                current_item.setText(f"步骤 {updated_step['step_order']}: {updated_step['action_type']}")
+                self.step_model.update_step(row, updated_step)
+                self.on_step_selected(self.step_list.currentIndex(), QModelIndex())
                 self.workflow_updated.emit()
             except Exception as e:
                 error_msg = f"编辑步骤失败: {str(e)}"
                 logging.error(error_msg)
                 QMessageBox.critical(self, "错误", error_msg)
 
-    def on_step_selected(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
+    def on_step_selected(self, current: QModelIndex, previous: QModelIndex) -> None:
         """
         步骤选择变更处理
         
@@ -507,19 +556,11 @@ class WorkflowEditorWidget(QWidget):
             current: 当前选中的项
             previous: 之前选中的项
         """
-        if not current:
+        if not current.isValid():
             self.step_preview.clear()
             return
             
-        step = current.data(Qt.UserRole)
-        preview_text = f"""步骤信息：
-动作类型: {step['action_type']}
-选择器类型: {step.get('selector_type', 'N/A')}
-选择器值: {step.get('selector_value', 'N/A')}
-动作值: {step.get('value', 'N/A')}
-描述: {step.get('description', 'N/A')}
-"""
-        self.step_preview.setText(preview_text)
+        self.step_preview.setText(current.data(WorkflowStepModel.PreviewRole))
 
     def execute_workflow(self) -> None:
         """执行工作流"""
@@ -553,16 +594,14 @@ class WorkflowEditorWidget(QWidget):
                 workflow_id = int(item.split("ID: ")[1].rstrip(")"))
                 
                 try:
-                    workflow = await self.crud_manager.get_workflow(workflow_id)
-                    if not workflow:
+                    # 工作流和步骤在一次查询中加载
+                    result = await self.crud_manager.get_workflow_with_steps(workflow_id)
+                    if not result:
                         raise ValueError(f"工作流 {workflow_id} 不存在")
                     
                     # 更新 UI
-                    self._handle_workflow_loaded(workflow)
-                    
-                    # 加载步骤
-                    steps = await self.crud_manager.get_workflow_steps(workflow_id)
-                    self._handle_steps_loaded(steps)
+                    self._handle_workflow_loaded(result['workflow'])
+                    self._handle_steps_loaded(result['steps'])
                     
                     self.operation_completed.emit()
                     
@@ -617,11 +656,7 @@ class WorkflowEditorWidget(QWidget):
             steps: 步骤列表
         """
         logging.info(f"加载了 {len(steps)} 个步骤")
-        self.step_list.clear()
-        for step in steps:
-            item = QListWidgetItem(f"步骤 {step['step_order']}: {step['action_type']}")
-            item.setData(Qt.UserRole, step)
-            self.step_list.addItem(item)
+        self.step_model.set_steps(steps)
 
     async def cleanup(self) -> None:
         """清理资源"""
@@ -3,10 +3,9 @@ from PyQt5.QtWidgets import (
     QTextEdit, QComboBox, QLabel, QProgressBar,
     QGroupBox, QMessageBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+import asyncio
 from database.crud_manager import CRUDManager
-from core.components.workflow.workflow_engine import WorkflowEngine
-from core.components.browser.browser_manager import BrowserManager
 
 class WorkflowExecutorThread(QThread):
     """工作流执行线程"""
@@ -15,20 +14,32 @@ class WorkflowExecutorThread(QThread):
     log = pyqtSignal(str)  # 日志信号
     finished = pyqtSignal(dict)  # 完成信号
     error = pyqtSignal(str)  # 错误信号
+    
+    # 停止时等待执行任务清理完成的最长毫秒数
+    STOP_TIMEOUT_MS = 5000
 
-    def __init__(self, workflow_id: int, browser_manager: BrowserManager):
+    def __init__(self, workflow_id: int):
+        # 工作流引擎依赖 Playwright 等较重的模块，首次执行工作流时才导入
+        from core.components.workflow.workflow_engine import WorkflowEngine
+        
         super().__init__()
         self.workflow_id = workflow_id
-        self.workflow_engine = WorkflowEngine(browser_manager)
+        self.workflow_engine = WorkflowEngine()
         self.is_running = False
+        # 线程内的事件循环和执行任务，停止时通过事件循环取消任务
+        self._loop = None
+        self._task = None
 
     def run(self):
         """执行工作流"""
         self.is_running = True
+        self._loop = asyncio.new_event_loop()
         try:
             # 加载工作流
             self.log.emit("正在加载工作流...")
-            workflow = self.workflow_engine.load_workflow(self.workflow_id)
+            workflow = self._loop.run_until_complete(self.workflow_engine.load_workflow(self.workflow_id))
+            if not workflow:
+                raise ValueError(f"工作流不存在: {self.workflow_id}")
             
             # 获取步骤总数
             total_steps = len(workflow['steps'])
@@ -36,29 +47,58 @@ class WorkflowExecutorThread(QThread):
             
             # 执行工作流
             self.log.emit("开始执行工作流...")
-            result = self.workflow_engine.execute_workflow(self.workflow_id)
+            self._task = self._loop.create_task(self.workflow_engine.execute_workflow(self.workflow_id, workflow=workflow))
+            result = self._loop.run_until_complete(self._task)
             
             # 发送结果
             self.finished.emit(result)
             
+        except asyncio.CancelledError:
+            self.log.emit("工作流执行已取消")
         except Exception as e:
             self.error.emit(str(e))
         finally:
+            self._task = None
+            # 浏览器池的 Playwright 驱动绑定在本线程的事件循环上，关闭循环前先关闭浏览器池
+            try:
+                self._loop.run_until_complete(self.workflow_engine.browser_pool.close())
+            except Exception as e:
+                self.log.emit(f"关闭浏览器池失败: {e}")
+            self._loop.close()
             self.is_running = False
 
     def stop(self):
-        """停止执行"""
+        """停止执行，取消执行任务并等待其释放浏览器等资源，不强制终止线程"""
         self.is_running = False
-        self.terminate()
+        loop, task = self._loop, self._task
+        if loop is None or task is None:
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # 事件循环已经关闭，任务已经结束
+            return
+        self.wait(self.STOP_TIMEOUT_MS)
 
 class WorkflowExecutorWidget(QWidget):
     """工作流执行器组件"""
+    
+    # 日志先缓冲，每隔该毫秒数合并写入一次日志框
+    LOG_FLUSH_INTERVAL_MS = 50
 
-    def __init__(self):
+    def __init__(self, crud_manager: CRUDManager = None):
+        """
+        初始化工作流执行器组件
+        
+        :param crud_manager: 共用的 CRUD 管理器，未指定时创建新的实例
+        """
         super().__init__()
-        self.crud_manager = CRUDManager()
-        self.browser_manager = BrowserManager()
+        self.crud_manager = crud_manager or CRUDManager()
         self.executor_thread = None
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_log)
         self.setup_ui()
 
     def setup_ui(self):
@@ -129,10 +169,7 @@ class WorkflowExecutorWidget(QWidget):
             return
         
         # 创建并启动执行线程
-        self.executor_thread = WorkflowExecutorThread(
-            workflow_id,
-            self.browser_manager
-        )
+        self.executor_thread = WorkflowExecutorThread(workflow_id)
         
         # 连接信号
         self.executor_thread.progress.connect(self.update_progress)
@@ -145,6 +182,7 @@ class WorkflowExecutorWidget(QWidget):
         self.stop_button.setEnabled(True)
         self.workflow_selector.setEnabled(False)
         self.progress_bar.setValue(0)
+        self._log_buffer.clear()
         self.log_text.clear()
         
         # 启动线程
@@ -171,8 +209,18 @@ class WorkflowExecutorWidget(QWidget):
         self.progress_bar.setValue(value)
 
     def append_log(self, message: str):
-        """添加日志"""
-        self.log_text.append(message)
+        """添加日志，日志先缓冲，定时合并写入日志框"""
+        self._log_buffer.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start(self.LOG_FLUSH_INTERVAL_MS)
+
+    def _flush_log(self):
+        """将缓冲的日志一次写入日志框并滚动到底部"""
+        self._log_timer.stop()
+        if not self._log_buffer:
+            return
+        self.log_text.append('\n'.join(self._log_buffer))
+        self._log_buffer.clear()
         # 滚动到底部
         self.log_text.verticalScrollBar().setValue(
             self.log_text.verticalScrollBar().maximum()
@@ -186,6 +234,7 @@ class WorkflowExecutorWidget(QWidget):
             # 显示提取的数据数量
             data_count = len(result.get('extracted_data', []))
             self.append_log(f"共提取 {data_count} 条数据")
+            self._flush_log()
             
             QMessageBox.information(
                 self,
@@ -200,6 +249,7 @@ class WorkflowExecutorWidget(QWidget):
     def on_execution_error(self, error_message: str):
         """执行错误处理"""
         self.append_log(f"错误: {error_message}")
+        self._flush_log()
         QMessageBox.critical(self, "执行错误", error_message)
         self.reset_ui_state()
 
@@ -1,15 +1,70 @@
 from .db_manager import DatabaseManager
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 import time
 import logging
 
 class CRUDManager:
+    # 工作流及其步骤查询结果的缓存有效期（秒）和最大条目数，修改工作流或步骤时立即失效
+    CACHE_TTL = 30.0
+    CACHE_MAX_SIZE = 64
+    # 网站列表很少变化，缓存时间更长，增删改网站时立即失效
+    WEBSITES_CACHE_TTL = 60.0
+
     def __init__(self):
         """
         初始化 CRUD 管理器
         """
         self.db = DatabaseManager()
         self._connected = False
+        # 工作流 ID 到 (缓存时间, 查询结果) 的缓存
+        self._workflow_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._steps_cache: "OrderedDict[int, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # 网站列表缓存，值为 (缓存时间, 网站列表)
+        self._websites_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
+    def _cache_get(self, cache: OrderedDict, workflow_id: int) -> Optional[Any]:
+        """
+        获取未过期的缓存结果
+        
+        :param cache: 缓存字典
+        :param workflow_id: 工作流 ID
+        :return: 缓存的查询结果，未命中或已过期返回 None
+        """
+        entry = cache.get(workflow_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.CACHE_TTL:
+            del cache[workflow_id]
+            return None
+        cache.move_to_end(workflow_id)
+        return entry[1]
+
+    def _cache_put(self, cache: OrderedDict, workflow_id: int, value: Any):
+        """
+        缓存查询结果，超出容量时淘汰最久未使用的条目
+        
+        :param cache: 缓存字典
+        :param workflow_id: 工作流 ID
+        :param value: 查询结果
+        """
+        cache[workflow_id] = (time.monotonic(), value)
+        cache.move_to_end(workflow_id)
+        if len(cache) > self.CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
+    def invalidate_workflow_cache(self, workflow_id: Optional[int] = None):
+        """
+        使工作流及其步骤的缓存失效
+        
+        :param workflow_id: 工作流 ID，未指定时清空全部缓存
+        """
+        if workflow_id is None:
+            self._workflow_cache.clear()
+            self._steps_cache.clear()
+        else:
+            self._workflow_cache.pop(workflow_id, None)
+            self._steps_cache.pop(workflow_id, None)
 
     async def ensure_connected(self):
         """确保数据库已连接"""
@@ -32,7 +87,9 @@ class CRUDManager:
         VALUES ($1, $2)
         RETURNING *
         """
-        return await self.db.fetch_one(query, (name, url))
+        website = await self.db.fetch_one(query, (name, url))
+        self._websites_cache = None
+        return website
 
     async def get_website(self, website_id: int) -> Dict[str, Any]:
         """
@@ -51,9 +108,13 @@ class CRUDManager:
         
         :return: 网站信息列表
         """
-        await self.ensure_connected()
-        query = "SELECT * FROM websites"
-        return await self.db.fetch_all(query)
+        cached = self._websites_cache
+        if cached is None or time.monotonic() - cached[0] >= self.WEBSITES_CACHE_TTL:
+            await self.ensure_connected()
+            query = "SELECT * FROM websites"
+            cached = self._websites_cache = (time.monotonic(), await self.db.fetch_all(query))
+        # 返回副本，调用方修改结果不影响缓存
+        return [dict(website) for website in cached[1]]
 
     async def update_website(self, website_id: int, name: Optional[str] = None, 
                        url: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
@@ -94,7 +155,9 @@ class CRUDManager:
         WHERE id = ${param_count}
         RETURNING *
         """
-        return await self.db.fetch_one(query, tuple(params))
+        website = await self.db.fetch_one(query, tuple(params))
+        self._websites_cache = None
+        return website
 
     async def delete_website(self, website_id: int) -> bool:
         """
@@ -106,6 +169,7 @@ class CRUDManager:
         await self.ensure_connected()
         query = "DELETE FROM websites WHERE id = $1"
         await self.db.execute_query(query, (website_id,))
+        self._websites_cache = None
         return True
 
     # 选择器相关操作
@@ -195,9 +259,16 @@ class CRUDManager:
         :param workflow_id: 工作流 ID
         :return: 工作流信息
         """
-        await self.ensure_connected()
-        query = "SELECT * FROM workflows WHERE id = $1"
-        return await self.db.fetch_one(query, (workflow_id,))
+        workflow = self._cache_get(self._workflow_cache, workflow_id)
+        if workflow is None:
+            await self.ensure_connected()
+            query = "SELECT * FROM workflows WHERE id = $1"
+            workflow = await self.db.fetch_one(query, (workflow_id,))
+            if workflow is None:
+                return None
+            self._cache_put(self._workflow_cache, workflow_id, workflow)
+        # 返回副本，调用方修改结果不影响缓存
+        return dict(workflow)
 
     async def get_all_workflows(self) -> List[Dict[str, Any]]:
         """
@@ -236,6 +307,7 @@ class CRUDManager:
         :return: 创建的工作流步骤信息
         """
         await self.ensure_connected()
+        self._steps_cache.pop(workflow_id, None)
         query = """
         INSERT INTO workflow_steps 
         (workflow_id, step_order, action_type, selector_type, selector_value, value, description)
@@ -254,13 +326,68 @@ class CRUDManager:
         :param workflow_id: 工作流 ID
         :return: 工作流步骤列表
         """
+        steps = self._cache_get(self._steps_cache, workflow_id)
+        if steps is None:
+            await self.ensure_connected()
+            query = """
+            SELECT * FROM workflow_steps
+            WHERE workflow_id = $1
+            ORDER BY step_order
+            """
+            steps = await self.db.fetch_all(query, (workflow_id,))
+            self._cache_put(self._steps_cache, workflow_id, steps)
+        return [dict(step) for step in steps]
+
+    async def get_workflow_with_steps(self, workflow_id: int) -> Optional[Dict[str, Any]]:
+        """
+        在一次查询中获取工作流及其所有步骤
+        
+        :param workflow_id: 工作流 ID
+        :return: {'workflow': 工作流信息, 'steps': 工作流步骤列表}，工作流不存在时返回 None
+        """
+        workflow = self._cache_get(self._workflow_cache, workflow_id)
+        steps = self._cache_get(self._steps_cache, workflow_id)
+        if workflow is None or steps is None:
+            await self.ensure_connected()
+            # 以行类型返回整行，各列保持原有类型；没有步骤时 LEFT JOIN 得到一行空的步骤
+            query = """
+            SELECT w AS workflow, s AS step
+            FROM workflows AS w
+            LEFT JOIN workflow_steps AS s ON s.workflow_id = w.id
+            WHERE w.id = $1
+            ORDER BY s.step_order
+            """
+            rows = await self.db.fetch_all(query, (workflow_id,))
+            if not rows:
+                return None
+            workflow = dict(rows[0]['workflow'])
+            steps = [dict(row['step']) for row in rows if row['step'] is not None]
+            self._cache_put(self._workflow_cache, workflow_id, workflow)
+            self._cache_put(self._steps_cache, workflow_id, steps)
+        return {'workflow': dict(workflow), 'steps': [dict(step) for step in steps]}
+
+    async def bulk_update_step_orders(self, pairs: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        批量更新步骤顺序，所有步骤在一条 UPDATE 语句中更新
+        
+        :param pairs: (步骤 ID, 新的步骤顺序) 列表
+        :return: 更新后的工作流步骤列表
+        """
+        if not pairs:
+            return []
         await self.ensure_connected()
+        step_ids, step_orders = zip(*pairs)
         query = """
-        SELECT * FROM workflow_steps
-        WHERE workflow_id = $1
-        ORDER BY step_order
+        UPDATE workflow_steps AS s
+        SET step_order = v.step_order
+        FROM unnest($1::int[], $2::int[]) AS v(id, step_order)
+        WHERE s.id = v.id
+        RETURNING s.*
         """
-        return await self.db.fetch_all(query, (workflow_id,))
+        steps = await self.db.fetch_all(query, (list(step_ids), list(step_orders)))
+        for workflow_id in {step['workflow_id'] for step in steps}:
+            self._steps_cache.pop(workflow_id, None)
+        return steps
 
     # 用户相关操作
     async def create_user(self, username: str, email: str, password_hash: str) -> Dict[str, Any]:
@@ -350,6 +477,7 @@ class CRUDManager:
                 WHERE id = $1
                 """
                 await self.db.execute(query, (workflow_id,))
+                self.invalidate_workflow_cache(workflow_id)
                 return True
         except Exception as e:
             logging.error(f"删除工作流失败: {e}")
@@ -375,6 +503,7 @@ class CRUDManager:
                 WHERE user_id = $1
                 """
                 await self.db.execute(query, (user_id,))
+            self.invalidate_workflow_cache()
         except Exception as e:
             logging.error(f"删除用户工作流失败: {e}")
             raise
@@ -92,6 +92,59 @@ async def test_transform_data(handler):
     result = await handler.execute(action_data)
     assert result == "123.46"
 
+def test_format_invalid_input(handler):
+    """测试格式化无法解析的数据时返回原数据"""
+    assert handler._format_data("abc", {"format_type": "number"}) == "abc"
+    assert handler._format_data(None, {"format_type": "number"}) is None
+    assert handler._format_data("2024-13-01", {"format_type": "date"}) == "2024-13-01"
+    assert handler._format_data(20240101, {"format_type": "date"}) == 20240101
+    assert handler._format_data(
+        "2024-01-02", {"format_type": "date", "output_format": "%d/%m/%Y"}
+    ) == "02/01/2024"
+    
+    # 无效的提取模式不再被静默忽略
+    with pytest.raises(ValueError):
+        handler._extract_pattern("text", {"pattern": "("})
+
+@pytest.mark.asyncio
+async def test_regex_replace(handler):
+    """测试正则替换"""
+    action_data = {
+        "data": "a1b22c333",
+        "rules": [{
+            "type": "transform",
+            "transform_type": "replace",
+            "old_value": r"\d+",
+            "new_value": "#",
+            "regex": True
+        }]
+    }
+    
+    result = await handler.execute(action_data)
+    assert result == "a#b#c#"
+    
+    # 无效的正则表达式与提取时一样抛出 ValueError
+    action_data["rules"][0]["old_value"] = "("
+    with pytest.raises(ValueError):
+        await handler.execute(action_data)
+    
+    # 无效的替换模板同样抛出 ValueError
+    action_data["rules"][0]["old_value"] = r"\d+"
+    action_data["rules"][0]["new_value"] = r"\9"
+    with pytest.raises(ValueError):
+        await handler.execute(action_data)
+
+@pytest.mark.asyncio
+async def test_invalid_pattern_same_error(handler):
+    """测试同一个无效的正则表达式在替换和提取时抛出相同的错误"""
+    errors = []
+    for rule in ({"type": "transform", "transform_type": "replace", "old_value": "[a-", "regex": True},
+                 {"type": "transform", "transform_type": "extract", "pattern": "[a-"}):
+        with pytest.raises(ValueError) as exc_info:
+            await handler.execute({"data": "abc", "rules": [rule]})
+        errors.append(str(exc_info.value))
+    assert errors[0] == errors[1]
+
 @pytest.mark.asyncio
 async def test_aggregate_data(handler):
     """测试数据聚合功能"""
@@ -139,6 +192,19 @@ async def test_aggregate_data(handler):
     
     result = await handler.execute(action_data)
     assert result == 150
+    
+    # 测试浮点数求和精度
+    action_data = {
+        "data": [{"price": 0.1}] * 10,
+        "rules": [{
+            "type": "aggregate",
+            "aggregate_type": "sum",
+            "field": "price"
+        }]
+    }
+    
+    result = await handler.execute(action_data)
+    assert result == 1.0
 
 @pytest.mark.asyncio
 async def test_multiple_rules(handler):
@@ -173,6 +239,81 @@ async def test_multiple_rules(handler):
     result = await handler.execute(action_data)
     assert result == 175  # (200 + 150) / 2
 
+@pytest.mark.asyncio
+async def test_vectorized_rules(handler):
+    """测试大数据量时向量化处理与逐条处理结果一致"""
+    pytest.importorskip("pandas")
+    test_data = [{"name": f"item{i}", "price": i % 300} for i in range(3000)]
+    rules = [
+        {
+            "type": "filter",
+            "condition": {"field": "price", "operator": "greater_than", "value": 100}
+        },
+        {
+            "type": "filter",
+            "condition": {"field": "name", "operator": "contains", "value": "9"}
+        }
+    ]
+    
+    result = await handler.execute({"data": test_data, "rules": rules})
+    expected = [item for item in test_data if item["price"] > 100 and "9" in item["name"]]
+    assert result == expected
+    # 返回的是原始记录而非重新构造的字典
+    assert all(a is b for a, b in zip(result, expected))
+    
+    for agg_type in ("count", "sum", "average", "max", "min"):
+        rule = {"type": "aggregate", "aggregate_type": agg_type, "field": "price"}
+        vectorized = await handler.execute({"data": test_data, "rules": [rule]})
+        plain = handler._aggregate_data(test_data, rule)
+        assert vectorized == pytest.approx(plain)
+        assert not hasattr(vectorized, "dtype")
+
+@pytest.mark.asyncio
+async def test_vectorized_matches_plain_with_missing_keys(handler, monkeypatch):
+    """测试含缺失字段时向量化处理与逐条处理的结果和类型一致"""
+    pytest.importorskip("pandas")
+    import core.components.action.handlers.data_processor_handler as module
+    test_data = [
+        {"name": f"item{i}", "price": i % 300} if i % 7 else {"name": f"item{i}"}
+        for i in range(1500)
+    ]
+    
+    async def run_both(rules):
+        vectorized = await handler.execute({"data": test_data, "rules": rules})
+        monkeypatch.setattr(module, "VECTORIZE_THRESHOLD", len(test_data) + 1)
+        try:
+            plain = await handler.execute({"data": test_data, "rules": rules})
+        finally:
+            monkeypatch.undo()
+        return vectorized, plain
+    
+    for operator, value in (("equals", 5), ("not_equals", 5), ("contains", "9"), ("not_contains", "9")):
+        field = "name" if "contains" in operator else "price"
+        rule = {"type": "filter", "condition": {"field": field, "operator": operator, "value": value}}
+        vectorized, plain = await run_both([rule])
+        assert vectorized == plain
+    
+    for agg_type in ("count", "sum", "average", "max", "min"):
+        rule = {"type": "aggregate", "aggregate_type": agg_type, "field": "price"}
+        vectorized, plain = await run_both([rule])
+        assert vectorized == plain
+        assert type(vectorized) is type(plain)
+    
+    # 整数求和保持整数
+    vectorized, _ = await run_both([{"type": "aggregate", "aggregate_type": "sum", "field": "price"}])
+    assert isinstance(vectorized, int)
+    
+    # 缺失字段参与大小比较、字符串与数字求和时两种处理方式都抛出异常
+    compare = {"type": "filter", "condition": {"field": "price", "operator": "greater_than", "value": 100}}
+    concat = {"type": "aggregate", "aggregate_type": "sum", "field": "name"}
+    for rules in ([compare], [{"type": "filter", "condition": {"field": "price", "operator": "not_equals", "value": -1}}, concat]):
+        with pytest.raises(TypeError):
+            await handler.execute({"data": test_data, "rules": rules})
+        monkeypatch.setattr(module, "VECTORIZE_THRESHOLD", len(test_data) + 1)
+        with pytest.raises(TypeError):
+            await handler.execute({"data": test_data, "rules": rules})
+        monkeypatch.undo()
+
 @pytest.mark.asyncio
 async def test_error_handling(handler):
     """测试错误处理"""
@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from core.components.action.handlers.extraction_handlers import ExtractMultipleHandler
+from core.components.selector.selector_engine import SelectorEngine
+from core.components.selector.selector_handlers.base_selector_handler import ElementNotFoundError
+
+@pytest.fixture
+def page():
+    page = MagicMock()
+    page.eval_on_selector_all = AsyncMock(return_value=["a", "b"])
+    return page
+
+@pytest.fixture
+def handler(page):
+    return ExtractMultipleHandler(page, SelectorEngine(page))
+
+@pytest.mark.asyncio
+async def test_extract_multiple_single_call(handler, page):
+    """测试多元素提取只调用一次页面脚本"""
+    result = await handler.execute({"selector": "class:item"})
+    assert result == ["a", "b"]
+    page.eval_on_selector_all.assert_awaited_once_with(
+        ".item", ExtractMultipleHandler.EXTRACT_SCRIPTS["text"], "value"
+    )
+
+    await handler.execute({
+        "selector": "xpath://a[@href]",
+        "extract_type": "attribute",
+        "attribute": "href"
+    })
+    page.eval_on_selector_all.assert_awaited_with(
+        "xpath=//a[@href]", ExtractMultipleHandler.EXTRACT_SCRIPTS["attribute"], "href"
+    )
+
+@pytest.mark.asyncio
+async def test_extract_multiple_errors(handler, page):
+    """测试多元素提取的错误处理"""
+    with pytest.raises(ValueError):
+        await handler.execute({"selector": "#list", "extract_type": "unknown"})
+
+    page.eval_on_selector_all.return_value = []
+    with pytest.raises(ElementNotFoundError):
+        await handler.execute({"selector": "#list"})
+
+    assert await handler.validate({"selector": "#list", "extract_type": "html"})
+    assert not await handler.validate({"selector": "#list", "extract_type": "unknown"})
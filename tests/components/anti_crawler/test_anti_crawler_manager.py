@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 import os
 import json
-from core.components.anti_crawler.anti_crawler_manager import AntiCrawlerManager
+from aiohttp import web
+from unittest.mock import AsyncMock, MagicMock
+from core.components.anti_crawler.anti_crawler_manager import AntiCrawlerManager, _read_json, get_anti_crawler_manager
 from datetime import datetime, timedelta
 
 @pytest.fixture
@@ -47,6 +50,43 @@ def test_user_agent_management(manager, cleanup):
     assert "test_ua_1" in new_manager.user_agents
     assert "test_ua_2" in new_manager.user_agents
 
+def test_user_agent_cache(manager, cleanup):
+    """测试User-Agent配置解析缓存"""
+    manager.save_user_agents(["cached_ua"])
+    AntiCrawlerManager()
+    hits = _read_json.cache_info().hits
+    
+    # 文件未修改时不重新解析
+    second = AntiCrawlerManager()
+    assert _read_json.cache_info().hits == hits + 1
+    assert second.user_agents == ["cached_ua"]
+    
+    # 每个实例持有独立的列表
+    second.user_agents.append("other_ua")
+    assert AntiCrawlerManager().user_agents == ["cached_ua"]
+    
+    # 保存后读取到新内容
+    manager.save_user_agents(["new_ua"])
+    assert AntiCrawlerManager().user_agents == ["new_ua"]
+    
+    # 代理和延迟配置同样走缓存，且各实例互不影响
+    manager.save_proxies([{"http": "http://127.0.0.1:8080"}])
+    first = AntiCrawlerManager()
+    first.proxies[0]["http"] = "changed"
+    assert AntiCrawlerManager().proxies == [{"http": "http://127.0.0.1:8080"}]
+    
+    # 配置文件损坏时不再静默使用默认值
+    with open("config/delay_config.json", "w", encoding="utf-8") as f:
+        f.write("{invalid")
+    with pytest.raises(json.JSONDecodeError):
+        AntiCrawlerManager()
+
+def test_shared_manager():
+    """测试全局共享的反爬虫管理器"""
+    shared = get_anti_crawler_manager()
+    assert shared is get_anti_crawler_manager()
+    assert isinstance(shared, AntiCrawlerManager)
+
 def test_proxy_management(manager, cleanup):
     """测试代理管理"""
     # 测试默认代理列表
@@ -120,12 +160,74 @@ async def test_proxy_validation(manager, cleanup):
         "https": "http://invalid.proxy:8080"
     }
     
+    # 事件循环中同步验证会阻塞循环，直接报错
+    with pytest.raises(RuntimeError):
+        manager.validate_proxy(test_proxy)
+    
     # 测试同步验证
-    assert not manager.validate_proxy(test_proxy)
+    assert not await asyncio.to_thread(manager.validate_proxy, test_proxy)
     
     # 测试异步验证
     assert not await manager.validate_proxy_async(test_proxy)
 
+@pytest.mark.asyncio
+async def test_batch_proxy_validation(manager, cleanup):
+    """测试批量代理验证"""
+    # 本地服务充当 HTTP 代理，对任意请求返回 204
+    async def handle(request):
+        return web.Response(status=204)
+    
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    
+    try:
+        good_proxy = {"http": f"http://127.0.0.1:{port}", "https": f"http://127.0.0.1:{port}"}
+        bad_proxy = {"http": "http://127.0.0.1:1", "https": "http://127.0.0.1:1"}
+        results = await manager.validate_proxies([good_proxy, bad_proxy, {}])
+        assert results == [True, False, False]
+        
+        # 事件循环中同步添加代理直接报错，应使用异步方法
+        with pytest.raises(RuntimeError):
+            manager.add_proxy(good_proxy)
+        assert good_proxy not in manager.proxies
+        assert await manager.add_proxy_async(good_proxy)
+        assert good_proxy in manager.proxies
+        
+        # 没有运行中的事件循环时同步添加代理返回布尔值
+        manager.proxies.remove(good_proxy)
+        assert await asyncio.to_thread(manager.add_proxy, good_proxy) is True
+    finally:
+        await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_browser_proxy_validation(manager, cleanup):
+    """测试使用池中浏览器验证代理"""
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=MagicMock(goto=AsyncMock()))
+    context.close = AsyncMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=context)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=browser)
+    pool.release = AsyncMock()
+    
+    proxy = {"http": "http://127.0.0.1:8080", "https": "http://127.0.0.1:8080"}
+    assert await manager.validate_proxy_async(proxy, browser_pool=pool)
+    browser.new_context.assert_awaited_once_with(proxy={"server": "http://127.0.0.1:8080"})
+    context.close.assert_awaited_once()
+    pool.release.assert_awaited_once_with(browser)
+    
+    # 访问失败时同样关闭上下文并归还浏览器
+    context.new_page.return_value.goto.side_effect = Exception("timeout")
+    assert not await manager.validate_proxy_async(proxy, browser_pool=pool)
+    assert context.close.await_count == 2
+    assert pool.release.await_count == 2
+
 def test_config_persistence(manager, cleanup):
     """测试配置持久化"""
     # 测试User-Agent配置
@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+from core.components.anti_crawler.token_bucket import AsyncTokenBucket
+
+@pytest.mark.asyncio
+async def test_burst_then_rate_limited():
+    """测试突发容量用尽后按速率放行"""
+    bucket = AsyncTokenBucket(capacity=2, refill_per_sec=20)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert loop.time() - start < 0.04
+
+    # 第三个令牌需要等待约 50 毫秒
+    await bucket.acquire()
+    assert loop.time() - start >= 0.04
+
+@pytest.mark.asyncio
+async def test_shared_across_tasks():
+    """测试多个任务共用同一个令牌桶"""
+    bucket = AsyncTokenBucket(capacity=1, refill_per_sec=50)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+    # 首个令牌立即获得，其余三个各等待约 20 毫秒
+    assert loop.time() - start >= 0.05
+
+def test_invalid_arguments():
+    """测试无效参数"""
+    with pytest.raises(ValueError):
+        AsyncTokenBucket(capacity=0)
+    with pytest.raises(ValueError):
+        AsyncTokenBucket(refill_per_sec=0)
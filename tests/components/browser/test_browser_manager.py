@@ -1,8 +1,11 @@
 import pytest
 import pytest_asyncio
-from core.components.browser.browser_manager import BrowserManager
+from core.components.browser.browser_manager import (
+    BrowserManager, AD_URL_PATTERN, _get_playwright, shutdown_playwright
+)
 from playwright.async_api import Page
 import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 @pytest_asyncio.fixture
 async def browser_manager():
@@ -61,15 +64,15 @@ async def test_anti_crawler_integration(browser_manager):
 @pytest.mark.asyncio
 async def test_page_retry(browser_manager):
     """测试页面创建重试机制"""
-    # 测试正常创建
-    page = await browser_manager.new_page_with_retry()
-    assert isinstance(page, Page)
-    await page.close()
+    # 测试正常借用
+    async with browser_manager.new_page_with_retry() as page:
+        assert isinstance(page, Page)
     
     # 测试重试失败
     browser_manager.browser = None  # 模拟浏览器未初始化
     with pytest.raises(Exception):
-        await browser_manager.new_page_with_retry(max_retries=0)  # 不允许重试
+        async with browser_manager.new_page_with_retry(max_retries=0):  # 不允许重试
+            pass
 
 @pytest.mark.asyncio
 async def test_request_delay(browser_manager):
@@ -157,4 +160,138 @@ async def test_error_handling(browser_manager):
     with pytest.raises(Exception):
         await browser_manager.navigate(page, "https://example.com", timeout=1)
     
-    await page.close() 
\ No newline at end of file
+    await page.close()
+
+@pytest.mark.asyncio
+async def test_request_blocking():
+    """测试屏蔽资源和广告请求"""
+    manager = BrowserManager(block_resources=True, block_ads=True)
+    
+    def make_request(resource_type, url):
+        return MagicMock(resource_type=resource_type, url=url)
+    
+    assert manager._should_block(make_request("image", "https://example.com/a.png"))
+    assert manager._should_block(make_request("script", "https://stats.g.doubleclick.net/x.js"))
+    assert not manager._should_block(make_request("document", "https://example.com/"))
+    assert not manager._should_block(make_request("script", "https://notdoubleclick.net/x.js"))
+    
+    # 请求处理器注册在上下文上，屏蔽的请求被中止
+    context = MagicMock(route=AsyncMock())
+    await manager._setup_request_handlers(context)
+    handler = context.route.await_args.args[1]
+    route = MagicMock(abort=AsyncMock(), continue_=AsyncMock())
+    await handler(route, make_request("font", "https://example.com/a.woff2"))
+    route.abort.assert_awaited_once()
+    route.continue_.assert_not_awaited()
+    
+    # 未启用屏蔽时不拦截请求
+    context = MagicMock(route=AsyncMock())
+    await BrowserManager()._setup_request_handlers(context)
+    context.route.assert_not_awaited()
+    
+    # 只屏蔽广告时按 URL 模式拦截
+    context = MagicMock(route=AsyncMock())
+    await BrowserManager(block_ads=True)._setup_request_handlers(context)
+    pattern = context.route.await_args.args[0]
+    assert pattern is AD_URL_PATTERN
+    assert pattern.search("https://stats.g.doubleclick.net/x.js")
+    assert not pattern.search("https://example.com/?ref=doubleclick.net")
+
+def test_logger_handlers_not_duplicated():
+    """测试多次实例化不会重复添加日志处理器"""
+    first = BrowserManager()
+    count = len(first.logger.handlers)
+    BrowserManager()
+    BrowserManager()
+    assert len(first.logger.handlers) == count == 1
+
+@pytest.mark.asyncio
+async def test_shared_playwright():
+    """测试多个浏览器管理器共用同一个 Playwright 驱动"""
+    playwright = MagicMock(stop=AsyncMock())
+    driver = MagicMock(start=AsyncMock(return_value=playwright))
+    
+    with patch("core.components.browser.browser_manager.async_playwright", return_value=driver):
+        results = await asyncio.gather(*(_get_playwright() for _ in range(3)))
+        assert all(result is playwright for result in results)
+        driver.start.assert_awaited_once()
+        
+        await shutdown_playwright()
+        playwright.stop.assert_awaited_once()
+        
+        # 停止后再次获取会重新启动
+        await _get_playwright()
+        assert driver.start.await_count == 2
+        await shutdown_playwright()
+
+@pytest.mark.asyncio
+async def test_launch_and_close_lifecycle():
+    """测试重复启动只启动一次浏览器，关闭时停止单独启动的驱动"""
+    browser = MagicMock(close=AsyncMock())
+    playwright = MagicMock(stop=AsyncMock())
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+    driver = MagicMock(start=AsyncMock(return_value=playwright))
+    
+    manager = BrowserManager(shared_playwright=False)
+    with patch("core.components.browser.browser_manager.async_playwright", return_value=driver):
+        results = await asyncio.gather(manager.launch(), manager.launch())
+    assert results == [browser, browser]
+    playwright.chromium.launch.assert_awaited_once()
+    
+    await manager.close()
+    await manager.close()
+    browser.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
+    assert manager.playwright is None
+    
+    # 共用驱动在最后一个浏览器管理器关闭时停止
+    shared_playwright = MagicMock(stop=AsyncMock())
+    shared_playwright.chromium.launch = AsyncMock(side_effect=lambda **kwargs: MagicMock(close=AsyncMock()))
+    shared_driver = MagicMock(start=AsyncMock(return_value=shared_playwright))
+    first, second = BrowserManager(), BrowserManager()
+    with patch("core.components.browser.browser_manager.async_playwright", return_value=shared_driver):
+        await first.launch()
+        await second.launch()
+    shared_driver.start.assert_awaited_once()
+    
+    await first.close()
+    shared_playwright.stop.assert_not_awaited()
+    await second.close()
+    await second.close()
+    shared_playwright.stop.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_page_pool_lazy_and_retry():
+    """测试页面池默认不预热，借用页面失败时重试"""
+    page = MagicMock(is_closed=MagicMock(return_value=False))
+    context = MagicMock(close=AsyncMock(), route=AsyncMock())
+    context.new_page = AsyncMock(side_effect=[RuntimeError("代理不可用"), page])
+    browser = MagicMock(new_context=AsyncMock(return_value=context))
+    
+    manager = BrowserManager()
+    manager.browser = browser
+    with patch("core.components.browser.browser_manager.asyncio.sleep", new=AsyncMock()):
+        await manager.init()
+        browser.new_context.assert_not_awaited()
+        
+        async with manager.new_page_with_retry() as borrowed:
+            assert borrowed is page
+    
+    assert browser.new_context.await_count == 2
+    context.close.assert_awaited_once()
+    assert list(manager.page_pool._idle) == [page]
+
+@pytest.mark.asyncio
+async def test_page_retry_without_retries():
+    """测试不允许重试时借用页面失败直接抛出原始异常"""
+    context = MagicMock(close=AsyncMock(), route=AsyncMock())
+    context.new_page = AsyncMock(side_effect=RuntimeError("代理不可用"))
+    browser = MagicMock(new_context=AsyncMock(return_value=context))
+    
+    manager = BrowserManager()
+    manager.browser = browser
+    await manager.init()
+    with pytest.raises(RuntimeError, match="代理不可用"):
+        async with manager.new_page_with_retry(max_retries=0):
+            pass
+    browser.new_context.assert_awaited_once()
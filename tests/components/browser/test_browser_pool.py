@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from core.components.browser.browser_pool import BrowserPool
+
+def make_browser():
+    browser = MagicMock()
+    browser.is_connected = MagicMock(return_value=True)
+    browser.close = AsyncMock()
+    return browser
+
+@pytest.fixture
+def mock_playwright():
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=lambda **kwargs: make_browser())
+    playwright.stop = AsyncMock()
+
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    with patch('core.components.browser.browser_pool.async_playwright', return_value=starter):
+        yield playwright
+
+@pytest.mark.asyncio
+async def test_acquire_reuses_released_browser(mock_playwright):
+    """测试归还的浏览器会被复用"""
+    pool = BrowserPool(size=2)
+
+    browser = await pool.acquire()
+    await pool.release(browser)
+    again = await pool.acquire()
+
+    assert again is browser
+    assert mock_playwright.chromium.launch.await_count == 1
+    await pool.release(again)
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_start_prewarms_pool(mock_playwright):
+    """测试预热会启动全部浏览器"""
+    pool = BrowserPool(size=3)
+    await pool.start()
+
+    assert mock_playwright.chromium.launch.await_count == 3
+    assert len(pool._idle) == 3
+    await pool.close()
+    mock_playwright.stop.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_browser_recycled_after_max_uses(mock_playwright):
+    """测试达到使用上限后浏览器被回收"""
+    pool = BrowserPool(size=1)
+    pool.MAX_USES_PER_INSTANCE = 2
+
+    browser = await pool.acquire()
+    await pool.release(browser)
+    browser = await pool.acquire()
+    await pool.release(browser)
+    browser.close.assert_awaited_once()
+
+    replacement = await pool.acquire()
+    assert replacement is not browser
+    assert mock_playwright.chromium.launch.await_count == 2
+    await pool.release(replacement)
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_discard_on_error(mock_playwright):
+    """测试出错的浏览器不会放回池中"""
+    pool = BrowserPool(size=1)
+
+    browser = await pool.acquire()
+    await pool.release(browser, discard=True)
+
+    browser.close.assert_awaited_once()
+    assert not pool._idle
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_waiter_wakes_after_discard(mock_playwright):
+    """测试等待中的借用者在浏览器被丢弃后获得替代实例"""
+    pool = BrowserPool(size=1)
+
+    browser = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await pool.release(browser, discard=True)
+    replacement = await asyncio.wait_for(waiter, timeout=1)
+
+    assert replacement is not browser
+    assert mock_playwright.chromium.launch.await_count == 2
+    await pool.release(replacement)
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_waiter_wakes_after_recycle(mock_playwright):
+    """测试等待中的借用者在浏览器达到使用上限被回收后获得替代实例"""
+    pool = BrowserPool(size=1)
+    pool.MAX_USES_PER_INSTANCE = 1
+
+    browser = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    await pool.release(browser)
+
+    replacement = await asyncio.wait_for(waiter, timeout=1)
+    assert replacement is not browser
+    await pool.release(replacement)
+    await pool.close()
+
+def test_rebind_closes_browsers_on_previous_loop(mock_playwright):
+    """测试切换事件循环时在原事件循环上关闭浏览器并停止 Playwright"""
+    pool = BrowserPool(size=1)
+    old_loop = asyncio.new_event_loop()
+    try:
+        browser = old_loop.run_until_complete(pool.acquire())
+        old_loop.run_until_complete(pool.release(browser))
+
+        async def use_on_new_loop():
+            again = await pool.acquire()
+            await pool.release(again)
+            await pool.close()
+            return again
+
+        again = asyncio.run(use_on_new_loop())
+    finally:
+        old_loop.close()
+
+    assert again is not browser
+    browser.close.assert_awaited_once()
+    assert mock_playwright.stop.await_count == 2
+
+def test_close_after_loop_closed(mock_playwright):
+    """测试原事件循环已关闭时关闭浏览器池不会报错"""
+    pool = BrowserPool(size=1)
+    old_loop = asyncio.new_event_loop()
+    browser = old_loop.run_until_complete(pool.acquire())
+    old_loop.run_until_complete(pool.release(browser))
+    old_loop.close()
+
+    asyncio.run(pool.close())
+
+    assert pool.playwright is None
+    assert not pool._idle
+
+@pytest.mark.asyncio
+async def test_release_closes_foreign_browser(mock_playwright):
+    """测试归还不属于浏览器池的浏览器时直接关闭，不放回池中"""
+    pool = BrowserPool(size=1)
+
+    foreign = make_browser()
+    await pool.release(foreign)
+    foreign.close.assert_awaited_once()
+    assert not pool._idle
+
+    # 关闭失败时不抛出异常
+    failing = make_browser()
+    failing.close.side_effect = RuntimeError("连接已断开")
+    await pool.release(failing)
+    await pool.close()
+
+def test_release_after_rebind_closes_browser(mock_playwright):
+    """测试切换事件循环时仍借出的浏览器在归还时被关闭"""
+    pool = BrowserPool(size=1)
+    old_loop = asyncio.new_event_loop()
+    try:
+        browser = old_loop.run_until_complete(pool.acquire())
+        asyncio.run(pool.start())
+        old_loop.run_until_complete(pool.release(browser))
+    finally:
+        old_loop.close()
+
+    browser.close.assert_awaited_once()
+    assert browser not in pool._idle
+
+def test_invalid_size():
+    """测试无效的池大小"""
+    with pytest.raises(ValueError):
+        BrowserPool(size=0)
@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from core.components.browser.page_pool import BrowserPagePool
+
+def make_factory():
+    contexts = []
+
+    async def factory():
+        context = MagicMock()
+        page = MagicMock()
+        page.is_closed = MagicMock(return_value=False)
+        context.new_page = AsyncMock(return_value=page)
+        context.close = AsyncMock()
+        contexts.append(context)
+        return context
+
+    return factory, contexts
+
+@pytest.mark.asyncio
+async def test_start_precreates_pages():
+    """测试预先创建全部页面"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=3)
+    await pool.start()
+
+    assert len(contexts) == 3
+    assert len(pool._idle) == 3
+    await pool.close()
+    for context in contexts:
+        context.close.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_acquire_reuses_page():
+    """测试归还的页面被复用"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=1)
+
+    async with pool.acquire() as page:
+        first = page
+    async with pool.acquire() as page:
+        assert page is first
+
+    assert len(contexts) == 1
+    assert pool._uses[first] == 2
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_recycle_after_max_uses():
+    """测试达到使用上限后页面被重建"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=1, max_uses=2)
+
+    for _ in range(2):
+        async with pool.acquire() as page:
+            pass
+    contexts[0].close.assert_awaited_once()
+
+    async with pool.acquire() as replacement:
+        assert replacement is not page
+    assert len(contexts) == 2
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_discard_on_error():
+    """测试使用过程中出错的页面不会放回池中"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=1)
+
+    with pytest.raises(RuntimeError):
+        async with pool.acquire():
+            raise RuntimeError("页面崩溃")
+
+    contexts[0].close.assert_awaited_once()
+    assert not pool._idle
+    assert pool._created == 0
+
+@pytest.mark.asyncio
+async def test_recycle_after_max_age():
+    """测试超过存活时间的页面被回收"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=1, max_age_ms=0)
+
+    async with pool.acquire():
+        pass
+    contexts[0].close.assert_awaited_once()
+    assert not pool._idle
+
+@pytest.mark.asyncio
+async def test_waiter_wakes_after_discard():
+    """测试等待中的借用者在页面被回收后获得新建的页面"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=1)
+    acquired = asyncio.Event()
+
+    async def borrow():
+        async with pool.acquire() as page:
+            acquired.set()
+            return page
+
+    with pytest.raises(RuntimeError):
+        async with pool.acquire() as page:
+            waiter = asyncio.create_task(borrow())
+            await asyncio.sleep(0)
+            assert not acquired.is_set()
+            raise RuntimeError("页面崩溃")
+
+    replacement = await asyncio.wait_for(waiter, timeout=1)
+    assert replacement is not page
+    assert len(contexts) == 2
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_pages_created_on_demand():
+    """测试未预热时页面按需创建"""
+    factory, contexts = make_factory()
+    pool = BrowserPagePool(factory, max_pages=3)
+
+    async with pool.acquire():
+        pass
+
+    assert len(contexts) == 1
+    await pool.close()
+
+def test_invalid_size():
+    """测试无效的池大小"""
+    with pytest.raises(ValueError):
+        BrowserPagePool(AsyncMock(), max_pages=0)
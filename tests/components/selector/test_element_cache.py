@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from playwright.async_api import Page, ElementHandle
+
+from core.components.selector.element_cache import ElementCache
+from core.components.selector.selector_engine import SelectorEngine
+
+@pytest.fixture
+def mock_page():
+    """创建模拟的 Playwright Page 对象"""
+    page = MagicMock(spec=Page)
+    page.expose_binding = AsyncMock()
+    page.add_init_script = AsyncMock()
+    page.evaluate = AsyncMock()
+    page.query_selector = AsyncMock(side_effect=lambda selector: MagicMock(spec=ElementHandle))
+    return page
+
+def test_lru_eviction(mock_page):
+    """测试超出容量时淘汰最久未使用的元素"""
+    cache = ElementCache(mock_page, max_size=2)
+    first, second, third = (MagicMock(spec=ElementHandle) for _ in range(3))
+
+    cache.put('#a', first)
+    cache.put('#b', second)
+    assert cache.get('#a') is first
+    cache.put('#c', third)
+
+    assert cache.get('#b') is None
+    assert cache.get('#a') is first
+    assert len(cache) == 2
+
+    with pytest.raises(ValueError):
+        ElementCache(mock_page, max_size=0)
+
+@pytest.mark.asyncio
+async def test_engine_element_cache(mock_page):
+    """测试选择器引擎复用缓存的元素，DOM 变化和导航后重新查找"""
+    engine = SelectorEngine(mock_page)
+    await engine.enable_element_cache()
+    await engine.enable_element_cache()
+
+    # 监听只注册一次
+    mock_page.expose_binding.assert_awaited_once()
+    mock_page.add_init_script.assert_awaited_once_with(ElementCache.OBSERVER_SCRIPT)
+    bump = mock_page.expose_binding.await_args.args[1]
+    on_navigated = mock_page.on.call_args.args[1]
+
+    element = await engine.find_element('#title')
+    assert await engine.find_element('#title') is element
+    assert mock_page.query_selector.await_count == 1
+
+    # 页面中的 DOM 变化通知
+    bump(MagicMock())
+    assert await engine.find_element('#title') is not element
+    assert mock_page.query_selector.await_count == 2
+
+    # 页面导航
+    on_navigated(MagicMock())
+    await engine.find_element('#title')
+    assert mock_page.query_selector.await_count == 3
+
+    # 手动清空
+    engine.clear_cache()
+    await engine.find_element('#title')
+    assert mock_page.query_selector.await_count == 4
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from playwright.async_api import Page, ElementHandle
+
+from core.components.selector.selector_batcher import SelectorBatcher
+from core.components.selector.selector_engine import SelectorEngine
+from core.components.selector.selector_handlers.base_selector_handler import ElementNotFoundError, InvalidSelectorError
+
+def make_page(counts, elements):
+    """创建返回指定查询结果的模拟页面"""
+    def handle_for(element):
+        handle = MagicMock()
+        handle.as_element.return_value = element
+        return handle
+
+    properties = {'0': MagicMock(json_value=AsyncMock(return_value=counts), dispose=AsyncMock())}
+    properties.update({str(index): handle_for(element) for index, element in enumerate(elements, start=1)})
+
+    array_handle = MagicMock(get_properties=AsyncMock(return_value=properties), dispose=AsyncMock())
+    page = MagicMock(spec=Page)
+    page.evaluate_handle = AsyncMock(return_value=array_handle)
+    return page
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_coalesced():
+    """测试同一轮事件循环中的查询合并为一次页面调用"""
+    first, second, third = (MagicMock(spec=ElementHandle) for _ in range(3))
+    page = make_page([1, 2, 0, -1], [first, second, third])
+    batcher = SelectorBatcher(page)
+
+    results = await asyncio.gather(
+        batcher.query('css', '#title'),
+        batcher.query('xpath', '//li', all_matches=True),
+        batcher.query('css', '.missing'),
+        batcher.query('css', 'div[', all_matches=True),
+        return_exceptions=True
+    )
+
+    page.evaluate_handle.assert_awaited_once_with(SelectorBatcher.QUERY_SCRIPT, [
+        ['css', '#title', False],
+        ['xpath', '//li', True],
+        ['css', '.missing', False],
+        ['css', 'div[', True]
+    ])
+    assert results[0] == [first]
+    assert results[1] == [second, third]
+    assert results[2] == []
+    assert isinstance(results[3], InvalidSelectorError)
+
+@pytest.mark.asyncio
+async def test_page_error_propagates():
+    """测试页面调用失败时所有查询都收到异常"""
+    page = MagicMock(spec=Page)
+    page.evaluate_handle = AsyncMock(side_effect=RuntimeError("页面已关闭"))
+    batcher = SelectorBatcher(page)
+
+    results = await asyncio.gather(
+        batcher.query('css', '#a'), batcher.query('css', '#b'), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_selector_engine_batch_lookups():
+    """测试选择器引擎开启查询合并"""
+    element = MagicMock(spec=ElementHandle)
+    page = make_page([1, 0], [element])
+    engine = SelectorEngine(page, batch_lookups=True)
+
+    found, missing = await asyncio.gather(
+        engine.find_element('name:username'),
+        engine.find_elements('class:item'),
+        return_exceptions=True
+    )
+
+    page.evaluate_handle.assert_awaited_once_with(SelectorBatcher.QUERY_SCRIPT, [
+        ['css', '[name="username"]', False],
+        ['css', '.item', True]
+    ])
+    assert found is element
+    assert isinstance(missing, ElementNotFoundError)
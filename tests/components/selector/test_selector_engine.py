@@ -3,7 +3,7 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock
 from playwright.async_api import Page, ElementHandle
 
-from core.components.selector.selector_engine import SelectorEngine
+from core.components.selector.selector_engine import SelectorEngine, _parse_selector_cached
 from core.components.selector.selector_handlers.base_selector_handler import ElementNotFoundError, InvalidSelectorError
 
 class TestSelectorEngine:
@@ -57,6 +57,20 @@ class TestSelectorEngine:
         assert SelectorEngine.parse_selector('name:username') == ('name', 'username')
         assert SelectorEngine.parse_selector('[name="username"]') == ('name', 'username')
 
+    def test_parse_selector_cached(self):
+        """
+        测试选择器解析结果缓存
+        """
+        SelectorEngine.parse_selector('css:div.cached')
+        hits = _parse_selector_cached.cache_info().hits
+        assert SelectorEngine.parse_selector('css:div.cached') == ('css', 'div.cached')
+        assert _parse_selector_cached.cache_info().hits == hits + 1
+
+        # 无效选择器每次都抛出异常
+        for _ in range(2):
+            with pytest.raises(InvalidSelectorError):
+                SelectorEngine.parse_selector('css:invalid selector')
+
     @pytest.mark.asyncio
     async def test_find_element(self):
         """
@@ -65,14 +79,10 @@ class TestSelectorEngine:
         mock_element = MagicMock(spec=ElementHandle)
         
         # XPath 选择器测试
-        mock_locator = MagicMock()
-        mock_first = MagicMock()
-        mock_first.element_handle = AsyncMock(return_value=mock_element)
-        mock_locator.first = AsyncMock(return_value=mock_first)
-        self.mock_page.locator = AsyncMock(return_value=mock_locator)
-        
+        self.mock_page.query_selector = AsyncMock(return_value=mock_element)
         result = await self.selector_engine.find_element('xpath://div[@class="test"]')
         assert result == mock_element
+        self.mock_page.query_selector.assert_awaited_once_with('xpath=//div[@class="test"]')
 
         # CSS 选择器
         self.mock_page.query_selector = AsyncMock(return_value=mock_element)
@@ -107,11 +117,10 @@ class TestSelectorEngine:
         assert result == mock_elements
 
         # XPath 选择器
-        mock_locator = AsyncMock()
-        mock_locator.all_element_handles = AsyncMock(return_value=mock_elements)
-        self.mock_page.locator = AsyncMock(return_value=mock_locator)
+        self.mock_page.query_selector_all = AsyncMock(return_value=mock_elements)
         result = await self.selector_engine.find_elements('xpath://div[@class="test"]')
         assert result == mock_elements
+        self.mock_page.query_selector_all.assert_awaited_once_with('xpath=//div[@class="test"]')
 
         # ID 选择器
         self.mock_page.query_selector_all = AsyncMock(return_value=mock_elements)
@@ -151,4 +160,75 @@ class TestSelectorEngine:
             await self.selector_engine.find_element('div.nonexistent')
 
         with pytest.raises(ElementNotFoundError):
-            await self.selector_engine.find_elements('div.nonexistent') 
\ No newline at end of file
+            await self.selector_engine.find_elements('div.nonexistent') 
+    @pytest.mark.asyncio
+    async def test_find_many(self):
+        """
+        测试批量查找只进行一次页面脚本调用
+        """
+        found = MagicMock(spec=ElementHandle)
+        found_handle = MagicMock()
+        found_handle.as_element.return_value = found
+        missing_handle = MagicMock()
+        missing_handle.as_element.return_value = None
+
+        array_handle = MagicMock()
+        array_handle.get_properties = AsyncMock(return_value={
+            '0': found_handle, '1': missing_handle, '2': found_handle, 'length': MagicMock()
+        })
+        array_handle.dispose = AsyncMock()
+        self.mock_page.evaluate_handle = AsyncMock(return_value=array_handle)
+
+        results = await self.selector_engine.find_many(
+            ['#submit', 'xpath://div[@id="x"]', 'class:item', '#submit']
+        )
+
+        self.mock_page.evaluate_handle.assert_awaited_once_with(
+            SelectorEngine._FIND_MANY_SCRIPT,
+            [['css', '#submit'], ['xpath', '//div[@id="x"]'], ['css', '.item']]
+        )
+        array_handle.dispose.assert_awaited_once()
+        assert results == {'#submit': found, 'xpath://div[@id="x"]': None, 'class:item': found}
+
+        # 无效选择器在查询前抛出异常
+        with pytest.raises(InvalidSelectorError):
+            await self.selector_engine.find_many(['#ok', 'invalid:selector'])
+        assert self.mock_page.evaluate_handle.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_extract_many(self):
+        """
+        测试批量提取元素属性只进行一次页面调用
+        """
+        self.mock_page.eval_on_selector_all = AsyncMock(return_value=['a', 'b'])
+
+        values = await self.selector_engine.extract_many('class:item', 'innerText')
+
+        assert values == ['a', 'b']
+        self.mock_page.eval_on_selector_all.assert_awaited_once_with(
+            '.item', '(els) => els.map(e => e.innerText)'
+        )
+
+        # 不在允许范围内的属性不会发送到页面
+        with pytest.raises(ValueError):
+            await self.selector_engine.extract_many('class:item', 'constructor')
+        assert self.mock_page.eval_on_selector_all.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_native_css_fast_path(self):
+        """
+        测试 CSS、ID、Class 选择器直接使用原生 CSS 查询
+        """
+        mock_element = MagicMock(spec=ElementHandle)
+        self.mock_page.query_selector = AsyncMock(return_value=mock_element)
+        self.selector_engine._find_one = {}
+
+        for selector, css_selector in [('class:item', '.item'), ('#main', '#main'),
+                                       ('id:#main', '#main'), ('div > p', 'div > p')]:
+            assert await self.selector_engine.find_element(selector) is mock_element
+            self.mock_page.query_selector.assert_awaited_with(css_selector)
+
+        # 查询出错时视为元素未找到
+        self.mock_page.query_selector_all = AsyncMock(side_effect=RuntimeError("页面已关闭"))
+        with pytest.raises(ElementNotFoundError):
+            await self.selector_engine.find_elements('.item')
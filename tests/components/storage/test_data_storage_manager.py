@@ -2,6 +2,7 @@ import pytest
 import os
 import json
 from datetime import datetime
+from unittest.mock import patch
 from core.components.storage.data_storage_manager import DataStorageManager
 
 @pytest.fixture
@@ -230,4 +231,139 @@ def test_error_handling(storage_manager):
     
     # 测试无效的搜索条件
     with pytest.raises(Exception):
-        storage_manager.search_data_files("test_workflow", None) 
\ No newline at end of file
+        storage_manager.search_data_files("test_workflow", None)
+
+def test_search_prefilter(tmp_path):
+    """测试预过滤字节串不匹配的数据文件不调用搜索条件"""
+    manager = DataStorageManager(str(tmp_path))
+    workflow_id = 2
+    
+    manager.store_data(workflow_id, {"type": "A", "value": 1})
+    file_path = manager.store_data(workflow_id, {"type": "B", "value": 2})
+    
+    checked = []
+    def condition(d):
+        checked.append(d["value"])
+        return True
+    assert manager.search_data_files(workflow_id, condition, prefilter=b'"type":"B"') == [file_path]
+    assert checked == [2]
+
+def test_search_prefilter_indented_file(tmp_path):
+    """测试预过滤同样匹配旧版本写入的缩进格式数据文件"""
+    manager = DataStorageManager(str(tmp_path))
+    indented_path = tmp_path / "workflow_3_20250219_152935_009760.json"
+    indented_path.write_text(json.dumps({
+        "workflow_id": 3,
+        "timestamp": "2025-02-19T15:29:35.009785",
+        "data": {"type": "A", "name": "a b", "value": 10}
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    compact_path = manager.store_data(3, {"type": "A", "value": 1})
+    manager.store_data(3, {"type": "B", "value": 2})
+    
+    condition = lambda d: d.get("type") == "A"
+    expected = manager.search_data_files(3, condition)
+    assert set(expected) == {str(indented_path), compact_path}
+    assert manager.search_data_files(3, condition, prefilter=b'"type":"A"') == expected
+    
+    # 字符串内容中的空白仍按原样匹配
+    assert manager.search_data_files(3, condition, prefilter=b'"name":"a b"') == [str(indented_path)]
+    assert manager.search_data_files(3, condition, prefilter=b'"name":"ab"') == []
+
+def test_directory_scan_cached(tmp_path):
+    """测试目录扫描结果缓存与失效"""
+    manager = DataStorageManager(str(tmp_path))
+    first = manager.store_data(3, {"value": 1})
+    assert manager.get_workflow_data_files(3) == [first]
+    
+    # 目录未变化时不重新扫描
+    with patch("core.components.storage.data_storage_manager.os.scandir") as scandir:
+        assert manager.get_workflow_data_files(3) == [first]
+        assert manager.get_workflow_data_files() == [first]
+        scandir.assert_not_called()
+    
+    # 本实例写入和删除后重新扫描
+    second = manager.store_data(3, {"value": 2})
+    assert manager.get_workflow_data_files(3) == [second, first]
+    manager.delete_data(first)
+    assert manager.get_workflow_data_files(3) == [second]
+    
+    # 清理过期文件
+    os.utime(second, (0, 0))
+    manager.cleanup_old_data(days=1)
+    assert manager.get_workflow_data_files() == []
+
+def test_same_instant_filenames_unique(tmp_path):
+    """测试同一时刻保存的文件名不重复，且时间戳与文件名一致"""
+    manager = DataStorageManager(str(tmp_path))
+    now = datetime(2024, 1, 2, 3, 4, 5, 678901)
+    
+    with patch("core.components.storage.data_storage_manager.datetime") as mock_datetime:
+        mock_datetime.now.return_value = now
+        paths = [manager.store_data(4, {"value": i}) for i in range(3)]
+    
+    assert len(set(paths)) == 3
+    for path in paths:
+        assert os.path.basename(path).startswith("workflow_4_20240102_030405_678901_")
+        assert manager.load_data(path)["timestamp"] == now.isoformat()
+
+def test_load_many(tmp_path):
+    """测试并发读取数据文件并跳过无法解析的文件"""
+    manager = DataStorageManager(str(tmp_path))
+    paths = [manager.store_data(5, {"value": i}) for i in range(5)]
+    broken = tmp_path / "workflow_5_broken.json"
+    broken.write_text("{", encoding="utf-8")
+    
+    results = manager._load_many(paths + [str(broken), str(tmp_path / "missing.json")])
+    assert [result["data"]["value"] for result in results[:5]] == list(range(5))
+    assert results[5:] == [None, None]
+    
+    assert manager.aggregate_data(5, lambda d: d["value"], sum) == 10
+
+def test_export_transform(tmp_path):
+    """测试导出时转换数据"""
+    manager = DataStorageManager(str(tmp_path))
+    source = manager.store_data(6, {"value": 1})
+    
+    copy_path = tmp_path / "copy.json"
+    manager.export_data(source, str(copy_path))
+    with open(source, 'rb') as f:
+        assert copy_path.read_bytes() == f.read()
+    
+    transformed_path = tmp_path / "transformed.json"
+    manager.export_data(source, str(transformed_path), transform=lambda d: d["data"])
+    assert json.loads(transformed_path.read_text(encoding="utf-8")) == {"value": 1}
+
+    pretty_path = tmp_path / "pretty.json"
+    manager.export_data(source, str(pretty_path), pretty=True)
+    assert pretty_path.read_text(encoding="utf-8") == manager.pretty(source)
+    assert manager.pretty(source).startswith('{\n  "workflow_id": 6')
+
+def test_cleanup_old_data_parallel(tmp_path):
+    """测试大量过期文件并发删除，未过期的文件保留"""
+    manager = DataStorageManager(str(tmp_path))
+    manager.UNLINK_PARALLEL_THRESHOLD = 2
+    
+    expired = [manager.store_data(5, {"value": i}) for i in range(3)]
+    for path in expired:
+        os.utime(path, (0, 0))
+    kept = manager.store_data(5, {"value": 3})
+    
+    manager.cleanup_old_data(days=1)
+    assert manager.get_workflow_data_files() == [kept]
+
+def test_delete_data_batch(tmp_path):
+    """测试批量删除数据文件"""
+    manager = DataStorageManager(str(tmp_path))
+    paths = [manager.store_data(8, {"value": i}) for i in range(3)]
+    assert manager.get_workflow_data_files(8) == paths[::-1]
+    
+    assert manager.delete_data_batch(paths[:2] + [str(tmp_path / "missing.json")]) == 2
+    assert manager.get_workflow_data_files(8) == [paths[2]]
+
+def test_load_data_mmap(tmp_path):
+    """测试大文件通过内存映射加载"""
+    manager = DataStorageManager(str(tmp_path))
+    path = manager.store_data(9, {"items": list(range(100))})
+    
+    manager.MMAP_THRESHOLD = 1
+    assert manager.load_data(path)["data"]["items"] == list(range(100))
@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from playwright.async_api import Error as PlaywrightError
+from core.components.workflow.workflow_engine import WorkflowEngine
+
+@pytest.fixture
+def engine():
+    context = MagicMock(close=AsyncMock())
+    context.new_page = AsyncMock(return_value=MagicMock())
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=context)
+    pool = MagicMock(acquire=AsyncMock(return_value=browser), release=AsyncMock())
+    return WorkflowEngine(browser_pool=pool)
+
+def test_build_layers():
+    """测试步骤依赖分层"""
+    steps = [
+        {'id': 1},
+        {'id': 2, 'depends_on': [1]},
+        {'id': 3, 'depends_on': [1]},
+        {'id': 4},
+        {'id': 5, 'depends_on': []}
+    ]
+    layers = WorkflowEngine._build_layers(steps)
+    assert [[step['id'] for step in layer] for layer in layers] == [[1, 5], [2, 3], [4]]
+
+    # 未指定依赖时顺序执行
+    sequential = WorkflowEngine._build_layers([{'id': 1}, {'id': 2}, {'id': 3}])
+    assert [[step['id'] for step in layer] for layer in sequential] == [[1], [2], [3]]
+
+    with pytest.raises(ValueError):
+        WorkflowEngine._build_layers([{'id': 1, 'depends_on': [9]}])
+    with pytest.raises(ValueError):
+        WorkflowEngine._build_layers([{'id': 1, 'depends_on': [2]}, {'id': 2, 'depends_on': [1]}])
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently(engine):
+    """测试互不依赖的步骤并发执行，失败后停止后续步骤"""
+    running = 0
+    max_running = 0
+
+    async def execute_step(page, step):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if step['id'] == 3:
+            raise RuntimeError("提取失败")
+        return step['id']
+
+    steps = [
+        {'id': 1, 'depends_on': []},
+        {'id': 2, 'depends_on': []},
+        {'id': 3, 'depends_on': []},
+        {'id': 4, 'depends_on': [1]}
+    ]
+    with patch.object(engine, 'load_workflow', return_value={'steps': steps}), \
+         patch.object(engine, '_execute_step', side_effect=execute_step):
+        result = await engine.execute_workflow(7)
+
+    assert max_running == 3
+    assert result['status'] == 'completed'
+    assert [(r['step_id'], r['status']) for r in result['results']] == [
+        (1, 'success'), (2, 'success'), (3, 'error')
+    ]
+    engine.browser_pool.release.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_browser_reused_across_workflows(engine):
+    """测试多次执行复用池中的浏览器，只关闭每次创建的上下文"""
+    browser = engine.browser_pool.acquire.return_value
+    context = browser.new_context.return_value
+    steps = [{'id': 1}]
+    with patch.object(engine, 'load_workflow', return_value={'steps': steps}), \
+         patch.object(engine, '_execute_step', AsyncMock(return_value='ok')):
+        for _ in range(2):
+            result = await engine.execute_workflow(7)
+            assert result['status'] == 'completed'
+
+    assert context.close.await_count == 2
+    assert engine.browser_pool.release.await_args_list[-1].args == (browser,)
+    assert engine.browser_pool.release.await_args_list[-1].kwargs == {'discard': False}
+    browser.close.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_invalid_workflow_does_not_acquire_browser(engine):
+    """测试步骤依赖无效时不借用浏览器"""
+    steps = [{'id': 1, 'depends_on': [2]}, {'id': 2, 'depends_on': [1]}]
+    with patch.object(engine, 'load_workflow', return_value={'steps': steps}):
+        result = await engine.execute_workflow(7)
+
+    assert result['status'] == 'error'
+    engine.browser_pool.acquire.assert_not_awaited()
+    engine.browser_pool.release.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_browser_discarded_only_on_browser_error(engine):
+    """测试只有浏览器出错时才回收借用的浏览器"""
+    browser = engine.browser_pool.acquire.return_value
+    steps = [{'id': 1}]
+
+    browser.new_context.side_effect = PlaywrightError("Target closed")
+    with patch.object(engine, 'load_workflow', return_value={'steps': steps}):
+        result = await engine.execute_workflow(7)
+    assert result['status'] == 'error'
+    assert engine.browser_pool.release.await_args.kwargs == {'discard': True}
+
+    browser.new_context.side_effect = RuntimeError("其他错误")
+    with patch.object(engine, 'load_workflow', return_value={'steps': steps}):
+        result = await engine.execute_workflow(7)
+    assert result['status'] == 'error'
+    assert engine.browser_pool.release.await_args.kwargs == {'discard': False}
+
+def test_action_handlers_reused_per_page(engine):
+    """测试同一页面的动作处理器只创建一次，并共用选择器引擎"""
+    page, other_page = MagicMock(), MagicMock()
+
+    text_handler = engine._get_action_handler('extract_text', page)
+    assert engine._get_action_handler('extract_text', page) is text_handler
+    html_handler = engine._get_action_handler('extract_html', page)
+    assert html_handler.selector_engine is text_handler.selector_engine
+
+    other_handler = engine._get_action_handler('extract_text', other_page)
+    assert other_handler is not text_handler
+    assert other_handler.page is other_page
+    assert engine._get_action_handler('unknown', page) is None
+
+@pytest.mark.asyncio
+async def test_preloaded_workflow_not_reloaded(engine):
+    """测试传入已加载的工作流时不再重复加载"""
+    with patch.object(engine, 'load_workflow') as load_workflow, \
+         patch.object(engine, '_execute_step', AsyncMock(return_value='ok')):
+        result = await engine.execute_workflow(7, workflow={'steps': [{'id': 1}]})
+
+    assert result['status'] == 'completed'
+    load_workflow.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_load_workflow(engine):
+    """测试加载工作流时一次查询获取工作流和步骤"""
+    engine.crud_manager = MagicMock(get_workflow_with_steps=AsyncMock(return_value={
+        'workflow': {'id': 7, 'name': '测试工作流'},
+        'steps': [{'id': 2, 'step_order': 2}, {'id': 1, 'step_order': 1}]
+    }))
+
+    workflow = await engine.load_workflow(7)
+
+    assert workflow['name'] == '测试工作流'
+    assert [step['id'] for step in workflow['steps']] == [1, 2]
+    engine.crud_manager.get_workflow_with_steps.assert_awaited_once_with(7)
+
+    engine.crud_manager.get_workflow_with_steps.return_value = None
+    assert await engine.load_workflow(8) is None
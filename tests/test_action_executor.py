@@ -1,6 +1,7 @@
 import unittest
 import asyncio
-from core.components.action.action_executor import ActionExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+from core.components.action.action_executor import ActionExecutor, AntiCrawlerManager, parse_selector
 from core.components.browser.browser_manager import BrowserManager
 
 class TestActionExecutor(unittest.TestCase):
@@ -18,9 +19,9 @@ class TestActionExecutor(unittest.TestCase):
             'value': 'https://example.com'
         }
         
-        result = await self.action_executor.execute_action(action)
-        self.assertEqual(result['status'], 'success')
-        self.assertTrue('https://example.com' in result['url'])
+        results = await self.action_executor.execute_workflow([action])
+        self.assertEqual(results[0]['status'], 'success')
+        self.assertTrue('https://example.com' in results[0]['url'])
 
     async def test_input_action(self):
         """测试 input 动作"""
@@ -64,17 +65,17 @@ class TestActionExecutor(unittest.TestCase):
             'value': 'test'
         }
         
-        result = await self.action_executor.execute_action(action)
-        self.assertEqual(result['status'], 'error')
-        self.assertTrue('不支持的动作类型' in result['message'])
+        results = await self.action_executor.execute_workflow([action])
+        self.assertEqual(results[0]['status'], 'error')
+        self.assertTrue('不支持的动作类型' in results[0]['message'])
 
     def test_async_context_manager(self):
         """测试异步上下文管理器"""
         async def test_context():
             async with ActionExecutor() as executor:
                 action = {'type': 'goto', 'value': 'https://example.com'}
-                result = await executor.execute_action(action)
-                self.assertEqual(result['status'], 'success')
+                results = await executor.execute_workflow([action])
+                self.assertEqual(results[0]['status'], 'success')
         
         asyncio.run(test_context())
 
@@ -107,6 +108,17 @@ class TestActionExecutor(unittest.TestCase):
         self.assertEqual(xpath_selector['type'], 'xpath')
         self.assertEqual(xpath_selector['value'], '//div[@class="example"]')
 
+    def test_parse_selector_cached(self):
+        """测试模块级选择器解析缓存"""
+        self.assertEqual(parse_selector('id:test-id'), ('id', '#test-id'))
+        self.assertEqual(parse_selector('div > a'), ('css', 'div > a'))
+        hits = parse_selector.cache_info().hits
+        parse_selector('id:test-id')
+        self.assertEqual(parse_selector.cache_info().hits, hits + 1)
+        
+        with self.assertRaises(ValueError):
+            parse_selector('unknown:value')
+
     def test_anti_crawler_settings(self):
         """测试反爬虫设置"""
         # 禁用反爬虫策略
@@ -152,6 +164,190 @@ class TestActionExecutor(unittest.TestCase):
         for result in results:
             self.assertEqual(result['status'], 'success')
 
+    def test_build_graph(self):
+        """测试依赖图分层"""
+        workflow = [
+            {'id': 'a', 'type': 'goto', 'value': 'https://example.com/a'},
+            {'id': 'b', 'type': 'goto', 'value': 'https://example.com/b'},
+            {'id': 'c', 'type': 'click', 'selector': '#a', 'depends_on': ['a']},
+            {'id': 'd', 'type': 'click', 'selector': '#b', 'depends_on': ['b', 'c']}
+        ]
+        layers, deps = ActionExecutor._build_graph(workflow)
+        self.assertEqual(layers, [[0, 1], [2], [3]])
+        self.assertEqual(deps[3], [1, 2])
+        
+        # 循环依赖
+        with self.assertRaises(ValueError):
+            ActionExecutor._build_graph([
+                {'id': 'a', 'depends_on': ['b']},
+                {'id': 'b', 'depends_on': ['a']}
+            ])
+        
+        # 依赖不存在
+        with self.assertRaises(ValueError):
+            ActionExecutor._build_graph([{'id': 'a', 'depends_on': ['x']}])
+
+    def test_parallel_workflow(self):
+        """测试独立动作在多个页面上并发执行"""
+        pages = []
+        
+        def make_page():
+            page = MagicMock()
+            page.goto = AsyncMock()
+            page.click = AsyncMock()
+            page.close = AsyncMock()
+            page.url = 'https://example.com'
+            pages.append(page)
+            return page
+        
+        context = MagicMock()
+        context.new_page = AsyncMock(side_effect=make_page)
+        context.close = AsyncMock()
+        browser = MagicMock()
+        browser.new_context = AsyncMock(return_value=context)
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=browser)
+        pool.release = AsyncMock()
+        
+        executor = ActionExecutor(anti_crawler_enabled=False, browser_pool=pool)
+        workflow = [
+            {'id': 'a', 'type': 'goto', 'value': 'https://example.com/a'},
+            {'id': 'b', 'type': 'goto', 'value': 'https://example.com/b'},
+            {'id': 'c', 'type': 'click', 'selector': '#next', 'depends_on': ['b']}
+        ]
+        results = asyncio.run(executor.execute_workflow(workflow))
+        
+        self.assertEqual([r['status'] for r in results], ['success'] * 3)
+        self.assertEqual(len(pages), 2)
+        # 依赖 b 的动作在 b 的页面上执行
+        pages[1].click.assert_awaited_once_with('#next')
+        pages[0].click.assert_not_awaited()
+        context.close.assert_awaited_once()
+        pool.release.assert_awaited_once_with(browser, discard=False)
+
+    def test_stream_workflow(self):
+        """测试逐个产出结果，提前结束时释放资源"""
+        page = MagicMock()
+        page.goto = AsyncMock()
+        page.url = 'https://example.com'
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        context.close = AsyncMock()
+        browser = MagicMock()
+        browser.new_context = AsyncMock(return_value=context)
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=browser)
+        pool.release = AsyncMock()
+        
+        executor = ActionExecutor(anti_crawler_enabled=False, browser_pool=pool)
+        workflow = [{'type': 'goto', 'value': f'https://example.com/{i}'} for i in range(3)]
+        
+        async def run():
+            stream = executor.stream_workflow(workflow)
+            first = await stream.__anext__()
+            self.assertEqual(first['status'], 'success')
+            self.assertEqual(page.goto.await_count, 1)
+            await stream.aclose()
+        
+        asyncio.run(run())
+        self.assertEqual(page.goto.await_count, 1)
+        context.close.assert_awaited_once()
+        pool.release.assert_awaited_once_with(browser, discard=False)
+
+    def test_action_dispatch(self):
+        """
+        测试动作分发与选择器转换
+        """
+        executor = ActionExecutor(anti_crawler_enabled=False, browser_pool=MagicMock())
+        page = MagicMock()
+        page.click = AsyncMock()
+        page.fill = AsyncMock()
+
+        result = asyncio.run(executor.execute_action(
+            {'type': 'click', 'selector': 'xpath://button[@type="submit"]'}, page
+        ))
+        self.assertEqual(result['status'], 'success')
+        page.click.assert_awaited_once_with('xpath=//button[@type="submit"]')
+
+        asyncio.run(executor.execute_action(
+            {'type': 'input', 'selector': 'id:search', 'value': 'test'}, page
+        ))
+        page.fill.assert_awaited_once_with('#search', 'test')
+
+        result = asyncio.run(executor.execute_action({'type': 'hover', 'selector': '#a'}, page))
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('不支持的动作类型', result['message'])
+
+        # 不支持的动作在延迟之前失败
+        executor.anti_crawler_enabled = True
+        executor.anti_crawler_manager = MagicMock(throttle=AsyncMock())
+        asyncio.run(executor.execute_action({'type': 'hover', 'selector': '#a'}, page))
+        executor.anti_crawler_manager.throttle.assert_not_awaited()
+        
+        # 添加的动作类型只影响当前实例
+        executor.add_action_type('hover')
+        self.assertIn('hover', executor.supported_actions)
+        self.assertNotIn('hover', ActionExecutor.SUPPORTED_ACTIONS)
+
+    def test_throttle(self):
+        """
+        测试只对限速动作延迟并定期插入阅读停顿
+        """
+        manager = AntiCrawlerManager()
+        manager._next_break = 3
+        
+        async def run():
+            with patch('core.components.anti_crawler.anti_crawler_manager.asyncio.sleep',
+                       new_callable=AsyncMock) as sleep:
+                await manager.throttle('wait', 1.0, 2.0)
+                sleep.assert_not_awaited()
+                
+                await manager.throttle('goto', 1.0, 2.0)
+                await manager.throttle('click', 1.0, 2.0)
+                for call in sleep.await_args_list:
+                    self.assertTrue(1.0 <= call.args[0] <= 2.0)
+                
+                await manager.throttle('input', 1.0, 2.0)
+                self.assertGreaterEqual(sleep.await_args.args[0], AntiCrawlerManager.READING_BREAK_DURATION[0])
+                self.assertEqual(sleep.await_count, 3)
+        
+        asyncio.run(run())
+        self.assertEqual(manager._action_count, 0)
+        self.assertGreaterEqual(manager._next_break, AntiCrawlerManager.READING_BREAK_INTERVAL[0])
+
+    def test_sync_exit_in_running_loop(self):
+        """
+        测试在运行中的事件循环里退出同步上下文管理器
+        """
+        executor = ActionExecutor(MagicMock(close=AsyncMock()), browser_pool=MagicMock())
+        
+        async def run():
+            with executor:
+                pass
+            await executor._close_task
+        
+        asyncio.run(run())
+        executor.browser_manager.close.assert_awaited_once()
+        
+        with executor:
+            pass
+        self.assertEqual(executor.browser_manager.close.await_count, 2)
+
+    def test_async_context_does_not_launch_browser(self):
+        """
+        测试异步上下文管理器不启动浏览器，也不创建默认的浏览器管理器
+        """
+        pool = MagicMock()
+        executor = ActionExecutor(browser_pool=pool)
+        
+        async def run():
+            async with executor:
+                pass
+        
+        asyncio.run(run())
+        self.assertIsNone(executor.browser_manager)
+        pool.acquire.assert_not_called()
+
     def tearDown(self):
         """
         每个测试后关闭资源
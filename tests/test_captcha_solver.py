@@ -2,7 +2,12 @@ import unittest
 import asyncio
 import os
 import base64
-from core.components.captcha.captcha_solver import CaptchaSolver, TwoCaptchaSolver, AntiCaptchaManager
+from unittest.mock import AsyncMock, patch
+from aiohttp import web
+import tempfile
+from core.components.captcha.captcha_solver import (
+    CaptchaSolver, TwoCaptchaSolver, AntiCaptchaManager, _read_image_base64, BASE64_CHUNK_SIZE
+)
 
 class TestCaptchaSolver(unittest.TestCase):
     def setUp(self):
@@ -92,6 +97,65 @@ class TestCaptchaSolver(unittest.TestCase):
         
         asyncio.run(test_invalid_input())
 
+    def test_two_captcha_session_reuse_and_backoff(self):
+        """测试共享 HTTP 会话与轮询退避"""
+        async def test():
+            polls = {'count': 0}
+
+            async def submit(request):
+                return web.json_response({'status': 1, 'request': 'captcha-id'})
+
+            async def result(request):
+                polls['count'] += 1
+                if polls['count'] % 4:
+                    return web.json_response({'status': 0, 'request': 'CAPCHA_NOT_READY'})
+                return web.json_response({'status': 1, 'request': 'abcd'})
+
+            app = web.Application()
+            app.router.add_get('/in.php', submit)
+            app.router.add_get('/res.php', result)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+
+            try:
+                async with TwoCaptchaSolver(self.api_key) as solver:
+                    solver.BASE_URL = f'http://127.0.0.1:{port}/in.php'
+                    solver.RESULT_URL = f'http://127.0.0.1:{port}/res.php'
+                    with patch('core.components.captcha.captcha_solver.asyncio.sleep',
+                               new=AsyncMock()) as sleep:
+                        first = await solver._solve_captcha('base64_image')
+                        session = solver._session
+                        await solver._solve_captcha('base64_image')
+
+                    self.assertEqual(first['text'], 'abcd')
+                    self.assertIs(solver._session, session)
+                    delays = [call.args[0] for call in sleep.await_args_list]
+                    self.assertEqual(delays, [1.0, 2.0, 4.0] * 2)
+                self.assertTrue(session.closed)
+                self.assertIsNone(solver._session)
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(test())
+
+    def test_read_image_base64_chunked(self):
+        """测试分块读取图像并编码为 Base64"""
+        data = os.urandom(BASE64_CHUNK_SIZE * 2 + 5)
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = os.path.join(tmp, 'captcha.png')
+            with open(image_path, 'wb') as f:
+                f.write(data)
+            self.assertEqual(_read_image_base64(image_path), base64.b64encode(data).decode('ascii'))
+
+            # 已编码的文件直接读取
+            encoded_path = os.path.join(tmp, 'captcha.b64')
+            with open(encoded_path, 'w') as f:
+                f.write(base64.encodebytes(b'test_image_data').decode('ascii'))
+            self.assertEqual(_read_image_base64(encoded_path), base64.b64encode(b'test_image_data').decode('ascii'))
+
 def run_async_tests(test_case):
     """
     运行异步测试的辅助函数
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import AsyncMock
 from database.crud_manager import CRUDManager
 
 class TestCRUDManager(unittest.TestCase):
@@ -100,5 +101,91 @@ class TestCRUDManager(unittest.TestCase):
         """
         self.crud.close()
 
+class TestBulkUpdateStepOrders(unittest.IsolatedAsyncioTestCase):
+    async def test_single_statement(self):
+        """测试批量更新步骤顺序只执行一条语句"""
+        crud = CRUDManager()
+        crud._connected = True
+        crud.db = AsyncMock()
+        crud.db.fetch_all.return_value = [
+            {'id': 3, 'workflow_id': 7, 'step_order': 1}, {'id': 1, 'workflow_id': 7, 'step_order': 2}
+        ]
+        
+        steps = await crud.bulk_update_step_orders([(3, 1), (1, 2)])
+        
+        crud.db.fetch_all.assert_awaited_once()
+        self.assertEqual(crud.db.fetch_all.await_args.args[1], ([3, 1], [1, 2]))
+        self.assertEqual(steps[0]['id'], 3)
+        self.assertEqual(await crud.bulk_update_step_orders([]), [])
+        crud.db.fetch_all.assert_awaited_once()
+
+class TestWorkflowCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.crud = CRUDManager()
+        self.crud._connected = True
+        self.crud.db = AsyncMock()
+
+    async def test_workflow_and_steps_cached(self):
+        """测试重复获取工作流和步骤时使用缓存"""
+        self.crud.db.fetch_one.return_value = {'id': 1, 'name': '测试'}
+        self.crud.db.fetch_all.return_value = [{'id': 5, 'workflow_id': 1, 'step_order': 1}]
+        
+        workflow = await self.crud.get_workflow(1)
+        workflow['name'] = '已修改'
+        self.assertEqual((await self.crud.get_workflow(1))['name'], '测试')
+        self.assertEqual(await self.crud.get_workflow_steps(1), await self.crud.get_workflow_steps(1))
+        self.crud.db.fetch_one.assert_awaited_once()
+        self.crud.db.fetch_all.assert_awaited_once()
+
+    async def test_cache_invalidated_on_change(self):
+        """测试修改步骤后缓存失效"""
+        self.crud.db.fetch_all.return_value = [{'id': 5, 'workflow_id': 1, 'step_order': 1}]
+        await self.crud.get_workflow_steps(1)
+        await self.crud.bulk_update_step_orders([(5, 1)])
+        await self.crud.get_workflow_steps(1)
+        self.assertEqual(self.crud.db.fetch_all.await_count, 3)
+
+    async def test_workflow_with_steps(self):
+        """测试一次查询获取工作流及其步骤，并填充缓存"""
+        workflow = {'id': 1, 'name': '测试'}
+        self.crud.db.fetch_all.return_value = [
+            {'workflow': workflow, 'step': {'id': 5, 'workflow_id': 1, 'step_order': 1}},
+            {'workflow': workflow, 'step': {'id': 6, 'workflow_id': 1, 'step_order': 2}}
+        ]
+        
+        result = await self.crud.get_workflow_with_steps(1)
+        self.assertEqual(result['workflow'], workflow)
+        self.assertEqual([step['id'] for step in result['steps']], [5, 6])
+        self.assertEqual(await self.crud.get_workflow(1), workflow)
+        self.assertEqual(len(await self.crud.get_workflow_steps(1)), 2)
+        self.crud.db.fetch_all.assert_awaited_once()
+        self.crud.db.fetch_one.assert_not_awaited()
+
+    async def test_workflow_with_steps_empty(self):
+        """测试没有步骤和工作流不存在的情况"""
+        self.crud.db.fetch_all.return_value = [{'workflow': {'id': 1}, 'step': None}]
+        self.assertEqual((await self.crud.get_workflow_with_steps(1))['steps'], [])
+        self.crud.db.fetch_all.return_value = []
+        self.assertIsNone(await self.crud.get_workflow_with_steps(2))
+
+    async def test_websites_cached(self):
+        """测试网站列表缓存，增加网站后失效"""
+        self.crud.db.fetch_all.return_value = [{'id': 1, 'name': '测试网站'}]
+        await self.crud.get_all_websites()
+        self.assertEqual(await self.crud.get_all_websites(), [{'id': 1, 'name': '测试网站'}])
+        self.crud.db.fetch_all.assert_awaited_once()
+        
+        await self.crud.create_website('新网站', 'http://example.com')
+        await self.crud.get_all_websites()
+        self.assertEqual(self.crud.db.fetch_all.await_count, 2)
+
+    async def test_cache_expires(self):
+        """测试缓存过期后重新查询"""
+        self.crud.db.fetch_one.return_value = {'id': 1}
+        self.crud.CACHE_TTL = 0
+        await self.crud.get_workflow(1)
+        await self.crud.get_workflow(1)
+        self.assertEqual(self.crud.db.fetch_one.await_count, 2)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
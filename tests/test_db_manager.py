@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from database.db_manager import DatabaseManager
+
+@pytest.mark.asyncio
+async def test_concurrent_connect_creates_one_pool():
+    """测试并发连接时只创建一个连接池"""
+    manager = DatabaseManager()
+    pool = AsyncMock()
+
+    async def create_pool(**kwargs):
+        await asyncio.sleep(0)
+        return pool
+
+    with patch('database.db_manager.asyncpg.create_pool', side_effect=create_pool) as create:
+        await asyncio.gather(*(manager.ensure_connected() for _ in range(5)))
+
+    create.assert_called_once_with(
+        dsn=manager.dsn,
+        min_size=DatabaseManager.POOL_MIN_SIZE,
+        max_size=DatabaseManager.POOL_MAX_SIZE
+    )
+    assert manager.pool is pool
@@ -15,20 +15,12 @@ def mock_page():
     """创建模拟的 Playwright Page 对象"""
     mock_page = MagicMock(spec=Page)
     
-    async def mock_locator(selector):
-        mock_locator = MagicMock()
-        
-        # 模拟元素未找到的情况
-        mock_first = MagicMock()
-        mock_first.element_handle = AsyncMock(return_value=None)
-        mock_locator.first = AsyncMock(return_value=mock_first)
-        
-        # 模拟空列表返回
-        mock_locator.all_element_handles = AsyncMock(return_value=[])
-        
-        return mock_locator
+    # 模拟元素未找到的情况
+    mock_page.query_selector = AsyncMock(return_value=None)
+    
+    # 模拟空列表返回
+    mock_page.query_selector_all = AsyncMock(return_value=[])
     
-    mock_page.locator = AsyncMock(side_effect=mock_locator)
     return mock_page
 
 @pytest.fixture
@@ -84,8 +76,8 @@ async def test_css_selector_handler_element_not_found(mock_page):
 @pytest.mark.asyncio
 async def test_xpath_selector_handler_element_not_found(mock_page):
     """测试 XPath 选择器处理器找不到元素的情况"""
-    # 模拟 Playwright 的 locator 返回空列表
-    mock_page.locator.return_value.first.element_handle.return_value = None
+    # 模拟 Playwright 的 query_selector 未找到元素
+    mock_page.query_selector.return_value = None
     
     xpath_handler = XPathSelectorHandler(mock_page)
     
@@ -113,7 +105,7 @@ async def test_css_selector_handler_log_warning(mock_log_warning, mock_page):
 @patch('logging.Logger.warning')
 async def test_xpath_selector_handler_log_warning(mock_log_warning, mock_page):
     """测试 XPath 选择器处理器的警告日志"""
-    mock_page.locator.return_value.first.element_handle.return_value = None
+    mock_page.query_selector.return_value = None
     
     xpath_handler = XPathSelectorHandler(mock_page)
     
@@ -159,7 +151,7 @@ async def test_css_selector_handler_multiple_elements(mock_page):
 async def test_xpath_selector_handler_multiple_elements(mock_page):
     """测试 XPath 选择器处理器查找多个元素的情况"""
     # 模拟返回空列表
-    mock_page.locator.return_value.all_element_handles.return_value = []
+    mock_page.query_selector_all.return_value = []
     
     xpath_handler = XPathSelectorHandler(mock_page)
     
@@ -234,7 +226,7 @@ async def test_xpath_selector_handler_detailed_logging(
 ):
     """详细测试 XPath 选择器处理器的日志记录"""
     # 模拟查找元素失败的场景
-    mock_page.locator.return_value.first.element_handle.return_value = None
+    mock_page.query_selector.return_value = None
     
     xpath_handler = XPathSelectorHandler(mock_page)
     
@@ -285,7 +277,7 @@ async def test_xpath_selector_handler_extreme_edge_cases(mock_page):
     ]
     
     for selector in complex_selectors:
-        mock_page.locator.return_value.first.element_handle.return_value = None
+        mock_page.query_selector.return_value = None
         
         with pytest.raises(ElementNotFoundError):
             await xpath_handler.find_element(selector)
@@ -300,7 +292,7 @@ async def test_selector_handlers_performance_and_error_handling(mock_page):
     # 模拟大量查找操作
     for _ in range(100):
         mock_page.query_selector.return_value = None
-        mock_page.locator.return_value.first.element_handle.return_value = None
+        mock_page.query_selector.return_value = None
         
         with pytest.raises(ElementNotFoundError):
             await css_handler.find_element('#repeated-non-existent')
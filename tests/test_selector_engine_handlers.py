@@ -2,12 +2,20 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from playwright.async_api import Page, ElementHandle
 from core.components.selector.selector_handlers.id_selector_handler import IDSelectorHandler
-from core.components.selector.selector_handlers.name_selector_handler import NameSelectorHandler
+from core.components.selector.selector_handlers.name_selector_handler import (
+    NameSelectorHandler,
+    _normalize_name_selector,
+    _normalize_name_selector_cached
+)
 from core.components.selector.selector_handlers.base_selector_handler import (
     ElementNotFoundError, 
     InvalidSelectorError
 )
-from core.components.selector.selector_handlers.class_selector_handler import ClassSelectorHandler
+from core.components.selector.selector_handlers.class_selector_handler import (
+    ClassSelectorHandler,
+    _normalize_class_selector,
+    _normalize_class_selector_cached
+)
 
 @pytest.fixture
 def mock_page():
@@ -197,6 +205,20 @@ async def test_class_selector_handler_find_element(mock_page):
         elif not selector.startswith('.'):
             mock_page.query_selector.assert_called_with('.test-class')
 
+def test_normalize_class_selector_cached():
+    """测试 Class 选择器规范化及其缓存"""
+    _normalize_class_selector_cached.cache_clear()
+    
+    assert _normalize_class_selector('test-class') == '.test-class'
+    assert _normalize_class_selector('class:test-class') == '.test-class'
+    assert _normalize_class_selector('.test-class') == '.test-class'
+    assert _normalize_class_selector('test-class') == '.test-class'
+    assert _normalize_class_selector_cached.cache_info().hits == 1
+    
+    for invalid_selector in ['', 'class:', None, 123]:
+        with pytest.raises(InvalidSelectorError):
+            _normalize_class_selector(invalid_selector)
+
 @pytest.mark.asyncio
 async def test_class_selector_handler_find_elements(mock_page):
     """测试 Class 选择器处理器的 find_elements 方法"""
@@ -249,4 +271,29 @@ async def test_class_selector_handler_invalid_selector(mock_page, invalid_select
         await class_handler.find_element(invalid_selector)
     
     with pytest.raises(InvalidSelectorError):
-        await class_handler.find_elements(invalid_selector) 
\ No newline at end of file
+        await class_handler.find_elements(invalid_selector)
+
+def test_selector_handlers_use_slots(mock_page):
+    """测试选择器处理器不分配实例字典"""
+    for handler_class in (IDSelectorHandler, NameSelectorHandler, ClassSelectorHandler):
+        handler = handler_class(mock_page)
+        assert not hasattr(handler, '__dict__')
+        assert handler.page is mock_page
+
+def test_normalize_name_selector():
+    """测试 Name 选择器规范化"""
+    assert _normalize_name_selector('username') == '[name="username"]'
+    assert _normalize_name_selector('name:username') == '[name="username"]'
+    assert _normalize_name_selector('[name="username"]') == '[name="username"]'
+
+def test_normalize_name_selector_cached():
+    """测试 Name 选择器规范化结果缓存"""
+    _normalize_name_selector_cached.cache_clear()
+    
+    assert _normalize_name_selector('username') == '[name="username"]'
+    assert _normalize_name_selector('username') == '[name="username"]'
+    assert _normalize_name_selector_cached.cache_info().hits == 1
+    
+    for invalid_selector in ['', 'name:', None, 123]:
+        with pytest.raises(InvalidSelectorError):
+            _normalize_name_selector(invalid_selector)
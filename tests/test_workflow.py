@@ -76,7 +76,7 @@ class TestWorkflow(unittest.TestCase):
         清理测试资源
         """
         async def close_resources():
-            await self.action_executor.browser_manager.close()
+            await self.action_executor.browser_pool.close()
             self.crud.close()
         
         asyncio.run(close_resources())
@@ -9,7 +9,7 @@ import logging
 import os
 from datetime import datetime
 import asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import traceback
 from typing import Generator, AsyncGenerator, Dict, Any, Optional
 
@@ -366,4 +366,23 @@ async def test_async_simple(qtbot):
         logger.info("简单异步测试通过")
     except Exception as e:
         logger.error(f"简单异步测试失败: {e}\n{traceback.format_exc()}")
-        raise 
\ No newline at end of file
+        raise 
+
+@pytest.mark.asyncio
+async def test_reorder_scheduled_on_editor_loop(qapp: QApplication, qtbot) -> None:
+    """测试延迟排序在编辑器的事件循环上执行，没有事件循环时报错而不是静默丢弃"""
+    widget = WorkflowEditorWidget()
+    qtbot.addWidget(widget)
+    widget.crud_manager = MagicMock()
+    
+    with patch("core.ui.workflow_editor.QMessageBox.critical") as critical, \
+         patch.object(widget, "reorder_steps") as reorder_steps:
+        widget._reorder_timer.timeout.emit()
+        critical.assert_called_once()
+        reorder_steps.assert_not_called()
+    
+    widget.loop = asyncio.get_running_loop()
+    with patch.object(widget, "reorder_steps", new=AsyncMock()) as reorder_steps:
+        widget._reorder_timer.timeout.emit()
+        await asyncio.sleep(0)
+        reorder_steps.assert_awaited_once()